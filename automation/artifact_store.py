@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Demo Website Builder - Artifact Store
+Keeps the complete output of every command a build runs on disk. Claude gets
+a compact summary (head, error lines, tail) plus a handle, and pages or
+searches the rest with the read_output tool instead of rerunning the command.
+
+Usage:
+    python3 artifact_store.py list
+    python3 artifact_store.py show <build-dir> <handle> [start] [end]
+"""
+
+import json
+import os
+import re
+import shutil
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+CACHE_DIR = Path(os.environ.get("DEMO_BUILDER_CACHE", Path.home() / ".cache" / "demo-builder"))
+ARTIFACT_DIR = CACHE_DIR / "artifacts"
+MAX_BUILDS = 50  # Build folders kept
+
+INLINE_CHARS = 4000  # Shorter output is returned as is
+HEAD_LINES = 30
+TAIL_LINES = 50
+MAX_ERROR_LINES = 25
+MAX_PAGE_LINES = 200
+MAX_PAGE_CHARS = 12000
+MAX_LINE_CHARS = 500
+
+ERROR_LINE = re.compile(r"\berror\b|\bfailed\b|npm err!|exception|traceback|cannot find|not found|"
+                        r"\bwarn(ing)?\b|✘|✖", re.IGNORECASE)
+
+
+def _clip(line: str) -> str:
+    return line if len(line) <= MAX_LINE_CHARS else line[:MAX_LINE_CHARS] + " ..."
+
+
+def _numbered(lines: List[str], first: int) -> str:
+    return "\n".join(f"{number:>5}| {_clip(line)}" for number, line in enumerate(lines, first))
+
+
+class ArtifactStore:
+    """Command outputs of one build; save() returns a handle for read()"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.lock = threading.Lock()
+        self.count = 0
+
+    @classmethod
+    def for_build(cls, project_name: str) -> "ArtifactStore":
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")[:-3]
+        return cls(ARTIFACT_DIR / f"{stamp}-{project_name}")
+
+    def save(self, output: str, **meta) -> str:
+        """Store full output (meta: command, exit code, ...); returns its handle"""
+        with self.lock:
+            if self.count == 0:
+                self.root.mkdir(parents=True, exist_ok=True)
+                prune_builds()
+            self.count += 1
+            handle = f"out-{self.count}"
+        (self.root / f"{handle}.log").write_text(output, encoding="utf-8")
+        (self.root / f"{handle}.json").write_text(json.dumps(meta))
+        return handle
+
+    def lines(self, handle: str) -> List[str]:
+        if not re.fullmatch(r"out-\d+", handle or ""):
+            raise KeyError(handle)
+        path = self.root / f"{handle}.log"
+        if not path.exists():
+            raise KeyError(handle)
+        return path.read_text(encoding="utf-8").splitlines()
+
+    def summarize(self, output: str, handle: str) -> str:
+        """Output as is when short, otherwise head + error lines + tail and how to get the rest"""
+        if len(output) <= INLINE_CHARS:
+            return output
+        lines = output.splitlines()
+        if len(lines) <= HEAD_LINES + TAIL_LINES:
+            # Few but very long lines (minified output): cut by characters
+            return (f"{output[:INLINE_CHARS // 2]}\n... [{len(output) - INLINE_CHARS} chars omitted, "
+                    f"read_output handle={handle}] ...\n{output[-INLINE_CHARS // 2:]}")
+
+        parts = [_numbered(lines[:HEAD_LINES], 1)]
+        middle = range(HEAD_LINES, len(lines) - TAIL_LINES)
+        errors = [number for number in middle if ERROR_LINE.search(lines[number])]
+        if errors:
+            shown = errors[:MAX_ERROR_LINES]
+            parts.append(f"... error/warning lines in between ({len(errors)} found"
+                         f"{', first ' + str(len(shown)) + ' shown' if len(errors) > len(shown) else ''}):")
+            parts.append("\n".join(f"{number + 1:>5}| {_clip(lines[number])}" for number in shown))
+        parts.append(f"... [lines {HEAD_LINES + 1}-{len(lines) - TAIL_LINES} omitted] ...")
+        parts.append(_numbered(lines[-TAIL_LINES:], len(lines) - TAIL_LINES + 1))
+        parts.append(f"[Full output: {len(lines)} lines. Use read_output with handle=\"{handle}\" "
+                     f"and a line range or pattern to see more - no need to rerun the command]")
+        return "\n".join(parts)
+
+    def read(self, handle: str, start_line: Optional[int] = None, end_line: Optional[int] = None,
+             pattern: Optional[str] = None, context: int = 2) -> str:
+        """read_output tool: a numbered line range, or lines matching a regex with context"""
+        try:
+            lines = self.lines(handle)
+        except KeyError:
+            return f"Error: unknown output handle '{handle}'"
+
+        if pattern:
+            try:
+                regex = re.compile(pattern, re.IGNORECASE)
+            except re.error as e:
+                return f"Error: invalid pattern: {e}"
+            first = max(1, start_line or 1) - 1
+            last = min(len(lines), end_line or len(lines))
+            hits = [number for number in range(first, last) if regex.search(lines[number])]
+            if not hits:
+                return f"No lines match /{pattern}/ in {handle} ({len(lines)} lines)"
+            matched, shown, result, size = set(hits), set(), [], 0
+            for hit in hits:
+                for number in range(max(first, hit - context), min(last, hit + context + 1)):
+                    if number in shown:
+                        continue
+                    if size > MAX_PAGE_CHARS:
+                        result.append(f"... [more matches after line {number + 1}, narrow the range]")
+                        return "\n".join(result)
+                    if result and number - 1 not in shown:
+                        result.append("  ...")
+                    shown.add(number)
+                    entry = f"{number + 1:>5}{':' if number in matched else '|'} {_clip(lines[number])}"
+                    result.append(entry)
+                    size += len(entry)
+            return f"{len(hits)} matching lines in {handle}:\n" + "\n".join(result)
+
+        start = max(1, start_line or 1)
+        end = min(len(lines), end_line or start + MAX_PAGE_LINES - 1, start + MAX_PAGE_LINES - 1)
+        if start > len(lines):
+            return f"{handle} has only {len(lines)} lines"
+        page = _numbered(lines[start - 1:end], start)
+        if len(page) > MAX_PAGE_CHARS:
+            page = page[:MAX_PAGE_CHARS] + "\n... [page truncated, request fewer lines]"
+        more = f"\n[lines {start}-{end} of {len(lines)}]" if end < len(lines) or start > 1 else ""
+        return page + more
+
+
+def prune_builds(keep: int = MAX_BUILDS):
+    """Delete all but the newest build folders"""
+    if ARTIFACT_DIR.exists():
+        for path in sorted(ARTIFACT_DIR.iterdir(), reverse=True)[keep:]:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ("list", "show"):
+        print(__doc__)
+        sys.exit(1)
+
+    if sys.argv[1] == "list":
+        for build in sorted(ARTIFACT_DIR.iterdir()) if ARTIFACT_DIR.exists() else []:
+            for meta_path in sorted(build.glob("*.json"), key=lambda p: int(p.stem.split("-")[1])):
+                meta: Dict = json.loads(meta_path.read_text())
+                print(f"{build.name}  {meta_path.stem:<7} exit {meta.get('exit_code')}  {meta.get('command')}")
+        return
+
+    if len(sys.argv) < 4:
+        print("Usage: python3 artifact_store.py show <build-dir> <handle> [start] [end]")
+        sys.exit(1)
+    store = ArtifactStore(ARTIFACT_DIR / sys.argv[2])
+    numbers = [int(value) for value in sys.argv[4:6]]
+    print(store.read(sys.argv[3], *numbers))
+
+
+if __name__ == "__main__":
+    main()
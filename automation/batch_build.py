@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Demo Website Builder - Batch Mode
+Builds demos for a list of URLs without a window, a few at a time, and
+appends one JSONL result line per URL. Rerunning the same command skips
+URLs that are already done, so an interrupted batch resumes where it stopped;
+the half-built project folder of a URL the batch started but never finished
+is moved to demos/.batch-leftovers/ before it is built again. A URL whose
+project folder name is taken by another URL of the batch, or by a demo the
+batch didn't build, is reported as skipped.
+
+Usage:
+    python3 batch_build.py leads.csv [--report leads.report.jsonl]
+                           [--concurrency 2] [--retry-failed]
+
+Input: .csv (a url/website column, otherwise the first column),
+.jsonl ({"url": ...} per line) or a plain text file with one URL per line.
+"""
+
+import argparse
+import csv
+import json
+import os
+import shutil
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from demo_core import DEMOS_DIR, APIKeyManager, BuildCancelled, DemoBuild, project_name_from_url
+from dev_server import dev_servers
+
+URL_COLUMNS = ("url", "website", "homepage", "domain", "site")
+DEFAULT_CONCURRENCY = 2
+
+STARTED = "started"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+SKIPPED = "skipped"
+
+LEFTOVERS_DIR = DEMOS_DIR / ".batch-leftovers"
+
+
+def normalize_url(value: str) -> Optional[str]:
+    value = value.strip()
+    if not value or value.startswith("#") or "." not in value:
+        return None
+    if "://" not in value:
+        value = f"https://{value}"
+    return value
+
+
+def read_urls(path: Path) -> List[str]:
+    """URLs from a CSV, JSONL or plain text file, in file order"""
+    text = path.read_text(encoding="utf-8-sig")
+    values: List[str] = []
+
+    if path.suffix.lower() == ".jsonl":
+        for line in text.splitlines():
+            if line.strip():
+                record = json.loads(line)
+                values.append(next((str(record[key]) for key in URL_COLUMNS if record.get(key)), ""))
+    elif path.suffix.lower() == ".csv":
+        rows = [row for row in csv.reader(text.splitlines()) if row]
+        column = 0
+        if rows:
+            header = [cell.strip().lower() for cell in rows[0]]
+            matches = [header.index(name) for name in URL_COLUMNS if name in header]
+            if matches:
+                column = matches[0]
+                rows = rows[1:]
+        values = [row[column] for row in rows if len(row) > column]
+    else:
+        values = text.splitlines()
+
+    urls = []
+    for value in values:
+        url = normalize_url(value)
+        if url and url not in urls:
+            urls.append(url)
+    return urls
+
+
+def _timestamp(seconds: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(seconds).isoformat(timespec="seconds") if seconds else None
+
+
+class BatchReport:
+    """Append-only JSONL report; the last line per URL is its current result"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.results: Dict[str, dict] = {}
+        self.torn_line = False
+        if self.path.exists():
+            text = self.path.read_text(encoding="utf-8")
+            self.torn_line = bool(text) and not text.endswith("\n")
+            for line in text.splitlines():
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Half-written line from a crash
+                self.results[record["url"]] = record
+
+    def status(self, url: str) -> Optional[str]:
+        record = self.results.get(url)
+        return record["status"] if record else None
+
+    def write(self, record: dict):
+        """Append and fsync, so a crash never loses a finished build"""
+        self.results[record["url"]] = record
+        with open(self.path, "a", encoding="utf-8") as f:
+            if self.torn_line:
+                f.write("\n")  # Don't glue the record onto a half-written one
+                self.torn_line = False
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def move_aside(project_name: str) -> Optional[Path]:
+    """Move the folder an interrupted or failed build left behind out of the way"""
+    project_dir = DEMOS_DIR / project_name
+    if not project_dir.exists():
+        return None
+    dev_servers.stop(project_name)
+    LEFTOVERS_DIR.mkdir(parents=True, exist_ok=True)
+    target = LEFTOVERS_DIR / f"{project_name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+    shutil.move(str(project_dir), str(target))
+    return target
+
+
+class BatchRunner:
+    """Runs DemoBuilds on a thread pool and records each outcome"""
+
+    def __init__(self, urls: List[str], report: BatchReport, api_key: str, concurrency: int):
+        self.urls = urls
+        self.report = report
+        self.api_key = api_key
+        self.concurrency = max(1, concurrency)
+        self.interrupted = False
+        self.builds: List[DemoBuild] = []
+        self.statuses: List[str] = []
+        self.lock = threading.Lock()
+        self.queued_at = time.time()
+
+    def run(self):
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="build") as pool:
+            futures = [pool.submit(self.build_one, url) for url in self.urls]
+            for future in as_completed(futures):
+                future.result()
+
+    def build_one(self, url: str):
+        project_name = project_name_from_url(url)
+        try:
+            self._build_one(url, project_name)
+        except Exception as e:
+            # Moving the leftover, setting up the build or writing its report failed -
+            # record it for this URL and let the rest of the batch finish
+            with self.lock:
+                self.statuses.append(FAILED)
+                previous = self.report.results.get(url, {})
+                attempts = previous.get("attempts", 0) + (1 if previous.get("status") == STARTED else 0)
+                try:
+                    self.report.write({"url": url, "project_name": project_name, "status": FAILED,
+                                       "error": str(e), "finished_at": _timestamp(time.time()),
+                                       "attempts": attempts})
+                except OSError:
+                    pass  # Stays STARTED and is retried next time
+            print(f"❌ {url}: {e}", flush=True)
+
+    def _build_one(self, url: str, project_name: str):
+        with self.lock:
+            if self.interrupted:
+                return
+            previous = self.report.results.get(url, {})
+            if previous.get("status") in (STARTED, FAILED):
+                # This batch started the folder and never finished it
+                leftover = move_aside(project_name)
+                if leftover:
+                    print(f"[{project_name}] Moved the unfinished project to {leftover}", flush=True)
+            elif (DEMOS_DIR / project_name).exists():
+                # Built in the app, committed to the repo or being edited - not ours to touch
+                self.report.write({"url": url, "project_name": project_name, "status": SKIPPED,
+                                   "error": f"demos/{project_name} already exists and wasn't built by this batch",
+                                   "finished_at": _timestamp(time.time())})
+                self.statuses.append(SKIPPED)
+                print(f"⏭️  {url}: demos/{project_name} already exists and wasn't built by this batch", flush=True)
+                return
+            self.report.write({"url": url, "project_name": project_name, "status": STARTED,
+                               "queued_at": _timestamp(self.queued_at),
+                               "started_at": _timestamp(time.time()),
+                               "attempts": previous.get("attempts", 0)})
+            build = DemoBuild(self.api_key, url, project_name=project_name,
+                              log=lambda message: print(f"[{project_name}] {message}", flush=True))
+            self.builds.append(build)
+
+        started = time.time()
+        error = None
+        try:
+            build.run()
+            status = DONE
+        except BuildCancelled:
+            status = CANCELLED
+        except Exception as e:
+            status = CANCELLED if build.cancelled else FAILED
+            error = str(e)
+        finally:
+            # The build started a dev server to check the result - not needed overnight
+            dev_servers.stop(project_name)
+        finished = time.time()
+
+        with self.lock:
+            if status == CANCELLED:
+                self.statuses.append(status)
+                return  # Runs again next time
+            previous = self.report.results.get(url, {})
+            self.report.write({
+                "url": url,
+                "project_name": project_name,
+                "status": status,
+                "error": error,
+                "queued_at": _timestamp(self.queued_at),
+                "started_at": _timestamp(started),
+                "finished_at": _timestamp(finished),
+                "duration": round(finished - started, 1),
+                "attempts": previous.get("attempts", 0) + 1,
+                "iterations": build.iterations,
+                "usage": dict(build.usage),
+                "cost": round(build.cost, 4),
+            })
+            self.statuses.append(status)
+        if status == DONE:
+            print(f"✅ {url} -> {project_name} ({finished - started:.0f}s)", flush=True)
+        else:
+            print(f"❌ {url}: {error}", flush=True)
+
+    def interrupt(self, *_):
+        """Ctrl+C: cancel everything, unfinished URLs run again next time"""
+        if self.interrupted:
+            dev_servers.stop_all()
+            os._exit(130)
+        print("Stopping - running builds finish their current step (Ctrl+C again to force)", flush=True)
+        with self.lock:
+            self.interrupted = True
+            for build in self.builds:
+                build.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build demo websites for a list of URLs, headless")
+    parser.add_argument("input", type=Path, help="CSV, JSONL or text file with URLs")
+    parser.add_argument("--report", type=Path, help="JSONL report (default: <input>.report.jsonl)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"builds running at once (default {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--retry-failed", action="store_true", help="build URLs that failed last time again")
+    args = parser.parse_args()
+
+    report = BatchReport(args.report or args.input.with_suffix(".report.jsonl"))
+    # Skipped URLs are decided again every run - the clash may be gone by now
+    skip = {DONE} if args.retry_failed else {DONE, FAILED}
+    all_urls = read_urls(args.input)
+
+    # One URL per project folder - a.com/x and a.com/y, or a.com and a.ch, would share it.
+    # Folders of earlier runs count too, so a later run doesn't build into them.
+    owners = {record["project_name"]: record["url"] for record in report.results.values()
+              if record["status"] != SKIPPED and record.get("project_name")}
+    urls = []
+    for url in all_urls:
+        if report.status(url) in skip:
+            continue
+        project_name = project_name_from_url(url)
+        owner = owners.setdefault(project_name, url)
+        if owner != url:
+            report.write({"url": url, "project_name": project_name, "status": SKIPPED,
+                          "error": f"demos/{project_name} belongs to {owner}",
+                          "finished_at": _timestamp(time.time())})
+            print(f"⏭️  {url}: demos/{project_name} belongs to {owner}", flush=True)
+            continue
+        urls.append(url)
+
+    api_key = APIKeyManager().get_active_key()
+    if not api_key:
+        print("No API key configured (add one in the app or set ANTHROPIC_API_KEY)")
+        sys.exit(1)
+
+    print(f"{len(all_urls)} URLs, {len(all_urls) - len(urls)} already done, failed or clashing, "
+          f"building {len(urls)} with {args.concurrency} at a time -> {report.path}", flush=True)
+
+    runner = BatchRunner(urls, report, api_key, args.concurrency)
+    signal.signal(signal.SIGINT, runner.interrupt)
+    try:
+        runner.run()
+    finally:
+        dev_servers.stop_all()
+
+    finished = runner.statuses.count(DONE) + runner.statuses.count(FAILED) + runner.statuses.count(SKIPPED)
+    print(f"Done: {runner.statuses.count(DONE)} built, {runner.statuses.count(FAILED)} failed, "
+          f"{runner.statuses.count(SKIPPED)} skipped, {len(urls) - finished} left for the next run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Demo Website Builder - Build Cache
+Skips `npm run build` when a project's sources haven't changed since its last
+successful build, and gives each project a persistent Astro/Vite cache.
+
+Usage:
+    python3 build_cache.py status <project-dir>   # would the next deploy rebuild?
+"""
+
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+CACHE_DIR = Path(os.environ.get("DEMO_BUILDER_CACHE", Path.home() / ".cache" / "demo-builder"))
+BUILDS_DIR = CACHE_DIR / "builds"
+STAMP_FILE = "fingerprint.json"
+STAMP_VERSION = 1
+
+# Everything `astro build` reads
+INPUT_DIRS = ["src", "public"]
+INPUT_FILES = ["package.json", "package-lock.json", "astro.config.mjs", "tsconfig.json"]
+OUTPUT_DIR = "dist"
+CACHE_ENV = "ASTRO_CACHE_DIR"  # Read by astro.config.mjs (see scaffold_cache.ASTRO_CONFIG)
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildCache:
+    """Fingerprint of one project's build inputs plus its persistent cache dir.
+
+    Per-file hashes are remembered with size and mtime, so unchanged files are
+    not re-read on the next check (like git's index).
+    """
+
+    def __init__(self, project_dir: Path, root: Path = BUILDS_DIR):
+        self.project_dir = Path(project_dir)
+        # Keyed by location too - another folder with the same name must not reuse this stamp
+        location = hashlib.sha256(str(self.project_dir.resolve()).encode()).hexdigest()[:12]
+        self.dir = Path(root) / f"{self.project_dir.name}-{location}"
+        self.stamp_path = self.dir / STAMP_FILE
+        self.stamp = self._load_stamp()
+        self._current: Optional[Tuple[str, Dict[str, list]]] = None
+
+    @property
+    def astro_cache_dir(self) -> Path:
+        """Survives `rm -rf node_modules`, unlike Astro's default cache location"""
+        return self.dir / "astro"
+
+    def env(self) -> Dict[str, str]:
+        """Environment for the build command"""
+        self.astro_cache_dir.mkdir(parents=True, exist_ok=True)
+        return {CACHE_ENV: str(self.astro_cache_dir)}
+
+    def _load_stamp(self) -> dict:
+        try:
+            stamp = json.loads(self.stamp_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return stamp if stamp.get("version") == STAMP_VERSION else {}
+
+    def _inputs(self) -> Iterable[Path]:
+        for name in INPUT_FILES:
+            path = self.project_dir / name
+            if path.is_file():
+                yield path
+        for name in INPUT_DIRS:
+            for dirpath, dirnames, filenames in os.walk(self.project_dir / name):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    if filename != ".DS_Store":
+                        yield Path(dirpath) / filename
+
+    def fingerprint(self) -> str:
+        """Hash over the relative path and content of every build input"""
+        known = self.stamp.get("files", {})
+        files = {}
+        digest = hashlib.sha256()
+        for path in self._inputs():
+            relative = path.relative_to(self.project_dir).as_posix()
+            info = path.stat()
+            cached = known.get(relative)
+            if cached and cached[0] == info.st_size and cached[1] == info.st_mtime_ns:
+                file_hash = cached[2]
+            else:
+                file_hash = _hash_file(path)
+            files[relative] = [info.st_size, info.st_mtime_ns, file_hash]
+            digest.update(f"{relative}\0{file_hash}\n".encode())
+        self._current = (digest.hexdigest(), files)
+        return self._current[0]
+
+    def _output_marker(self) -> Optional[int]:
+        """mtime of dist/ - changes whenever a build (or anything else) rewrites it"""
+        try:
+            return (self.project_dir / OUTPUT_DIR).stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def is_fresh(self) -> bool:
+        """True if dist/ is the output of a build of exactly the current inputs"""
+        fingerprint = self.fingerprint()
+        marker = self._output_marker()
+        return (marker is not None
+                and self.stamp.get("fingerprint") == fingerprint
+                and self.stamp.get("output") == marker)
+
+    def record(self):
+        """Remember the inputs of the build that just succeeded"""
+        if self._current is None:
+            self.fingerprint()
+        fingerprint, files = self._current
+        self.stamp = {"version": STAMP_VERSION, "fingerprint": fingerprint,
+                      "output": self._output_marker(), "files": files}
+        self.dir.mkdir(parents=True, exist_ok=True)
+        temp = self.stamp_path.with_suffix(".tmp")
+        temp.write_text(json.dumps(self.stamp))
+        os.replace(temp, self.stamp_path)
+
+    def invalidate(self):
+        try:
+            self.stamp_path.unlink()
+        except FileNotFoundError:
+            pass
+        self.stamp = {}
+
+
+def main():
+    if len(sys.argv) != 3 or sys.argv[1] != "status":
+        print(__doc__)
+        sys.exit(1)
+
+    cache = BuildCache(Path(sys.argv[2]).resolve())
+    state = "up to date, build would be skipped" if cache.is_fresh() else "changed, needs a build"
+    print(f"{cache.project_dir.name}: {state} (cache: {cache.dir})")
+
+
+if __name__ == "__main__":
+    main()
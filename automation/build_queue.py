@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Demo Website Builder - Build Queue
+Runs several ClaudeWorker builds (or deploys) side by side with a bounded worker pool
+"""
+
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+from deploy_pipeline import DeployCancelled, DeployError, DeployPipeline
+
+
+class BuildJob:
+    """A single queued build or change request"""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    def __init__(self, job_id: int, url: str, change_request: Optional[str] = None,
+                 project_name: Optional[str] = None):
+        self.job_id = job_id
+        self.url = url
+        self.change_request = change_request
+        self.project_name = project_name
+        self.status = BuildJob.PENDING
+        self.dev_url: Optional[str] = None
+        self.error: Optional[str] = None
+        self.attempts = 0
+        self.queued_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.worker: Optional[QThread] = None
+
+    @property
+    def kind(self) -> str:
+        return "changes" if self.change_request else "build"
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (BuildJob.PENDING, BuildJob.RUNNING)
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Seconds spent running (so far, if still running)"""
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+
+class BuildQueue(QObject):
+    """FIFO job queue that keeps up to max_workers workers running at once.
+
+    The worker factory receives a BuildJob and returns an unstarted QThread
+    exposing log_signal(str), finished_signal(str, str), error_signal(str)
+    and a cancel() method, like ClaudeWorker.
+    """
+    job_updated = pyqtSignal(int)  # job_id
+    job_finished = pyqtSignal(int, str, str)  # job_id, project_name, dev_url
+    job_failed = pyqtSignal(int, str)  # job_id, error
+    log_signal = pyqtSignal(int, str)  # job_id, message
+
+    def __init__(self, worker_factory: Callable[[BuildJob], QThread], max_workers: int = 2):
+        super().__init__()
+        self.worker_factory = worker_factory
+        self.max_workers = max(1, max_workers)
+        self.jobs: Dict[int, BuildJob] = {}
+        self.pending: List[int] = []
+        self.next_id = 1
+
+    def submit(self, url: str, change_request: Optional[str] = None,
+               project_name: Optional[str] = None) -> BuildJob:
+        """Queue a new job and start it if a worker slot is free"""
+        job = BuildJob(self.next_id, url, change_request, project_name)
+        self.next_id += 1
+        self.jobs[job.job_id] = job
+        self.pending.append(job.job_id)
+        self.job_updated.emit(job.job_id)
+        self._dispatch()
+        return job
+
+    def cancel(self, job_id: int):
+        """Cancel a pending or running job"""
+        job = self.jobs.get(job_id)
+        if not job or not job.is_active:
+            return
+
+        if job.status == BuildJob.PENDING:
+            self.pending.remove(job_id)
+            self._finish(job, BuildJob.CANCELLED)
+            return
+
+        # Running: ask the worker to stop, its thread ends on its own
+        job.status = BuildJob.CANCELLED
+        job.finished_at = time.time()
+        if job.worker:
+            job.worker.cancel()
+        self.job_updated.emit(job_id)
+
+    def retry(self, job_id: int) -> Optional[BuildJob]:
+        """Put a failed or cancelled job back into the queue"""
+        job = self.jobs.get(job_id)
+        if not job or job.status not in (BuildJob.FAILED, BuildJob.CANCELLED):
+            return None
+        if job.worker and job.worker.isRunning():
+            # Cancelled worker hasn't wound down yet
+            return None
+
+        job.status = BuildJob.PENDING
+        job.error = None
+        job.started_at = None
+        job.finished_at = None
+        job.queued_at = time.time()
+        self.pending.append(job_id)
+        self.job_updated.emit(job_id)
+        self._dispatch()
+        return job
+
+    def set_max_workers(self, max_workers: int):
+        """Change pool size; extra slots are filled immediately"""
+        self.max_workers = max(1, max_workers)
+        self._dispatch()
+
+    def running_count(self) -> int:
+        return sum(1 for job in self.jobs.values()
+                   if job.worker is not None and job.worker.isRunning())
+
+    def active_count(self) -> int:
+        return sum(1 for job in self.jobs.values() if job.is_active)
+
+    def shutdown(self):
+        """Cancel everything (used on window close)"""
+        for job_id in list(self.pending):
+            self.cancel(job_id)
+        for job in self.jobs.values():
+            if job.status == BuildJob.RUNNING:
+                self.cancel(job.job_id)
+
+    def _dispatch(self):
+        """Start pending jobs while worker slots are free"""
+        while self.pending and self.running_count() < self.max_workers:
+            job = self.jobs[self.pending.pop(0)]
+            self._start(job)
+
+    def _start(self, job: BuildJob):
+        job.status = BuildJob.RUNNING
+        job.attempts += 1
+        job.started_at = time.time()
+
+        worker = self.worker_factory(job)
+        job.worker = worker
+        job_id = job.job_id
+        worker.log_signal.connect(lambda message: self.log_signal.emit(job_id, message))
+        worker.finished_signal.connect(
+            lambda project, url: self._on_finished(job_id, project, url))
+        worker.error_signal.connect(lambda error: self._on_error(job_id, error))
+        worker.finished.connect(lambda: self._on_thread_done(job_id))
+        self.job_updated.emit(job_id)
+        worker.start()
+
+    def _on_finished(self, job_id: int, project_name: str, dev_url: str):
+        job = self.jobs[job_id]
+        if job.status != BuildJob.RUNNING:
+            return
+        job.project_name = project_name
+        job.dev_url = dev_url
+        self._finish(job, BuildJob.DONE)
+        self.job_finished.emit(job_id, project_name, dev_url)
+
+    def _on_error(self, job_id: int, error: str):
+        job = self.jobs[job_id]
+        if job.status != BuildJob.RUNNING:
+            return
+        job.error = error
+        self._finish(job, BuildJob.FAILED)
+        self.job_failed.emit(job_id, error)
+
+    def _on_thread_done(self, job_id: int):
+        """Worker thread exited - free its slot"""
+        job = self.jobs[job_id]
+        if job.status == BuildJob.RUNNING:
+            # Thread ended without reporting anything
+            job.error = "Worker stopped without a result"
+            self._finish(job, BuildJob.FAILED)
+            self.job_failed.emit(job_id, job.error)
+        else:
+            self.job_updated.emit(job_id)
+        self._dispatch()
+
+    def _finish(self, job: BuildJob, status: str):
+        job.status = status
+        job.finished_at = time.time()
+        self.job_updated.emit(job.job_id)
+
+
+class DeployWorker(QThread):
+    """Runs a DeployPipeline off the GUI thread, same signals as ClaudeWorker"""
+    log_signal = pyqtSignal(str)
+    finished_signal = pyqtSignal(str, str)  # project_name, deployment URL ("" if unknown)
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, project_dir: Path):
+        super().__init__()
+        self.project_dir = Path(project_dir)
+        self.pipeline = DeployPipeline(self.project_dir, self.log_signal.emit)
+
+    def cancel(self):
+        self.pipeline.cancel()
+
+    def run(self):
+        try:
+            url = self.pipeline.run()
+            self.finished_signal.emit(self.project_dir.name, url or "")
+        except DeployCancelled:
+            self.log_signal.emit("Deploy cancelled")
+        except (DeployError, OSError) as e:
+            self.error_signal.emit(str(e))
+        except Exception as e:
+            # Anything else would end the thread silently ("Worker stopped without a result")
+            self.error_signal.emit(f"Deploy failed: {type(e).__name__}: {e}")
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Demo Website Builder - Build Traces
+Structured timeline of every build and deploy: each LLM request, tool call,
+dev server start, npm build and upload is a span with start/end time and
+attributes, appended to a per-build JSONL file in ~/.cache/demo-builder/traces/.
+
+Traces export to the Chrome trace event format (open in https://ui.perfetto.dev
+or chrome://tracing) or to a self-contained HTML timeline, and `summary`
+shows which stages are slow across many builds.
+
+Usage:
+    python3 build_trace.py list [N]
+    python3 build_trace.py chrome <trace.jsonl> [out.json]
+    python3 build_trace.py html <trace.jsonl> [out.html]
+    python3 build_trace.py summary [N]      # slowest span names over the last N traces
+"""
+
+import html
+import itertools
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+CACHE_DIR = Path(os.environ.get("DEMO_BUILDER_CACHE", Path.home() / ".cache" / "demo-builder"))
+TRACE_DIR = CACHE_DIR / "traces"
+MAX_ATTR_CHARS = 300
+
+# Span colors in the HTML timeline, by name prefix
+COLORS = {"build": "#94a3b8", "deploy": "#94a3b8", "llm": "#6366f1", "tool": "#10b981",
+          "command": "#f59e0b", "dev_server": "#ec4899", "crawl": "#0ea5e9", "images": "#a855f7"}
+
+
+def _clean(value: Any) -> Any:
+    """Attribute values as short JSON-safe scalars"""
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    return text if len(text) <= MAX_ATTR_CHARS else text[:MAX_ATTR_CHARS] + "..."
+
+
+class Span:
+    """One timed stage; set() adds attributes until it ends"""
+
+    def __init__(self, span_id: int, name: str, parent: Optional[int], attrs: Dict[str, Any]):
+        self.id = span_id
+        self.name = name
+        self.parent = parent
+        self.thread = threading.current_thread().name
+        self.start = time.time()
+        self.attrs = {key: _clean(value) for key, value in attrs.items()}
+
+    def set(self, **attrs):
+        self.attrs.update({key: _clean(value) for key, value in attrs.items()})
+
+
+class Tracer:
+    """Writes the spans of one build to a JSONL file (thread-safe).
+
+    Spans nest per thread; spans started on worker threads (parallel tools)
+    hang below the first span of the trace. The file is created on the
+    first finished span.
+    """
+
+    def __init__(self, path: Path, **attrs):
+        self.path = Path(path)
+        self.attrs = attrs
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.local = threading.local()
+        self.root: Optional[int] = None
+        self.file = None
+        self.closed = False  # Late events (cancel, background commands) are dropped
+
+    @classmethod
+    def for_build(cls, project_name: str, kind: str, **attrs) -> "Tracer":
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")[:-3]
+        return cls(TRACE_DIR / f"{stamp}-{project_name}-{kind}.jsonl",
+                   project_name=project_name, kind=kind, **attrs)
+
+    def _stack(self) -> List[Span]:
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+    def start(self, name: str, **attrs) -> Span:
+        stack = self._stack()
+        parent = stack[-1].id if stack else self.root
+        span = Span(next(self.ids), name, parent, attrs)
+        if self.root is None:
+            self.root = span.id
+        stack.append(span)
+        return span
+
+    def end(self, span: Span, **attrs):
+        span.set(**attrs)
+        stack = self._stack()
+        if span in stack:
+            stack.remove(span)
+        end = time.time()
+        self._write({"type": "span", "id": span.id, "parent": span.parent, "name": span.name,
+                     "thread": span.thread, "start": span.start, "end": end,
+                     "duration": round(end - span.start, 4), "attrs": span.attrs})
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        span = self.start(name, **attrs)
+        try:
+            yield span
+        except BaseException as e:
+            span.set(error=f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            self.end(span)
+
+    def event(self, name: str, **attrs):
+        """Point in time (cancel, cache hit, ...)"""
+        self._write({"type": "event", "name": name, "thread": threading.current_thread().name,
+                     "time": time.time(), "attrs": {key: _clean(value) for key, value in attrs.items()}})
+
+    def _write(self, record: Dict[str, Any]):
+        with self.lock:
+            if self.closed:
+                return
+            if self.file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self.file = open(self.path, "a", encoding="utf-8")
+                header = {"type": "trace", "started": time.time(), **self.attrs}
+                self.file.write(json.dumps(header, default=str) + "\n")
+            self.file.write(json.dumps(record, default=str) + "\n")
+            self.file.flush()
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            if self.file:
+                self.file.close()
+                self.file = None
+
+
+def load_trace(path: Path) -> Tuple[Dict[str, Any], List[Dict], List[Dict]]:
+    """(header, spans, events) of a trace file; skips a half-written last line"""
+    header, spans, events = {}, [], []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if record["type"] == "trace":
+            header = record
+        elif record["type"] == "span":
+            spans.append(record)
+        else:
+            events.append(record)
+    return header, spans, events
+
+
+def to_chrome(header: Dict, spans: List[Dict], events: List[Dict]) -> Dict:
+    """Chrome trace event format ("X" complete events, microseconds)"""
+    threads: Dict[str, int] = {}
+    trace_events = []
+    for span in sorted(spans, key=lambda s: s["start"]):
+        tid = threads.setdefault(span["thread"], len(threads) + 1)
+        trace_events.append({"name": span["name"], "cat": span["name"].split(":")[0], "ph": "X",
+                             "ts": span["start"] * 1e6, "dur": (span["end"] - span["start"]) * 1e6,
+                             "pid": 1, "tid": tid, "args": span["attrs"]})
+    for event in events:
+        tid = threads.setdefault(event["thread"], len(threads) + 1)
+        trace_events.append({"name": event["name"], "ph": "i", "s": "t", "ts": event["time"] * 1e6,
+                             "pid": 1, "tid": tid, "args": event["attrs"]})
+    for name, tid in threads.items():
+        trace_events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": name}})
+    trace_events.append({"name": "process_name", "ph": "M", "pid": 1,
+                         "args": {"name": f"{header.get('project_name', '?')} ({header.get('kind', '?')})"}})
+    return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+
+def to_html(header: Dict, spans: List[Dict], events: List[Dict]) -> str:
+    """Self-contained timeline page: one row per thread, nested spans stacked"""
+    if not spans:
+        return "<p>Empty trace</p>"
+    begin = min(span["start"] for span in spans)
+    total = max(max(span["end"] for span in spans) - begin, 0.001)
+
+    depth: Dict[int, int] = {}
+    for span in sorted(spans, key=lambda s: s["id"]):
+        depth[span["id"]] = depth.get(span["parent"], -1) + 1 if span["parent"] in depth else 0
+
+    rows: Dict[str, List[str]] = {}
+    for span in sorted(spans, key=lambda s: s["start"]):
+        color = COLORS.get(re.split(r"[:_]", span["name"])[0], "#64748b")
+        tooltip = html.escape(f"{span['name']} {span['duration']:.2f}s\n"
+                              + "\n".join(f"{k}: {v}" for k, v in span["attrs"].items()))
+        rows.setdefault(span["thread"], []).append(
+            f'<div class="span" title="{tooltip}" style="left:{(span["start"] - begin) / total * 100:.3f}%;'
+            f'width:{max((span["end"] - span["start"]) / total * 100, 0.05):.3f}%;'
+            f'top:{depth[span["id"]] * 22}px;background:{color}">{html.escape(span["name"])}</div>')
+
+    lanes = "".join(
+        f'<div class="lane"><div class="label">{html.escape(thread)}</div>'
+        f'<div class="track" style="height:{(max(depth.values()) + 1) * 22}px">{"".join(bars)}</div></div>'
+        for thread, bars in rows.items())
+    title = html.escape(f"{header.get('project_name', 'trace')} ({header.get('kind', '')}) - {total:.1f}s")
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title><style>
+body {{ font: 12px -apple-system, sans-serif; margin: 20px; }}
+.lane {{ display: flex; border-top: 1px solid #e5e7eb; padding: 4px 0; }}
+.label {{ width: 140px; flex-shrink: 0; color: #555; }}
+.track {{ position: relative; flex: 1; }}
+.span {{ position: absolute; height: 20px; line-height: 20px; color: white; font-size: 11px;
+         overflow: hidden; white-space: nowrap; border-radius: 3px; padding: 0 3px; box-sizing: border-box; }}
+</style></head><body><h2>{title}</h2>{lanes}</body></html>
+"""
+
+
+def trace_files(limit: Optional[int] = None) -> List[Path]:
+    files = sorted(TRACE_DIR.glob("*.jsonl"), reverse=True) if TRACE_DIR.exists() else []
+    return files[:limit] if limit else files
+
+
+def summarize(paths: List[Path]) -> List[Tuple[str, int, float, float, float]]:
+    """(name, count, total, p50, p95) per span name, slowest total first"""
+    durations: Dict[str, List[float]] = {}
+    for path in paths:
+        for span in load_trace(path)[1]:
+            durations.setdefault(span["name"], []).append(span["duration"])
+    summary = []
+    for name, values in durations.items():
+        values.sort()
+        summary.append((name, len(values), sum(values),
+                        values[len(values) // 2], values[min(len(values) - 1, int(len(values) * 0.95))]))
+    return sorted(summary, key=lambda row: row[2], reverse=True)
+
+
+def main():
+    commands = ("list", "chrome", "html", "summary")
+    if len(sys.argv) < 2 or sys.argv[1] not in commands:
+        print(__doc__)
+        sys.exit(1)
+
+    command = sys.argv[1]
+    if command in ("list", "summary"):
+        limit = int(sys.argv[2]) if len(sys.argv) > 2 else (20 if command == "list" else None)
+        if command == "list":
+            for path in trace_files(limit):
+                print(path)
+            return
+        paths = trace_files(limit)
+        print(f"{len(paths)} traces\n{'span':<28} {'count':>6} {'total':>9} {'p50':>8} {'p95':>8}")
+        for name, count, total, p50, p95 in summarize(paths):
+            print(f"{name:<28} {count:>6} {total:>8.1f}s {p50:>7.2f}s {p95:>7.2f}s")
+        return
+
+    if len(sys.argv) < 3:
+        print(f"Usage: python3 build_trace.py {command} <trace.jsonl> [out]")
+        sys.exit(1)
+    path = Path(sys.argv[2])
+    trace = load_trace(path)
+    if command == "chrome":
+        out = Path(sys.argv[3]) if len(sys.argv) > 3 else path.with_suffix(".trace.json")
+        out.write_text(json.dumps(to_chrome(*trace)))
+    else:
+        out = Path(sys.argv[3]) if len(sys.argv) > 3 else path.with_suffix(".html")
+        out.write_text(to_html(*trace), encoding="utf-8")
+    print(f"Wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Demo Website Builder - Command Runner
+Shell commands for the run_command tool: output is streamed to the log as it
+arrives and a command is only stopped after a stretch without any output,
+not after a fixed time. Long commands (npm install) can run in the
+background while Claude keeps working, and are checked with poll_command.
+"""
+
+import os
+import signal
+import subprocess
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from artifact_store import ArtifactStore
+
+IDLE_TIMEOUT = 120  # Seconds without output before a command counts as hung
+BACKGROUND_IDLE_TIMEOUT = 600
+MAX_IDLE_TIMEOUT = 1800
+MAX_POLL_WAIT = 60
+POLL_LINES = 30  # New lines shown per poll of a running command
+KILL_GRACE = 3
+
+
+class CommandJob:
+    """One shell command in its own process group; output collected by a reader thread"""
+
+    def __init__(self, job_id: str, command: str, cwd: Optional[str], log: Callable[[str], None]):
+        self.id = job_id
+        self.command = command
+        self.cwd = cwd
+        self.lines: List[str] = []
+        self.polled = 0  # Lines already shown by poll()
+        self.started = self.last_output = time.monotonic()
+        self.finished = threading.Event()
+        self.exit_code: Optional[int] = None
+        self.stopped: Optional[str] = None  # Why it was killed, if it was
+        self.handle: Optional[str] = None
+        self.duration = 0.0
+
+        self.process = subprocess.Popen(
+            command,
+            shell=True,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            text=True,
+            errors="replace",
+            bufsize=1,
+            env={**os.environ, "FORCE_COLOR": "0", "CI": "1"},
+            start_new_session=True  # killpg also stops npm's node children
+        )
+        self.reader = threading.Thread(target=self._read, args=(log,), daemon=True)
+        self.reader.start()
+
+    def _read(self, log: Callable[[str], None]):
+        for line in self.process.stdout:
+            line = line.rstrip()
+            self.last_output = time.monotonic()
+            self.lines.append(line)
+            if line:
+                log(line)
+
+    @property
+    def output(self) -> str:
+        return "\n".join(self.lines)
+
+    def kill(self, reason: str):
+        if self.process.poll() is not None:
+            return
+        self.stopped = reason
+        try:
+            os.killpg(self.process.pid, signal.SIGTERM)
+            self.process.wait(timeout=KILL_GRACE)
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass  # Exited between the timeout and the kill
+            self.process.wait()
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+class CommandRunner:
+    """Foreground and background commands of one build"""
+
+    def __init__(self, artifacts: ArtifactStore, log: Optional[Callable[[str], None]] = None,
+                 cancelled: Callable[[], bool] = lambda: False, trace=None):
+        self.artifacts = artifacts
+        self.log = log or print
+        self.cancelled = cancelled
+        self.trace = trace
+        self.jobs: Dict[str, CommandJob] = {}
+        self.lock = threading.Lock()
+
+    def _wait(self, job: CommandJob, idle_timeout: float):
+        """Block until the command exits, is cancelled or stays silent for idle_timeout"""
+        while True:
+            try:
+                job.process.wait(timeout=0.5)
+                break
+            except subprocess.TimeoutExpired:
+                pass
+            if self.cancelled():
+                job.kill("build cancelled")
+            elif time.monotonic() - job.last_output > idle_timeout:
+                job.kill(f"no output for {idle_timeout:.0f}s")
+        # A daemon the command started may keep the pipe open - don't wait for it
+        job.reader.join(timeout=2)
+        job.exit_code = job.process.returncode
+        job.duration = time.monotonic() - job.started
+        job.handle = self.artifacts.save(job.output, command=job.command, cwd=job.cwd,
+                                         exit_code=job.exit_code, stopped=job.stopped,
+                                         duration=round(job.duration, 1))
+        job.finished.set()
+
+    def _result(self, job: CommandJob) -> str:
+        summary = self.artifacts.summarize(job.output.rstrip(), job.handle)
+        if job.stopped:
+            status = f"stopped after {job.duration:.0f}s: {job.stopped}"
+            if job.stopped.startswith("no output"):
+                status += ". If it is just slow, use a longer idle_timeout or background=true"
+        else:
+            status = f"exit code {job.exit_code} after {job.duration:.1f}s"
+        return f"{summary}\n[{status}, output {job.handle}]"
+
+    def _start(self, command: str, cwd: Optional[str]) -> CommandJob:
+        with self.lock:
+            job_id = f"cmd-{len(self.jobs) + 1}"
+            job = CommandJob(job_id, command, cwd, self.log)
+            self.jobs[job_id] = job
+        return job
+
+    def run(self, command: str, cwd: Optional[str] = None, idle_timeout: Optional[float] = None) -> str:
+        """run_command tool: wait for the command, streaming its output to the log"""
+        job = self._start(command, cwd)
+        self._wait(job, min(idle_timeout or IDLE_TIMEOUT, MAX_IDLE_TIMEOUT))
+        return self._result(job)
+
+    def run_background(self, command: str, cwd: Optional[str] = None,
+                       idle_timeout: Optional[float] = None) -> str:
+        """run_command tool with background=true: return right away, poll_command later"""
+        job = self._start(command, cwd)
+        timeout = min(idle_timeout or BACKGROUND_IDLE_TIMEOUT, MAX_IDLE_TIMEOUT)
+
+        def watch():
+            self._wait(job, timeout)
+            self.log(f"Background command {job.id} finished ({job.stopped or f'exit code {job.exit_code}'})")
+            if self.trace:
+                self.trace.event("background_command", id=job.id, command=command, exit_code=job.exit_code,
+                                 duration=round(job.duration, 1), stopped=job.stopped)
+
+        threading.Thread(target=watch, daemon=True, name=f"command-{job.id}").start()
+        return (f"Started in the background as {job.id}. Keep working and check it with "
+                f"poll_command (id={job.id}, wait_seconds up to {MAX_POLL_WAIT} to wait for it).")
+
+    def poll(self, job_id: str, wait_seconds: float = 0, stop: bool = False) -> str:
+        """poll_command tool: new output of a background command, or its result once done"""
+        job = self.jobs.get(job_id)
+        if not job:
+            return f"Error: unknown command id '{job_id}'"
+        if stop:
+            job.kill("stopped by poll_command")
+            # The watch thread notices the exit within its next 0.5s check
+            job.finished.wait(timeout=KILL_GRACE + 1)
+
+        deadline = time.monotonic() + min(max(wait_seconds or 0, 0), MAX_POLL_WAIT)
+        while not job.finished.is_set() and not self.cancelled():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            job.finished.wait(timeout=min(0.5, remaining))
+        if job.finished.is_set():
+            return self._result(job)
+
+        new = job.lines[job.polled:]
+        job.polled += len(new)
+        shown = new[-POLL_LINES:]
+        header = (f"[{job.id} still running for {time.monotonic() - job.started:.0f}s, "
+                  f"{len(job.lines)} lines so far, {len(new)} new"
+                  f"{f', last {len(shown)} shown' if len(shown) < len(new) else ''}]")
+        return "\n".join([header] + shown)
+
+    def shutdown(self):
+        """Stop background commands still running when the build ends"""
+        for job in list(self.jobs.values()):
+            job.kill("build finished")
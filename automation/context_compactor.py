@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Demo Website Builder - Conversation Compaction
+Keeps the ClaudeWorker message list under a token budget
+"""
+
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from file_tools import MAX_PAGE_LINES
+
+CONTEXT_BUDGET = 60000  # Estimated tokens before we compact
+COMPACT_TARGET = 0.5  # Summarize down to this fraction of the budget
+KEEP_RECENT_MESSAGES = 6  # Never touch the last few turns
+MIN_RECENT_MESSAGES = 2  # ... unless they alone are over budget, then keep at least the last turn
+STUB_CHARS = 300
+SUMMARY_MARKER = "PROGRESS SO FAR"
+
+FILE_TOOLS = {"read_file", "write_file", "edit_file", "apply_patch"}
+WHOLE_FILE = float("inf")
+PAGE_FOOTER = re.compile(r"\[lines (\d+)-(\d+) of \d+")
+
+
+def content_to_dicts(content: List[Any]) -> List[Dict[str, Any]]:
+    """Turn SDK content blocks into plain dicts so they can be compacted later"""
+    blocks = []
+    for block in content:
+        if isinstance(block, dict):
+            blocks.append(block)
+        elif block.type == "text":
+            blocks.append({"type": "text", "text": block.text})
+        elif block.type == "tool_use":
+            blocks.append({"type": "tool_use", "id": block.id, "name": block.name,
+                           "input": dict(block.input)})
+    return blocks
+
+
+def estimate_tokens(messages: List[Dict[str, Any]]) -> int:
+    """Rough token count (~4 characters per token)"""
+    return len(json.dumps(messages, ensure_ascii=False, default=str)) // 4
+
+
+def _blocks(message: Dict[str, Any]) -> List[Dict[str, Any]]:
+    content = message["content"]
+    return content if isinstance(content, list) else []
+
+
+def _read_range(tool_input: Dict[str, Any], result: Optional[Dict[str, Any]]) -> Tuple[float, float]:
+    """Lines a read_file call returned: its start_line/end_line, else the whole file or first page"""
+    start, end = tool_input.get("start_line"), tool_input.get("end_line")
+    if start is None and end is None:
+        content = result.get("content") if result else None
+        if isinstance(content, str):
+            footer = PAGE_FOOTER.search(content[-200:])
+            if footer:
+                return int(footer.group(1)), int(footer.group(2))
+            if content.startswith(f"{1:>5}| "):
+                return 1, MAX_PAGE_LINES  # Large file, first page only (footer elided)
+        return 1, WHOLE_FILE
+    start = max(1, start or 1)
+    return start, min(end or WHOLE_FILE, start + MAX_PAGE_LINES - 1)
+
+
+def _patch_paths(tool_input: Dict[str, Any]) -> List[str]:
+    paths = [edit.get("path") for edit in tool_input.get("edits") or []]
+    return paths + re.findall(r"^\+\+\+ (?:b/)?(\S+)", tool_input.get("patch") or "", re.MULTILINE)
+
+
+def _same_file(path: str, other: str) -> bool:
+    """apply_patch paths may be relative to the project, reads usually absolute"""
+    if path == other:
+        return True
+    return not os.path.isabs(path) and other.endswith(os.sep + path) \
+        or not os.path.isabs(other) and path.endswith(os.sep + other)
+
+
+def _stub(text: str, reason: str) -> str:
+    if len(text) <= STUB_CHARS:
+        return text
+    return f"{text[:STUB_CHARS]}\n... [{len(text) - STUB_CHARS} chars elided: {reason}]"
+
+
+class ContextCompactor:
+    """Elides stale tool output and summarizes old turns once over budget.
+
+    Compaction rewrites earlier messages, which invalidates the prompt cache
+    from that point on - so it only runs when the budget is exceeded and then
+    shrinks well below it, leaving a stable prefix for the next iterations.
+    If the recent turns alone are too big, the recent window shrinks; if even
+    that can't get under budget, the next compaction waits until the history
+    has grown by the same headroom instead of rewriting it every turn.
+    """
+
+    def __init__(self, budget: int = CONTEXT_BUDGET, keep_recent: int = KEEP_RECENT_MESSAGES):
+        self.budget = budget
+        self.keep_recent = keep_recent
+        self.summarized = 1  # Messages before this index are already compacted
+        self.floor = 0  # Tokens left after the last compaction
+
+    def compact(self, messages: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Compact messages in place, return (tokens before, tokens after)"""
+        before = estimate_tokens(messages)
+        threshold = max(self.budget, self.floor + int(self.budget * (1 - COMPACT_TARGET)))
+        if before <= threshold:
+            return before, before
+
+        self.elide_stale(messages)
+        after = estimate_tokens(messages)
+        keep = self.keep_recent
+        while after > self.budget * COMPACT_TARGET and keep >= MIN_RECENT_MESSAGES:
+            self.summarize_old_turns(messages, keep)
+            after = estimate_tokens(messages)
+            keep -= 2  # One assistant turn and its tool results
+        self.floor = after
+        return before, after
+
+    def elide_stale(self, messages: List[Dict[str, Any]]):
+        """Drop file contents that a later read or change of the same file superseded.
+
+        A read is superseded by a later read covering its line range, or by
+        any later write/edit/apply_patch of the file.
+        """
+        results = self._tool_results(messages)
+        # Every file tool call in order: (block, tool name, paths, line range of a read)
+        calls = []
+        for message in messages:
+            if message["role"] != "assistant":
+                continue
+            for block in _blocks(message):
+                if block.get("type") != "tool_use" or block.get("name") not in FILE_TOOLS:
+                    continue
+                name, tool_input = block["name"], block.get("input", {})
+                paths = _patch_paths(tool_input) if name == "apply_patch" else [tool_input.get("path")]
+                paths = [os.path.normpath(path) for path in paths if path]
+                if paths:
+                    lines = _read_range(tool_input, results.get(block["id"])) if name == "read_file" else None
+                    calls.append((block, name, paths, lines))
+
+        for position, (block, name, paths, lines) in enumerate(calls):
+            later = [(later_name, later_lines) for _, later_name, later_paths, later_lines in calls[position + 1:]
+                     if any(_same_file(path, other) for path in paths for other in later_paths)]
+            changed = any(later_name != "read_file" for later_name, _ in later)
+            reads = [later_lines for later_name, later_lines in later if later_name == "read_file"]
+
+            if name == "read_file":
+                covered = any(start <= lines[0] and end >= lines[1] for start, end in reads)
+                result = results.get(block["id"])
+                if (changed or covered) and result and isinstance(result.get("content"), str):
+                    result["content"] = _stub(result["content"], f"{paths[0]} was read or changed again later")
+            elif name == "write_file" and (any(later_name == "write_file" for later_name, _ in later)
+                                           or (1, WHOLE_FILE) in reads):
+                content = block["input"].get("content")
+                if isinstance(content, str):
+                    block["input"]["content"] = _stub(content, "file was rewritten or re-read later")
+
+    def summarize_old_turns(self, messages: List[Dict[str, Any]], keep_recent: Optional[int] = None):
+        """Shrink everything but the task prompt and recent turns to stubs plus a summary"""
+        cutoff = max(1, len(messages) - (self.keep_recent if keep_recent is None else keep_recent))
+        if cutoff <= self.summarized:
+            return  # Nothing new since the last summary
+        actions = []
+
+        for message in messages[self.summarized:cutoff]:
+            for block in _blocks(message):
+                kind = block.get("type")
+                if kind == "tool_use":
+                    actions.append(self._describe(block))
+                    tool_input = block.get("input", {})
+                    for key in ("content", "new_string", "old_string", "patch"):
+                        if isinstance(tool_input.get(key), str):
+                            tool_input[key] = _stub(tool_input[key], "old turn compacted")
+                    for edit in tool_input.get("edits") or []:
+                        for key in ("new_string", "old_string"):
+                            if isinstance(edit.get(key), str):
+                                edit[key] = _stub(edit[key], "old turn compacted")
+                elif kind == "tool_result" and isinstance(block.get("content"), str):
+                    block["content"] = _stub(block["content"], "old turn compacted")
+                elif kind == "text" and isinstance(block.get("text"), str):
+                    block["text"] = _stub(block["text"], "old turn compacted")
+
+        self.summarized = cutoff
+        self._write_summary(messages[0], actions)
+
+    def _tool_results(self, messages: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        results = {}
+        for message in messages:
+            if message["role"] == "user":
+                for block in _blocks(message):
+                    if block.get("type") == "tool_result":
+                        results[block["tool_use_id"]] = block
+        return results
+
+    def _describe(self, block: Dict[str, Any]) -> Optional[str]:
+        tool_input = block.get("input", {})
+        name = block.get("name")
+        if name == "write_file":
+            return f"wrote {tool_input.get('path')}"
+        if name == "edit_file":
+            return f"edited {tool_input.get('path')}"
+        if name == "apply_patch":
+            return f"patched {', '.join(sorted(set(str(path) for path in _patch_paths(tool_input))))}"
+        if name == "read_file":
+            return f"read {tool_input.get('path')}"
+        if name == "run_command":
+            return f"ran `{tool_input.get('command')}`"
+        if name == "fetch_url":
+            return f"fetched {tool_input.get('url')}"
+        return f"called {name}"
+
+    def _write_summary(self, first_message: Dict[str, Any], actions: List[Optional[str]]):
+        """Keep one running summary block in the task prompt message"""
+        blocks = first_message["content"]
+        if not isinstance(blocks, list):
+            blocks = first_message["content"] = [{"type": "text", "text": blocks}]
+
+        previous = []
+        for block in list(blocks):
+            if block.get("type") == "text" and block["text"].startswith(SUMMARY_MARKER):
+                previous = block["text"].split("\n")[1:]
+                blocks.remove(block)
+
+        lines = previous + [f"- {action}" for action in actions if action and f"- {action}" not in previous]
+        text = f"{SUMMARY_MARKER} (older turns were compacted, re-read files if you need their content):\n"
+        blocks.append({"type": "text", "text": text + "\n".join(lines)})
@@ -4,103 +4,26 @@ Demo Website Builder - Local Desktop App
 Automates the creation of demo websites using Claude API
 """
 
-import os
 import sys
-import json
-import subprocess
-import time
-from pathlib import Path
-from typing import Optional, Dict, List, Any
-import anthropic
+import threading
+from typing import Optional, Dict
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLineEdit, QPushButton, QTextEdit, QLabel, QSplitter, QMessageBox,
-    QComboBox, QDialog, QFormLayout, QDialogButtonBox, QGroupBox
+    QLineEdit, QPushButton, QLabel, QSplitter, QMessageBox,
+    QComboBox, QDialog, QFormLayout, QDialogButtonBox, QGroupBox,
+    QTableWidget, QTableWidgetItem, QAbstractItemView, QHeaderView, QSpinBox
 )
-from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QUrl, QTimer
-from dotenv import load_dotenv
-
-load_dotenv()
-
-# Configuration
-DEMOS_DIR = Path(__file__).parent.parent / "demos"
-TEMPLATE_DIR = DEMOS_DIR / "template"
-WORKFLOW_PATH = TEMPLATE_DIR / "WORKFLOW.md"
-CONFIG_PATH = Path(__file__).parent / "config.json"
-
-
-class APIKeyManager:
-    """Manage multiple API keys"""
-
-    def __init__(self):
-        self.config_path = CONFIG_PATH
-        self.load_config()
-
-    def load_config(self):
-        """Load API keys from config file"""
-        if self.config_path.exists():
-            with open(self.config_path, 'r') as f:
-                self.config = json.load(f)
-        else:
-            # Create default config
-            default_key = os.getenv("ANTHROPIC_API_KEY", "")
-            self.config = {
-                "api_keys": [
-                    {"name": "Default", "key": default_key, "active": True}
-                ] if default_key else [],
-                "active_key_index": 0
-            }
-            self.save_config()
-
-    def save_config(self):
-        """Save API keys to config file"""
-        with open(self.config_path, 'w') as f:
-            json.dump(self.config, f, indent=2)
-
-    def get_keys(self) -> List[Dict[str, str]]:
-        """Get all API keys"""
-        return self.config.get("api_keys", [])
-
-    def get_active_key(self) -> Optional[str]:
-        """Get currently active API key"""
-        keys = self.get_keys()
-        active_index = self.config.get("active_key_index", 0)
-        if keys and 0 <= active_index < len(keys):
-            return keys[active_index]["key"]
-        return None
-
-    def get_active_key_name(self) -> Optional[str]:
-        """Get name of active API key"""
-        keys = self.get_keys()
-        active_index = self.config.get("active_key_index", 0)
-        if keys and 0 <= active_index < len(keys):
-            return keys[active_index]["name"]
-        return None
-
-    def set_active_key(self, index: int):
-        """Set active API key by index"""
-        if 0 <= index < len(self.get_keys()):
-            self.config["active_key_index"] = index
-            self.save_config()
-
-    def add_key(self, name: str, key: str):
-        """Add new API key"""
-        keys = self.get_keys()
-        keys.append({"name": name, "key": key})
-        self.config["api_keys"] = keys
-        self.save_config()
-
-    def remove_key(self, index: int):
-        """Remove API key"""
-        keys = self.get_keys()
-        if 0 <= index < len(keys):
-            keys.pop(index)
-            self.config["api_keys"] = keys
-            # Adjust active index if needed
-            if self.config["active_key_index"] >= len(keys):
-                self.config["active_key_index"] = max(0, len(keys) - 1)
-            self.save_config()
+from build_queue import BuildJob, BuildQueue, DeployWorker
+from dev_server import dev_servers
+from package_store import PackageStore
+from deploy_pipeline import MAX_CONCURRENT_DEPLOYS
+from demo_core import (
+    APIKeyManager, BuildCancelled, DemoBuild, DEMOS_DIR, project_name_from_url
+)
+from web_preview import LazyWebView, prepare_web_engine
+from log_view import LogView
+from usage_store import format_totals, start_of_today, usage_store
 
 
 class APIKeyDialog(QDialog):
@@ -181,278 +104,38 @@ class APIKeyDialog(QDialog):
 
 
 class ClaudeWorker(QThread):
-    """Background thread for Claude API calls"""
+    """Runs a DemoBuild in a background thread and reports through signals"""
     log_signal = pyqtSignal(str)
     finished_signal = pyqtSignal(str, str)  # project_name, dev_url
     error_signal = pyqtSignal(str)
+    usage_signal = pyqtSignal(dict)  # Running token/cost totals after every request
 
     def __init__(self, api_key: str, url: str, change_request: Optional[str] = None, project_name: Optional[str] = None):
         super().__init__()
-        self.api_key = api_key
-        self.url = url
-        self.change_request = change_request
-        self.project_name = project_name
-        self.client = anthropic.Anthropic(api_key=api_key)
-        self.conversation_history = []
-        self.dev_process = None
+        self.build = DemoBuild(api_key, url, change_request, project_name, log=self.log,
+                               on_usage=self.usage_signal.emit)
 
     def log(self, message: str):
         """Emit log message to UI"""
         self.log_signal.emit(message)
         print(f"[LOG] {message}")
 
-    def read_file(self, path: str) -> str:
-        """Tool: Read file contents"""
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except Exception as e:
-            return f"Error reading file: {str(e)}"
-
-    def write_file(self, path: str, content: str) -> str:
-        """Tool: Write file contents"""
-        try:
-            os.makedirs(os.path.dirname(path), exist_ok=True)
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            return f"Successfully wrote to {path}"
-        except Exception as e:
-            return f"Error writing file: {str(e)}"
-
-    def edit_file(self, path: str, old_string: str, new_string: str) -> str:
-        """Tool: Edit file with string replacement"""
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            if old_string not in content:
-                return f"Error: old_string not found in {path}"
-
-            new_content = content.replace(old_string, new_string)
-
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
-
-            return f"Successfully edited {path}"
-        except Exception as e:
-            return f"Error editing file: {str(e)}"
-
-    def run_command(self, command: str, cwd: Optional[str] = None) -> str:
-        """Tool: Run shell command"""
-        try:
-            self.log(f"Running: {command}")
-            result = subprocess.run(
-                command,
-                shell=True,
-                cwd=cwd,
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
-            output = result.stdout + result.stderr
-            return output[:2000]  # Limit output
-        except Exception as e:
-            return f"Error running command: {str(e)}"
-
-    def start_dev_server(self, project_path: str) -> str:
-        """Start npm dev server in background"""
-        try:
-            self.log(f"Starting dev server in {project_path}")
-            self.dev_process = subprocess.Popen(
-                ["npm", "run", "dev"],
-                cwd=project_path,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            time.sleep(5)  # Wait for server to start
-            return "Dev server started on http://localhost:4321"
-        except Exception as e:
-            return f"Error starting dev server: {str(e)}"
-
-    def stop_dev_server(self):
-        """Stop dev server"""
-        if self.dev_process:
-            self.dev_process.terminate()
-            self.dev_process = None
-
-    def execute_tool(self, tool_name: str, tool_input: Dict[str, Any]) -> str:
-        """Execute a tool call from Claude"""
-        self.log(f"Executing tool: {tool_name}")
-
-        if tool_name == "read_file":
-            return self.read_file(tool_input["path"])
-        elif tool_name == "write_file":
-            return self.write_file(tool_input["path"], tool_input["content"])
-        elif tool_name == "edit_file":
-            return self.edit_file(
-                tool_input["path"],
-                tool_input["old_string"],
-                tool_input["new_string"]
-            )
-        elif tool_name == "run_command":
-            return self.run_command(
-                tool_input["command"],
-                tool_input.get("cwd")
-            )
-        elif tool_name == "start_dev_server":
-            return self.start_dev_server(tool_input["project_path"])
-        else:
-            return f"Unknown tool: {tool_name}"
+    def cancel(self):
+        """Stop after the current step"""
+        self.build.cancel()
 
     def run(self):
         """Main worker thread execution"""
         try:
-            # Read workflow
-            workflow = self.read_file(str(WORKFLOW_PATH))
-
-            # Build initial prompt
-            if self.change_request:
-                prompt = f"The user requested changes to the existing demo website:\n\n{self.change_request}\n\nPlease make the requested changes to the project at {DEMOS_DIR / self.project_name}"
-            else:
-                prompt = f"""Create a new demo website following the workflow below.
-
-Original website URL: {self.url}
-
-WORKFLOW:
-{workflow}
-
-Instructions:
-1. Fetch the original website content
-2. Create a new Astro project in demos/ (use domain name as project name)
-3. Copy components from template
-4. Customize everything according to workflow
-5. Start dev server when done
-6. Report back when ready for review
-
-Important: Follow the workflow exactly. Don't forget:
-- AI Chatbot personalization with primaryColor
-- Use images from original site
-- Update all contact info, opening hours
-- Match original site structure
-"""
-
-            self.log("Sending request to Claude...")
-
-            # Define available tools
-            tools = [
-                {
-                    "name": "read_file",
-                    "description": "Read contents of a file",
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "path": {"type": "string", "description": "File path"}
-                        },
-                        "required": ["path"]
-                    }
-                },
-                {
-                    "name": "write_file",
-                    "description": "Write content to a file",
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "path": {"type": "string", "description": "File path"},
-                            "content": {"type": "string", "description": "File content"}
-                        },
-                        "required": ["path", "content"]
-                    }
-                },
-                {
-                    "name": "edit_file",
-                    "description": "Edit file by replacing old_string with new_string",
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "path": {"type": "string", "description": "File path"},
-                            "old_string": {"type": "string", "description": "String to replace"},
-                            "new_string": {"type": "string", "description": "Replacement string"}
-                        },
-                        "required": ["path", "old_string", "new_string"]
-                    }
-                },
-                {
-                    "name": "run_command",
-                    "description": "Run a shell command",
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "command": {"type": "string", "description": "Command to run"},
-                            "cwd": {"type": "string", "description": "Working directory"}
-                        },
-                        "required": ["command"]
-                    }
-                },
-                {
-                    "name": "start_dev_server",
-                    "description": "Start npm dev server for preview",
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "project_path": {"type": "string", "description": "Project directory"}
-                        },
-                        "required": ["project_path"]
-                    }
-                }
-            ]
-
-            # Start conversation loop
-            messages = [{"role": "user", "content": prompt}]
-            max_iterations = 50
-
-            for iteration in range(max_iterations):
-                self.log(f"Iteration {iteration + 1}/{max_iterations}")
-
-                response = self.client.messages.create(
-                    model="claude-sonnet-4-20250514",
-                    max_tokens=8000,
-                    tools=tools,
-                    messages=messages
-                )
-
-                # Process response
-                if response.stop_reason == "end_turn":
-                    # Claude finished
-                    final_text = ""
-                    for block in response.content:
-                        if hasattr(block, 'text'):
-                            final_text += block.text
-                            self.log(f"Claude: {block.text}")
-
-                    # Extract project name and signal completion
-                    # Assume project name is in demos/ directory
-                    demos = [d for d in os.listdir(DEMOS_DIR) if os.path.isdir(DEMOS_DIR / d) and d not in ["template"]]
-                    if demos:
-                        latest_project = sorted(demos)[-1]  # Get newest
-                        self.finished_signal.emit(latest_project, "http://localhost:4321")
-                    else:
-                        self.error_signal.emit("No project created")
-                    break
-
-                elif response.stop_reason == "tool_use":
-                    # Execute tools
-                    tool_results = []
-
-                    for block in response.content:
-                        if block.type == "tool_use":
-                            result = self.execute_tool(block.name, block.input)
-                            tool_results.append({
-                                "type": "tool_result",
-                                "tool_use_id": block.id,
-                                "content": result
-                            })
-
-                    # Add assistant message and tool results to conversation
-                    messages.append({"role": "assistant", "content": response.content})
-                    messages.append({"role": "user", "content": tool_results})
-
-                else:
-                    self.error_signal.emit(f"Unexpected stop reason: {response.stop_reason}")
-                    break
-
+            dev_url = self.build.run()
+            self.finished_signal.emit(self.build.project_name, dev_url)
+        except BuildCancelled:
+            self.log("Build cancelled")
         except Exception as e:
-            self.error_signal.emit(str(e))
+            if self.build.cancelled:
+                self.log("Build cancelled")
+            else:
+                self.error_signal.emit(str(e))
 
 
 class DemoBuilderApp(QMainWindow):
@@ -461,16 +144,32 @@ class DemoBuilderApp(QMainWindow):
     def __init__(self):
         super().__init__()
         self.key_manager = APIKeyManager()
-        self.worker: Optional[ClaudeWorker] = None
         self.current_project: Optional[str] = None
         self.dev_url: Optional[str] = None
         self.original_url: Optional[str] = None
 
+        # Build queue - several ClaudeWorkers can run at once
+        self.build_queue = BuildQueue(self.create_worker, self.key_manager.get_max_concurrent_builds())
+        self.build_queue.log_signal.connect(self.log_job)
+        self.build_queue.job_updated.connect(self.update_job_row)
+        self.build_queue.job_finished.connect(self.build_finished)
+        self.build_queue.job_failed.connect(self.build_error)
+        self.job_rows: Dict[int, int] = {}  # job_id -> table row
+
+        # Deploys run in the background too, a few at a time
+        self.deploy_queue = BuildQueue(self.create_deploy_worker, MAX_CONCURRENT_DEPLOYS)
+        self.deploy_queue.log_signal.connect(self.log_deploy)
+        self.deploy_queue.job_finished.connect(self.deploy_finished)
+        self.deploy_queue.job_failed.connect(self.deploy_error)
+
         self.init_ui()
         self.update_key_selector()
         self.fetch_usage()
 
-        # Auto-refresh usage every 30 seconds
+        # Reclaim store entries of deleted demos without delaying startup
+        threading.Thread(target=PackageStore().gc, daemon=True).start()
+
+        # Running builds update the label themselves; this picks up batch runs
         self.usage_timer = QTimer()
         self.usage_timer.timeout.connect(self.fetch_usage)
         self.usage_timer.start(30000)
@@ -519,12 +218,44 @@ class DemoBuilderApp(QMainWindow):
 
         layout.addLayout(input_layout)
 
+        # Queue section
+        queue_header = QHBoxLayout()
+        queue_header.addWidget(QLabel("Build Queue:"))
+        queue_header.addStretch()
+        queue_header.addWidget(QLabel("Parallel builds:"))
+        self.workers_spinbox = QSpinBox()
+        self.workers_spinbox.setRange(1, 8)
+        self.workers_spinbox.setValue(self.build_queue.max_workers)
+        self.workers_spinbox.valueChanged.connect(self.on_max_workers_changed)
+        queue_header.addWidget(self.workers_spinbox)
+        self.cancel_job_button = QPushButton("Cancel")
+        self.cancel_job_button.clicked.connect(self.cancel_selected_job)
+        self.retry_job_button = QPushButton("Retry")
+        self.retry_job_button.clicked.connect(self.retry_selected_job)
+        queue_header.addWidget(self.cancel_job_button)
+        queue_header.addWidget(self.retry_job_button)
+        layout.addLayout(queue_header)
+
+        self.queue_table = QTableWidget(0, 6)
+        self.queue_table.setHorizontalHeaderLabels(["#", "URL", "Type", "Status", "Project", "Time"])
+        self.queue_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.queue_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.queue_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.queue_table.verticalHeader().setVisible(False)
+        self.queue_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.queue_table.setMaximumHeight(150)
+        self.queue_table.cellDoubleClicked.connect(self.show_job_preview)
+        layout.addWidget(self.queue_table)
+
+        # Refresh running times once per second
+        self.queue_timer = QTimer()
+        self.queue_timer.timeout.connect(self.refresh_running_jobs)
+        self.queue_timer.start(1000)
+
         # Log section
-        self.log_text = QTextEdit()
-        self.log_text.setReadOnly(True)
-        self.log_text.setMaximumHeight(150)
-        layout.addWidget(QLabel("Build Log:"))
-        layout.addWidget(self.log_text)
+        self.log_view = LogView()
+        self.log_view.setMaximumHeight(190)
+        layout.addWidget(self.log_view)
 
         # Preview section (hidden initially)
         self.preview_splitter = QSplitter(Qt.Orientation.Horizontal)
@@ -533,14 +264,14 @@ class DemoBuilderApp(QMainWindow):
         original_container = QWidget()
         original_layout = QVBoxLayout(original_container)
         original_layout.addWidget(QLabel("Original Website"))
-        self.original_preview = QWebEngineView()
+        self.original_preview = LazyWebView()
         original_layout.addWidget(self.original_preview)
 
         # New site preview
         new_container = QWidget()
         new_layout = QVBoxLayout(new_container)
         new_layout.addWidget(QLabel("Demo Website"))
-        self.new_preview = QWebEngineView()
+        self.new_preview = LazyWebView()
         new_layout.addWidget(self.new_preview)
 
         self.preview_splitter.addWidget(original_container)
@@ -553,12 +284,15 @@ class DemoBuilderApp(QMainWindow):
         review_layout = QHBoxLayout()
         self.approve_button = QPushButton("Approve & Deploy")
         self.approve_button.clicked.connect(self.approve_and_deploy)
+        self.cancel_deploy_button = QPushButton("Cancel Deploy")
+        self.cancel_deploy_button.clicked.connect(self.cancel_deploy)
         self.changes_input = QLineEdit()
         self.changes_input.setPlaceholderText("Enter change requests...")
         self.request_changes_button = QPushButton("Request Changes")
         self.request_changes_button.clicked.connect(self.request_changes)
 
         review_layout.addWidget(self.approve_button)
+        review_layout.addWidget(self.cancel_deploy_button)
         review_layout.addWidget(self.changes_input)
         review_layout.addWidget(self.request_changes_button)
 
@@ -570,10 +304,27 @@ class DemoBuilderApp(QMainWindow):
 
     def log(self, message: str):
         """Add message to log"""
-        self.log_text.append(message)
+        self.log_view.append(message)
+
+    def log_job(self, job_id: int, message: str):
+        """Add worker message to log, tagged with its job"""
+        job = self.build_queue.jobs.get(job_id)
+        self.log_view.append(message, f"#{job_id}", f"#{job_id} {job.project_name}" if job else None)
+
+    def create_worker(self, job: BuildJob) -> ClaudeWorker:
+        """Worker factory for the build queue"""
+        api_key = self.key_manager.get_active_key()
+        worker = ClaudeWorker(
+            api_key,
+            job.url,
+            change_request=job.change_request,
+            project_name=job.project_name
+        )
+        worker.usage_signal.connect(lambda _: self.fetch_usage())
+        return worker
 
     def start_build(self):
-        """Start building demo website"""
+        """Queue a demo website build"""
         url = self.url_input.text().strip()
         if not url:
             QMessageBox.warning(self, "Error", "Please enter a website URL")
@@ -584,40 +335,129 @@ class DemoBuilderApp(QMainWindow):
             QMessageBox.critical(self, "Error", "Please configure an API key first")
             return
 
-        self.original_url = url
-        self.log(f"Starting build for: {url}")
-        self.start_button.setEnabled(False)
-        self.preview_splitter.setVisible(False)
-        self.review_widget.setVisible(False)
-
-        # Start worker
-        self.worker = ClaudeWorker(api_key, url)
-        self.worker.log_signal.connect(self.log)
-        self.worker.finished_signal.connect(self.build_finished)
-        self.worker.error_signal.connect(self.build_error)
-        self.worker.start()
-
-    def build_finished(self, project_name: str, dev_url: str):
-        """Called when build is complete"""
-        self.current_project = project_name
-        self.dev_url = dev_url
+        project_name = project_name_from_url(url)
+        if self.is_queued(project_name):
+            return
 
-        self.log(f"Build complete! Project: {project_name}")
-        self.log(f"Dev server: {dev_url}")
+        self.url_input.clear()
+        job = self.build_queue.submit(url, project_name=project_name)
+        self.log(f"[#{job.job_id}] Queued build for: {url}")
+
+    def is_queued(self, project_name: str) -> bool:
+        """Warn if a build of this project is queued or running - two workers would share its folder"""
+        for job in self.build_queue.jobs.values():
+            # A cancelled worker keeps writing to the folder until its thread winds down
+            busy = job.is_active or (job.worker and job.worker.isRunning())
+            if busy and job.project_name == project_name:
+                state = "already in the queue" if job.is_active else "still stopping"
+                QMessageBox.warning(self, "Error", f"{project_name} is {state} (#{job.job_id})")
+                return True
+        return False
+
+    def update_job_row(self, job_id: int):
+        """Sync one queue table row with its job"""
+        job = self.build_queue.jobs[job_id]
+        row = self.job_rows.get(job_id)
+        if row is None:
+            row = self.queue_table.rowCount()
+            self.queue_table.insertRow(row)
+            self.job_rows[job_id] = row
+
+        duration = job.duration
+        values = [
+            str(job.job_id),
+            job.url,
+            job.kind,
+            job.status + (f" (try {job.attempts})" if job.attempts > 1 else ""),
+            job.project_name or "",
+            f"{duration:.0f}s" if duration is not None else ""
+        ]
+        for column, value in enumerate(values):
+            self.queue_table.setItem(row, column, QTableWidgetItem(value))
+
+    def refresh_running_jobs(self):
+        """Tick the time column of running jobs"""
+        for job in self.build_queue.jobs.values():
+            if job.status == BuildJob.RUNNING:
+                self.update_job_row(job.job_id)
+
+        # Project under review counts as in use for the idle reaper
+        if self.current_project and self.preview_splitter.isVisible():
+            dev_servers.touch(self.current_project)
+
+    def selected_job_id(self) -> Optional[int]:
+        rows = self.queue_table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        return int(self.queue_table.item(rows[0].row(), 0).text())
+
+    def cancel_selected_job(self):
+        """Cancel the selected queue entry"""
+        job_id = self.selected_job_id()
+        if job_id is not None:
+            self.build_queue.cancel(job_id)
+            self.log(f"[#{job_id}] Cancel requested")
+
+    def retry_selected_job(self):
+        """Re-queue the selected failed/cancelled entry"""
+        job_id = self.selected_job_id()
+        if job_id is None:
+            return
+        if self.build_queue.retry(job_id):
+            self.log(f"[#{job_id}] Retrying")
+        else:
+            QMessageBox.warning(self, "Error", "Only failed or cancelled jobs can be retried")
+
+    def on_max_workers_changed(self, value: int):
+        """Resize the worker pool"""
+        self.build_queue.set_max_workers(value)
+        self.key_manager.set_max_concurrent_builds(value)
+
+    def show_job_preview(self, row: int, column: int):
+        """Open the preview of a finished job (double-click in queue)"""
+        job = self.build_queue.jobs[int(self.queue_table.item(row, 0).text())]
+        if job.status == BuildJob.DONE:
+            self.show_preview(job)
+
+    def build_finished(self, job_id: int, project_name: str, dev_url: str):
+        """Called when a queued build is complete"""
+        self.log(f"[#{job_id}] Build complete! Project: {project_name}")
+        self.log(f"[#{job_id}] Dev server: {dev_url}")
+
+        # Don't yank the preview away while another project is under review
+        if self.current_project is None or self.current_project == project_name \
+                or not self.review_widget.isVisible():
+            self.show_preview(self.build_queue.jobs[job_id])
+
+    def show_preview(self, job: BuildJob):
+        """Show side-by-side review for a job"""
+        self.current_project = job.project_name
+        self.dev_url = job.dev_url
+        self.original_url = job.url
+
+        # Server may have been reaped while idle - bring it back on a (maybe new) port
+        server = dev_servers.get(job.project_name)
+        if not server:
+            server = dev_servers.start(job.project_name, DEMOS_DIR / job.project_name)
 
-        # Show previews
         self.original_preview.setUrl(QUrl(self.original_url))
-        self.new_preview.setUrl(QUrl(dev_url))
         self.preview_splitter.setVisible(True)
         self.review_widget.setVisible(True)
+        self.load_demo_preview(server)
+
+    def load_demo_preview(self, server, waited_ms: int = 0):
+        """Load the demo once its dev server is ready, without blocking the UI"""
+        if server.project_name != self.current_project:
+            return  # Another preview was opened meanwhile
+        if server.ready.is_set() or waited_ms >= 60000 or not server.is_alive():
+            self.dev_url = server.url
+            self.new_preview.setUrl(QUrl(self.dev_url))
+            return
+        QTimer.singleShot(200, lambda: self.load_demo_preview(server, waited_ms + 200))
 
-        self.start_button.setEnabled(True)
-
-    def build_error(self, error: str):
-        """Called when build fails"""
-        self.log(f"ERROR: {error}")
-        QMessageBox.critical(self, "Build Error", error)
-        self.start_button.setEnabled(True)
+    def build_error(self, job_id: int, error: str):
+        """Called when a queued build fails"""
+        self.log(f"[#{job_id}] ERROR: {error}")
 
     def request_changes(self):
         """Request changes to the demo"""
@@ -631,27 +471,46 @@ class DemoBuilderApp(QMainWindow):
             QMessageBox.critical(self, "Error", "Please configure an API key first")
             return
 
-        self.log(f"Requesting changes: {changes}")
+        if self.is_queued(self.current_project):
+            return
+
         self.review_widget.setVisible(False)
         self.changes_input.clear()
 
-        # Start worker with changes
-        self.worker = ClaudeWorker(
-            api_key,
+        # Queue worker with changes
+        job = self.build_queue.submit(
             self.original_url,
             change_request=changes,
             project_name=self.current_project
         )
-        self.worker.log_signal.connect(self.log)
-        self.worker.finished_signal.connect(self.build_finished)
-        self.worker.error_signal.connect(self.build_error)
-        self.worker.start()
+        self.log(f"[#{job.job_id}] Requesting changes: {changes}")
+
+    def create_deploy_worker(self, job: BuildJob) -> DeployWorker:
+        """Worker factory for the deploy queue"""
+        return DeployWorker(DEMOS_DIR / job.project_name)
+
+    def log_deploy(self, job_id: int, message: str):
+        """Add deploy output to log, tagged with its deploy job"""
+        job = self.deploy_queue.jobs.get(job_id)
+        self.log_view.append(message, f"deploy #{job_id}",
+                             f"deploy #{job_id} {job.project_name}" if job else None)
+
+    def active_deploy(self, project_name: str) -> Optional[BuildJob]:
+        """Queued or running deploy of a project, if any"""
+        for job in self.deploy_queue.jobs.values():
+            if job.project_name == project_name and job.is_active:
+                return job
+        return None
 
     def approve_and_deploy(self):
-        """Approve and deploy to Vercel"""
+        """Approve and deploy to Vercel (in the background)"""
         if not self.current_project:
             return
 
+        if self.active_deploy(self.current_project):
+            self.log(f"{self.current_project} is already being deployed")
+            return
+
         reply = QMessageBox.question(
             self,
             "Deploy",
@@ -660,36 +519,30 @@ class DemoBuilderApp(QMainWindow):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            self.log("Deploying to Vercel...")
-
-            try:
-                project_path = DEMOS_DIR / self.current_project
-
-                # Build
-                self.log("Building project...")
-                subprocess.run(["npm", "run", "build"], cwd=project_path, check=True)
-
-                # Deploy
-                self.log("Deploying to Vercel...")
-                result = subprocess.run(
-                    ["npx", "vercel", "--prod", "--yes"],
-                    cwd=project_path,
-                    capture_output=True,
-                    text=True
-                )
-
-                self.log(result.stdout)
-
-                # Extract URL
-                for line in result.stdout.split('\n'):
-                    if 'https://' in line and 'vercel.app' in line:
-                        self.log(f"Deployed to: {line.strip()}")
+            job = self.deploy_queue.submit(self.current_project, project_name=self.current_project)
+            if job.status == BuildJob.PENDING:
+                self.log(f"[deploy #{job.job_id}] Waiting for a free deploy slot...")
+
+    def cancel_deploy(self):
+        """Cancel the current project's deploy"""
+        job = self.active_deploy(self.current_project) if self.current_project else None
+        if not job:
+            self.log("No deploy running for this project")
+            return
+        self.deploy_queue.cancel(job.job_id)
+        self.log(f"[deploy #{job.job_id}] Cancelling deploy of {job.project_name}...")
 
-                QMessageBox.information(self, "Success", "Deployment complete!")
+    def deploy_finished(self, job_id: int, project_name: str, url: str):
+        """Deploy job succeeded"""
+        if url:
+            self.log(f"[deploy #{job_id}] Deployed to: {url}")
+        QMessageBox.information(self, "Success", f"Deployment of {project_name} complete!\n\n{url}")
 
-            except Exception as e:
-                self.log(f"Deployment error: {str(e)}")
-                QMessageBox.critical(self, "Deploy Error", str(e))
+    def deploy_error(self, job_id: int, error: str):
+        """Deploy job failed"""
+        project_name = self.deploy_queue.jobs[job_id].project_name
+        self.log(f"[deploy #{job_id}] Deployment error: {error}")
+        QMessageBox.critical(self, "Deploy Error", f"{project_name}: {error}")
 
     def update_key_selector(self):
         """Update API key dropdown"""
@@ -723,7 +576,7 @@ class DemoBuilderApp(QMainWindow):
             self.fetch_usage()
 
     def fetch_usage(self):
-        """Fetch and display API usage"""
+        """Show today's and all-time usage of the active key from the local usage store"""
         api_key = self.key_manager.get_active_key()
         key_name = self.key_manager.get_active_key_name()
 
@@ -732,28 +585,27 @@ class DemoBuilderApp(QMainWindow):
             return
 
         try:
-            # Note: Anthropic doesn't have a public usage API endpoint yet
-            # This is a placeholder - you'd need to track usage manually or use billing API
-            # For now, we'll just show the active key name
-            self.usage_label.setText(f"Active Key: {key_name} | Usage tracking coming soon")
-
-            # If/when Anthropic adds usage API:
-            # client = anthropic.Anthropic(api_key=api_key)
-            # usage = client.usage.get()  # hypothetical
-            # self.usage_label.setText(f"Active Key: {key_name} | Tokens: {usage.tokens_used}/{usage.tokens_limit}")
-
+            today = usage_store.key_totals(api_key, since=start_of_today())
+            total = usage_store.key_totals(api_key)
+            self.usage_label.setText(
+                f"Active Key: {key_name} | Today: {format_totals(today)} | "
+                f"Total: {format_totals(total)} ({total['builds']} builds)"
+            )
         except Exception as e:
             self.usage_label.setText(f"Active Key: {key_name} | Usage: Error")
             print(f"Error fetching usage: {e}")
 
     def closeEvent(self, event):
         """Clean up on close"""
-        if self.worker:
-            self.worker.stop_dev_server()
+        self.build_queue.shutdown()
+        self.deploy_queue.shutdown()
+        self.log_view.close_files()
+        dev_servers.stop_all()
         event.accept()
 
 
 def main():
+    prepare_web_engine()
     app = QApplication(sys.argv)
     window = DemoBuilderApp()
     window.show()
@@ -7,20 +7,27 @@ Much cheaper! Uses your existing Claude Code subscription.
 import os
 import sys
 import subprocess
-import time
 from pathlib import Path
 from typing import Optional
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLineEdit, QPushButton, QTextEdit, QLabel, QSplitter, QMessageBox
+    QLineEdit, QPushButton, QLabel, QSplitter, QMessageBox
 )
-from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QUrl, QProcess
 
+from dev_server import dev_servers, probe_http, wait_for_port
+from web_preview import LazyWebView, prepare_web_engine
+from log_view import LogView
+from site_crawler import crawl_site
+from build_queue import BuildJob, BuildQueue, DeployWorker
+from deploy_pipeline import MAX_CONCURRENT_DEPLOYS
+
 # Configuration
 DEMOS_DIR = Path(__file__).parent.parent / "demos"
 TEMPLATE_DIR = DEMOS_DIR / "template"
 WORKFLOW_PATH = TEMPLATE_DIR / "WORKFLOW.md"
+SCAFFOLD_SCRIPT = Path(__file__).parent / "scaffold_cache.py"
+SITE_CACHE_SCRIPT = Path(__file__).parent / "site_cache.py"
 
 
 class ClaudeWorker(QThread):
@@ -29,13 +36,16 @@ class ClaudeWorker(QThread):
     finished_signal = pyqtSignal(str, str)  # project_name, dev_url
     error_signal = pyqtSignal(str)
 
-    def __init__(self, url: str, change_request: Optional[str] = None, project_name: Optional[str] = None):
+    def __init__(self, url: str, change_request: Optional[str] = None, project_name: Optional[str] = None,
+                 port: Optional[int] = None):
         super().__init__()
         self.url = url
         self.change_request = change_request
         self.project_name = project_name
         self.process = None
-        self.dev_process = None
+        # A change request keeps the port of the dev server its first build started
+        self.port_key = None if port else project_name or url
+        self.port = port or dev_servers.allocate_port(self.port_key)
 
     def log(self, message: str):
         """Emit log message to UI"""
@@ -72,7 +82,9 @@ Project location: {DEMOS_DIR / self.project_name}
 Change request:
 {self.change_request}
 
-Please make the requested changes to the project files and restart the dev server when done.
+Please make the requested changes to the project files. The dev server on port {self.port}
+picks them up by itself; only if nothing answers on http://localhost:{self.port}, start it with
+(cd {DEMOS_DIR / self.project_name} && npm run dev -- --port {self.port}).
 """
             else:
                 prompt = f"""Create a new demo website following the workflow below.
@@ -85,10 +97,14 @@ WORKFLOW:
 Instructions:
 1. Change directory to: {DEMOS_DIR}
 2. Fetch the original website content from {self.url}
-3. Create a new Astro project (use domain name as project name, e.g., "example-com")
-4. Copy components from the template directory
+   with: python3 {SITE_CACHE_SCRIPT} fetch <url> [--save-to <file>]
+   (cached between builds; once the project exists, --save-to puts images into [project-name]/public/)
+3. Create the project with: python3 {SCAFFOLD_SCRIPT} create [project-name]
+   (use domain name as project name, e.g., "example-com"). This sets up Astro + Tailwind
+   with dependencies and copies the template components - no npm create/npm install needed
+4. Check the copied components in [project-name]/src
 5. Customize everything according to the workflow
-6. Start the dev server with: cd [project-name] && npm run dev
+6. Start the dev server with: cd [project-name] && npm run dev -- --port {self.port}
 7. Tell me when it's ready for review
 
 IMPORTANT:
@@ -96,10 +112,18 @@ IMPORTANT:
 - Don't forget AI Chatbot personalization with primaryColor
 - Use images from the original site
 - Update all contact info and opening hours
-- The dev server should run on port 4321
+- The dev server should run on port {self.port}
 
 Start working now!
 """
+                # Facts found up front save Claude a round of page fetching
+                self.log(f"🔎 Crawling {self.url}...")
+                try:
+                    sheet = crawl_site(self.url, log=self.log)
+                    if sheet.pages:
+                        prompt += f"\n{sheet.to_prompt()}\n"
+                except Exception as e:
+                    self.log(f"⚠️  Crawl failed, Claude will fetch the site itself: {e}")
 
             self.log("Starting Claude Code...")
             self.log(f"Working directory: {DEMOS_DIR}")
@@ -136,12 +160,13 @@ Start working now!
                     self.log(line)
 
                     # Check if dev server started
-                    if "localhost:4321" in line.lower() or "local:" in line.lower():
+                    if f"localhost:{self.port}" in line.lower() or "local:" in line.lower():
                         self.log("")
                         self.log("✅ Dev server detected!")
 
-                        # Wait a bit for server to fully start
-                        time.sleep(3)
+                        # Confirm the server actually answers before previewing
+                        if not wait_for_port(self.port, timeout=30):
+                            self.log(f"⚠️  Nothing answering on port {self.port} yet")
 
                         # Find the project name
                         demos = [d for d in os.listdir(DEMOS_DIR)
@@ -149,7 +174,7 @@ Start working now!
                         if demos:
                             latest_project = sorted(demos,
                                 key=lambda x: os.path.getmtime(DEMOS_DIR / x))[-1]
-                            self.finished_signal.emit(latest_project, "http://localhost:4321")
+                            self.finished_signal.emit(latest_project, f"http://localhost:{self.port}")
                         return
 
             # If we get here, process ended
@@ -157,20 +182,14 @@ Start working now!
             self.log("Claude finished. Checking for dev server...")
 
             # Check if dev server is running
-            check = subprocess.run(
-                ["lsof", "-ti:4321"],
-                capture_output=True,
-                text=True
-            )
-
-            if check.returncode == 0:
+            if probe_http(self.port):
                 # Dev server is running
                 demos = [d for d in os.listdir(DEMOS_DIR)
                         if os.path.isdir(DEMOS_DIR / d) and d not in ["template"]]
                 if demos:
                     latest_project = sorted(demos,
                         key=lambda x: os.path.getmtime(DEMOS_DIR / x))[-1]
-                    self.finished_signal.emit(latest_project, "http://localhost:4321")
+                    self.finished_signal.emit(latest_project, f"http://localhost:{self.port}")
                 else:
                     self.error_signal.emit("No project found in demos/")
             else:
@@ -178,12 +197,18 @@ Start working now!
 
         except Exception as e:
             self.error_signal.emit(f"Error: {str(e)}")
+        finally:
+            # Server (if any) now holds the port itself
+            if self.port_key:
+                dev_servers.release_port(self.port_key)
 
     def stop(self):
         """Stop the Claude process"""
         if self.process:
             self.process.terminate()
             self.process = None
+        if self.port_key:
+            dev_servers.release_port(self.port_key)
 
 
 class DemoBuilderApp(QMainWindow):
@@ -194,7 +219,15 @@ class DemoBuilderApp(QMainWindow):
         self.worker: Optional[ClaudeWorker] = None
         self.current_project: Optional[str] = None
         self.dev_url: Optional[str] = None
+        self.current_port: Optional[int] = None
         self.original_url: Optional[str] = None
+        self.build_number = 0  # Tags each Claude run in the log
+
+        # Deploys run in the background, a few at a time
+        self.deploy_queue = BuildQueue(self.create_deploy_worker, MAX_CONCURRENT_DEPLOYS)
+        self.deploy_queue.log_signal.connect(self.log_deploy)
+        self.deploy_queue.job_finished.connect(self.deploy_finished)
+        self.deploy_queue.job_failed.connect(self.deploy_error)
 
         self.init_ui()
 
@@ -227,11 +260,9 @@ class DemoBuilderApp(QMainWindow):
         layout.addLayout(input_layout)
 
         # Log section
-        self.log_text = QTextEdit()
-        self.log_text.setReadOnly(True)
-        self.log_text.setMaximumHeight(200)
-        layout.addWidget(QLabel("Build Log:"))
-        layout.addWidget(self.log_text)
+        self.log_view = LogView()
+        self.log_view.setMaximumHeight(240)
+        layout.addWidget(self.log_view)
 
         # Preview section (hidden initially)
         self.preview_splitter = QSplitter(Qt.Orientation.Horizontal)
@@ -240,14 +271,14 @@ class DemoBuilderApp(QMainWindow):
         original_container = QWidget()
         original_layout = QVBoxLayout(original_container)
         original_layout.addWidget(QLabel("Original Website"))
-        self.original_preview = QWebEngineView()
+        self.original_preview = LazyWebView()
         original_layout.addWidget(self.original_preview)
 
         # New site preview
         new_container = QWidget()
         new_layout = QVBoxLayout(new_container)
         new_layout.addWidget(QLabel("Demo Website"))
-        self.new_preview = QWebEngineView()
+        self.new_preview = LazyWebView()
         new_layout.addWidget(self.new_preview)
 
         self.preview_splitter.addWidget(original_container)
@@ -260,12 +291,15 @@ class DemoBuilderApp(QMainWindow):
         review_layout = QHBoxLayout()
         self.approve_button = QPushButton("Approve & Deploy")
         self.approve_button.clicked.connect(self.approve_and_deploy)
+        self.cancel_deploy_button = QPushButton("Cancel Deploy")
+        self.cancel_deploy_button.clicked.connect(self.cancel_deploy)
         self.changes_input = QLineEdit()
         self.changes_input.setPlaceholderText("Enter change requests...")
         self.request_changes_button = QPushButton("Request Changes")
         self.request_changes_button.clicked.connect(self.request_changes)
 
         review_layout.addWidget(self.approve_button)
+        review_layout.addWidget(self.cancel_deploy_button)
         review_layout.addWidget(self.changes_input)
         review_layout.addWidget(self.request_changes_button)
 
@@ -277,7 +311,7 @@ class DemoBuilderApp(QMainWindow):
 
     def log(self, message: str):
         """Add message to log"""
-        self.log_text.append(message)
+        self.log_view.append(message)
 
     def start_build(self):
         """Start building demo website"""
@@ -307,7 +341,8 @@ class DemoBuilderApp(QMainWindow):
 
         # Start worker
         self.worker = ClaudeWorker(url)
-        self.worker.log_signal.connect(self.log)
+        self.build_number += 1
+        self.worker.log_signal.connect(self.log_build)
         self.worker.finished_signal.connect(self.build_finished)
         self.worker.error_signal.connect(self.build_error)
         self.worker.start()
@@ -316,6 +351,7 @@ class DemoBuilderApp(QMainWindow):
         """Called when build is complete"""
         self.current_project = project_name
         self.dev_url = dev_url
+        self.current_port = self.worker.port
 
         self.log(f"✅ Build complete! Project: {project_name}")
         self.log(f"🚀 Dev server: {dev_url}")
@@ -349,18 +385,46 @@ class DemoBuilderApp(QMainWindow):
         self.worker = ClaudeWorker(
             self.original_url,
             change_request=changes,
-            project_name=self.current_project
+            project_name=self.current_project,
+            port=self.current_port
         )
-        self.worker.log_signal.connect(self.log)
+        self.build_number += 1
+        self.worker.log_signal.connect(self.log_build)
         self.worker.finished_signal.connect(self.build_finished)
         self.worker.error_signal.connect(self.build_error)
         self.worker.start()
 
+    def create_deploy_worker(self, job: BuildJob) -> DeployWorker:
+        """Worker factory for the deploy queue"""
+        return DeployWorker(DEMOS_DIR / job.project_name)
+
+    def log_build(self, message: str):
+        """Add Claude output to log, tagged with its run"""
+        self.log_view.append(message, f"#{self.build_number}",
+                             f"#{self.build_number} {self.original_url}")
+
+    def log_deploy(self, job_id: int, message: str):
+        """Add deploy output to log, tagged with its deploy job"""
+        job = self.deploy_queue.jobs.get(job_id)
+        self.log_view.append(message, f"deploy #{job_id}",
+                             f"deploy #{job_id} {job.project_name}" if job else None)
+
+    def active_deploy(self, project_name: str) -> Optional[BuildJob]:
+        """Queued or running deploy of a project, if any"""
+        for job in self.deploy_queue.jobs.values():
+            if job.project_name == project_name and job.is_active:
+                return job
+        return None
+
     def approve_and_deploy(self):
-        """Approve and deploy to Vercel"""
+        """Approve and deploy to Vercel (in the background)"""
         if not self.current_project:
             return
 
+        if self.active_deploy(self.current_project):
+            self.log(f"⏳ {self.current_project} is already being deployed")
+            return
+
         reply = QMessageBox.question(
             self,
             "Deploy",
@@ -370,44 +434,43 @@ class DemoBuilderApp(QMainWindow):
 
         if reply == QMessageBox.StandardButton.Yes:
             self.log("🚀 Deploying to Vercel...")
-
-            try:
-                project_path = DEMOS_DIR / self.current_project
-
-                # Build
-                self.log("📦 Building project...")
-                subprocess.run(["npm", "run", "build"], cwd=project_path, check=True)
-
-                # Deploy
-                self.log("☁️  Deploying to Vercel...")
-                result = subprocess.run(
-                    ["npx", "vercel", "--prod", "--yes"],
-                    cwd=project_path,
-                    capture_output=True,
-                    text=True
-                )
-
-                self.log(result.stdout)
-
-                # Extract URL
-                for line in result.stdout.split('\n'):
-                    if 'https://' in line and 'vercel.app' in line:
-                        self.log(f"✅ Deployed to: {line.strip()}")
-
-                QMessageBox.information(self, "Success", "Deployment complete!")
-
-            except Exception as e:
-                self.log(f"❌ Deployment error: {str(e)}")
-                QMessageBox.critical(self, "Deploy Error", str(e))
+            job = self.deploy_queue.submit(self.current_project, project_name=self.current_project)
+            if job.status == BuildJob.PENDING:
+                self.log(f"[deploy #{job.job_id}] ⏳ Waiting for a free deploy slot...")
+
+    def cancel_deploy(self):
+        """Cancel the current project's deploy"""
+        job = self.active_deploy(self.current_project) if self.current_project else None
+        if not job:
+            self.log("No deploy running for this project")
+            return
+        self.deploy_queue.cancel(job.job_id)
+        self.log(f"[deploy #{job.job_id}] 🛑 Cancelling deploy of {job.project_name}...")
+
+    def deploy_finished(self, job_id: int, project_name: str, url: str):
+        """Deploy job succeeded"""
+        if url:
+            self.log(f"[deploy #{job_id}] ✅ Deployed: {url}")
+        self.log(f"[deploy #{job_id}] 🎉 Deployment of {project_name} complete!")
+        QMessageBox.information(self, "Success", f"Deployment of {project_name} complete!\n\n{url}")
+
+    def deploy_error(self, job_id: int, error: str):
+        """Deploy job failed"""
+        project_name = self.deploy_queue.jobs[job_id].project_name
+        self.log(f"[deploy #{job_id}] ❌ Deployment error: {error}")
+        QMessageBox.critical(self, "Deploy Error", f"{project_name}: {error}")
 
     def closeEvent(self, event):
         """Clean up on close"""
+        self.deploy_queue.shutdown()
+        self.log_view.close_files()
         if self.worker:
             self.worker.stop()
         event.accept()
 
 
 def main():
+    prepare_web_engine()
     app = QApplication(sys.argv)
     window = DemoBuilderApp()
     window.show()
@@ -6,7 +6,6 @@ Shows you the prompt, you paste it to Claude Code, app monitors for completion
 
 import os
 import sys
-import subprocess
 import time
 from pathlib import Path
 from typing import Optional
@@ -14,14 +13,23 @@ from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLineEdit, QPushButton, QTextEdit, QLabel, QSplitter, QMessageBox
 )
-from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QUrl, QTimer
 # No external clipboard library needed - Qt has it built-in!
 
+from dev_server import dev_servers, probe_http, PROBE_INITIAL_DELAY, PROBE_MAX_DELAY
+from web_preview import LazyWebView, prepare_web_engine
+from log_view import LogView
+from build_queue import BuildJob, BuildQueue, DeployWorker
+from deploy_pipeline import MAX_CONCURRENT_DEPLOYS
+from fs_watcher import create_watcher, is_project_dir, FILE_CHANGED, PROJECT_CREATED
+
 # Configuration
 DEMOS_DIR = Path(__file__).parent.parent / "demos"
 TEMPLATE_DIR = DEMOS_DIR / "template"
 WORKFLOW_PATH = TEMPLATE_DIR / "WORKFLOW.md"
+SCAFFOLD_SCRIPT = Path(__file__).parent / "scaffold_cache.py"
+SITE_CACHE_SCRIPT = Path(__file__).parent / "site_cache.py"
+CRAWLER_SCRIPT = Path(__file__).parent / "site_crawler.py"
 
 
 class ProjectMonitor(QThread):
@@ -29,17 +37,16 @@ class ProjectMonitor(QThread):
     project_found = pyqtSignal(str, str)  # project_name, dev_url
     log_signal = pyqtSignal(str)
 
-    def __init__(self):
+    def __init__(self, port: int):
         super().__init__()
+        self.port = port
         self.running = True
         self.initial_projects = set()
-        self.start_time = time.time()
 
     def run(self):
         # Get initial project list
         if DEMOS_DIR.exists():
-            self.initial_projects = {d.name for d in DEMOS_DIR.iterdir()
-                                    if d.is_dir() and d.name != "template"}
+            self.initial_projects = {d.name for d in DEMOS_DIR.iterdir() if is_project_dir(d)}
 
         self.log_signal.emit("👀 Monitoring demos folder for new projects...")
         self.log_signal.emit(f"📁 Watching: {DEMOS_DIR}")
@@ -48,52 +55,42 @@ class ProjectMonitor(QThread):
         self.log_signal.emit("💡 Paste the prompt to Claude now and start monitoring will begin...")
         self.log_signal.emit("")
 
-        found_new_project = False
-        new_project_name = None
+        watcher = create_watcher(DEMOS_DIR)
+        self.log_signal.emit(f"⚡ Watch mode: {watcher.mode}")
 
-        while self.running:
-            time.sleep(2)  # Check every 2 seconds
-
-            if not DEMOS_DIR.exists():
-                continue
-
-            # Check for new projects (created AFTER monitoring started)
-            current_projects = {d.name for d in DEMOS_DIR.iterdir()
-                              if d.is_dir() and d.name != "template"}
-            new_projects = current_projects - self.initial_projects
-
-            # Found a new project!
-            if new_projects and not found_new_project:
-                for project in new_projects:
-                    project_path = DEMOS_DIR / project
-                    # Check if it was created after we started monitoring
-                    creation_time = project_path.stat().st_ctime
-                    if creation_time > self.start_time:
-                        self.log_signal.emit(f"📦 New project detected: {project}")
-                        found_new_project = True
-                        new_project_name = project
-                        self.initial_projects.add(project)
-                        break
-
-            # Only check for dev server if we found a new project
-            if found_new_project:
-                result = subprocess.run(
-                    ["lsof", "-ti:4321"],
-                    capture_output=True,
-                    text=True
-                )
-
-                if result.returncode == 0:
-                    # Dev server is running!
-                    self.log_signal.emit(f"🚀 Dev server started for {new_project_name}!")
-                    self.project_found.emit(new_project_name, "http://localhost:4321")
-                    self.running = False
-                    return
-                else:
-                    # Still waiting for dev server
-                    if not hasattr(self, '_waiting_logged'):
-                        self.log_signal.emit(f"⏳ Waiting for dev server to start...")
-                        self._waiting_logged = True
+        new_project_name = None
+        changed_files = set()
+        probe_delay = PROBE_INITIAL_DELAY
+        next_probe = 0.0
+
+        try:
+            while self.running:
+                # Returns as soon as something happens (inotify) or after the timeout
+                timeout = 0.5 if new_project_name is None else max(0.0, min(0.5, next_probe - time.time()))
+                for event in watcher.poll(timeout):
+                    if event.kind == PROJECT_CREATED and new_project_name is None \
+                            and event.project not in self.initial_projects:
+                        self.log_signal.emit(f"📦 New project detected: {event.project}")
+                        self.log_signal.emit(f"⏳ Waiting for dev server on port {self.port}...")
+                        new_project_name = event.project
+                        self.initial_projects.add(event.project)
+                    elif event.kind == FILE_CHANGED and event.project == new_project_name \
+                            and event.path not in changed_files:
+                        changed_files.add(event.path)
+                        self.log_signal.emit(f"📝 {event.path.relative_to(DEMOS_DIR / new_project_name)}")
+
+                # Once the project exists, probe its dev server with backoff
+                if new_project_name is not None and time.time() >= next_probe:
+                    if probe_http(self.port):
+                        # Dev server is running!
+                        self.log_signal.emit(f"🚀 Dev server started for {new_project_name}!")
+                        self.project_found.emit(new_project_name, f"http://localhost:{self.port}")
+                        self.running = False
+                        return
+                    next_probe = time.time() + probe_delay
+                    probe_delay = min(probe_delay * 2, PROBE_MAX_DELAY)
+        finally:
+            watcher.close()
 
     def stop(self):
         self.running = False
@@ -105,10 +102,17 @@ class DemoBuilderApp(QMainWindow):
     def __init__(self):
         super().__init__()
         self.monitor: Optional[ProjectMonitor] = None
+        self.dev_port: Optional[int] = None
         self.current_project: Optional[str] = None
         self.dev_url: Optional[str] = None
         self.original_url: Optional[str] = None
 
+        # Deploys run in the background, a few at a time
+        self.deploy_queue = BuildQueue(self.create_deploy_worker, MAX_CONCURRENT_DEPLOYS)
+        self.deploy_queue.log_signal.connect(self.log_deploy)
+        self.deploy_queue.job_finished.connect(self.deploy_finished)
+        self.deploy_queue.job_failed.connect(self.deploy_error)
+
         self.init_ui()
 
     def init_ui(self):
@@ -175,11 +179,9 @@ class DemoBuilderApp(QMainWindow):
         layout.addLayout(action_layout)
 
         # Log section
-        self.log_text = QTextEdit()
-        self.log_text.setReadOnly(True)
-        self.log_text.setMaximumHeight(150)
-        layout.addWidget(QLabel("Status Log:"))
-        layout.addWidget(self.log_text)
+        self.log_view = LogView()
+        self.log_view.setMaximumHeight(190)
+        layout.addWidget(self.log_view)
 
         # Preview section (hidden initially)
         self.preview_splitter = QSplitter(Qt.Orientation.Horizontal)
@@ -188,14 +190,14 @@ class DemoBuilderApp(QMainWindow):
         original_container = QWidget()
         original_layout = QVBoxLayout(original_container)
         original_layout.addWidget(QLabel("Original Website"))
-        self.original_preview = QWebEngineView()
+        self.original_preview = LazyWebView()
         original_layout.addWidget(self.original_preview)
 
         # New site preview
         new_container = QWidget()
         new_layout = QVBoxLayout(new_container)
         new_layout.addWidget(QLabel("Demo Website"))
-        self.new_preview = QWebEngineView()
+        self.new_preview = LazyWebView()
         new_layout.addWidget(self.new_preview)
 
         self.preview_splitter.addWidget(original_container)
@@ -208,8 +210,11 @@ class DemoBuilderApp(QMainWindow):
         review_layout = QHBoxLayout()
         self.approve_button = QPushButton("Approve & Deploy")
         self.approve_button.clicked.connect(self.approve_and_deploy)
+        self.cancel_deploy_button = QPushButton("Cancel Deploy")
+        self.cancel_deploy_button.clicked.connect(self.cancel_deploy)
 
         review_layout.addWidget(self.approve_button)
+        review_layout.addWidget(self.cancel_deploy_button)
 
         self.review_widget = QWidget()
         self.review_widget.setLayout(review_layout)
@@ -219,7 +224,7 @@ class DemoBuilderApp(QMainWindow):
 
     def log(self, message: str):
         """Add message to log"""
-        self.log_text.append(message)
+        self.log_view.append(message)
 
     def generate_prompt(self):
         """Generate the prompt for Claude"""
@@ -228,6 +233,10 @@ class DemoBuilderApp(QMainWindow):
             QMessageBox.warning(self, "Error", "Please enter a website URL")
             return
 
+        # Give this build its own dev server port (skips ports already in use)
+        if self.original_url:
+            dev_servers.release_port(self.original_url)
+        self.dev_port = dev_servers.allocate_port(url)
         self.original_url = url
 
         # Read workflow
@@ -244,11 +253,17 @@ WORKFLOW:
 
 Instructions:
 1. Change directory to: {DEMOS_DIR}
+   First run: python3 {CRAWLER_SCRIPT} {url}
+   It prints a fact sheet (pages, contact data, opening hours, colors, logo, images)
 2. Fetch the original website content from {url}
-3. Create a new Astro project (use domain name as project name, e.g., "example-com")
-4. Copy components from the template directory
+   with: python3 {SITE_CACHE_SCRIPT} fetch <url> [--save-to <file>]
+   (cached between builds; once the project exists, --save-to puts images into [project-name]/public/)
+3. Create the project with: python3 {SCAFFOLD_SCRIPT} create [project-name]
+   (use domain name as project name, e.g., "example-com"). This sets up Astro + Tailwind
+   with dependencies and copies the template components - no npm create/npm install needed
+4. Check the copied components in [project-name]/src
 5. Customize everything according to the workflow
-6. Start the dev server with: cd [project-name] && npm run dev
+6. Start the dev server with: cd [project-name] && npm run dev -- --port {self.dev_port}
 7. Tell me when it's ready for review
 
 IMPORTANT:
@@ -256,7 +271,7 @@ IMPORTANT:
 - Don't forget AI Chatbot personalization with primaryColor
 - Use images from the original site
 - Update all contact info and opening hours
-- The dev server should run on port 4321
+- The dev server should run on port {self.dev_port}
 
 Start working now!
 """
@@ -298,7 +313,7 @@ Start working now!
         self.log("=" * 60)
         self.start_monitoring_button.setEnabled(False)
 
-        self.monitor = ProjectMonitor()
+        self.monitor = ProjectMonitor(self.dev_port)
         self.monitor.log_signal.connect(self.log)
         self.monitor.project_found.connect(self.project_completed)
         self.monitor.start()
@@ -329,11 +344,32 @@ Start working now!
             f"Review it and click 'Approve & Deploy' when ready!"
         )
 
+    def create_deploy_worker(self, job: BuildJob) -> DeployWorker:
+        """Worker factory for the deploy queue"""
+        return DeployWorker(DEMOS_DIR / job.project_name)
+
+    def log_deploy(self, job_id: int, message: str):
+        """Add deploy output to log, tagged with its deploy job"""
+        job = self.deploy_queue.jobs.get(job_id)
+        self.log_view.append(message, f"deploy #{job_id}",
+                             f"deploy #{job_id} {job.project_name}" if job else None)
+
+    def active_deploy(self, project_name: str) -> Optional[BuildJob]:
+        """Queued or running deploy of a project, if any"""
+        for job in self.deploy_queue.jobs.values():
+            if job.project_name == project_name and job.is_active:
+                return job
+        return None
+
     def approve_and_deploy(self):
-        """Approve and deploy to Vercel"""
+        """Approve and deploy to Vercel (in the background)"""
         if not self.current_project:
             return
 
+        if self.active_deploy(self.current_project):
+            self.log(f"⏳ {self.current_project} is already being deployed")
+            return
+
         reply = QMessageBox.question(
             self,
             "Deploy",
@@ -343,44 +379,45 @@ Start working now!
 
         if reply == QMessageBox.StandardButton.Yes:
             self.log("🚀 Deploying to Vercel...")
-
-            try:
-                project_path = DEMOS_DIR / self.current_project
-
-                # Build
-                self.log("📦 Building project...")
-                subprocess.run(["npm", "run", "build"], cwd=project_path, check=True)
-
-                # Deploy
-                self.log("☁️  Deploying...")
-                result = subprocess.run(
-                    ["npx", "vercel", "--prod", "--yes"],
-                    cwd=project_path,
-                    capture_output=True,
-                    text=True
-                )
-
-                self.log(result.stdout)
-
-                # Extract URL
-                for line in result.stdout.split('\n'):
-                    if 'https://' in line and 'vercel.app' in line:
-                        self.log(f"✅ Deployed: {line.strip()}")
-
-                QMessageBox.information(self, "Success", "Deployment complete!")
-
-            except Exception as e:
-                self.log(f"❌ Error: {str(e)}")
-                QMessageBox.critical(self, "Error", str(e))
+            job = self.deploy_queue.submit(self.current_project, project_name=self.current_project)
+            if job.status == BuildJob.PENDING:
+                self.log(f"[deploy #{job.job_id}] ⏳ Waiting for a free deploy slot...")
+
+    def cancel_deploy(self):
+        """Cancel the current project's deploy"""
+        job = self.active_deploy(self.current_project) if self.current_project else None
+        if not job:
+            self.log("No deploy running for this project")
+            return
+        self.deploy_queue.cancel(job.job_id)
+        self.log(f"[deploy #{job.job_id}] 🛑 Cancelling deploy of {job.project_name}...")
+
+    def deploy_finished(self, job_id: int, project_name: str, url: str):
+        """Deploy job succeeded"""
+        if url:
+            self.log(f"[deploy #{job_id}] ✅ Deployed: {url}")
+        self.log(f"[deploy #{job_id}] 🎉 Deployment of {project_name} complete!")
+        QMessageBox.information(self, "Success", f"Deployment of {project_name} complete!\n\n{url}")
+
+    def deploy_error(self, job_id: int, error: str):
+        """Deploy job failed"""
+        project_name = self.deploy_queue.jobs[job_id].project_name
+        self.log(f"[deploy #{job_id}] ❌ Deployment error: {error}")
+        QMessageBox.critical(self, "Deploy Error", f"{project_name}: {error}")
 
     def closeEvent(self, event):
         """Clean up on close"""
+        self.deploy_queue.shutdown()
+        self.log_view.close_files()
         if self.monitor:
             self.monitor.stop()
+        if self.original_url:
+            dev_servers.release_port(self.original_url)
         event.accept()
 
 
 def main():
+    prepare_web_engine()
     app = QApplication(sys.argv)
     window = DemoBuilderApp()
     window.show()
@@ -0,0 +1,824 @@
+#!/usr/bin/env python3
+"""
+Demo Website Builder - Core
+GUI-free build logic: prompt, Claude tool loop, tool execution and API key
+config. Nothing here imports Qt, and anthropic is imported on first request,
+so batch runs and scripts start without loading PyQt6 or QtWebEngine.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from artifact_store import ArtifactStore
+from build_trace import Tracer
+from command_runner import CommandRunner
+from context_compactor import ContextCompactor, content_to_dicts
+from dev_server import dev_servers
+from file_patch import apply_patch, atomic_write
+from file_tools import glob_files, read_range, search
+from image_pipeline import ImagePipeline
+from package_store import PackageStore
+from scaffold_cache import ScaffoldCache
+from site_cache import site_cache
+from site_crawler import crawl_site
+from tool_scheduler import ToolScheduler
+from usage_store import CANCELLED, DONE, FAILED, usage_store
+
+# Configuration
+DEMOS_DIR = Path(__file__).parent.parent / "demos"
+TEMPLATE_DIR = DEMOS_DIR / "template"
+WORKFLOW_PATH = TEMPLATE_DIR / "WORKFLOW.md"
+CONFIG_PATH = Path(__file__).parent / "config.json"
+DEFAULT_MAX_CONCURRENT_BUILDS = 2
+
+MODEL = "claude-sonnet-4-20250514"
+MAX_TOKENS = 8000
+STREAM_RESPONSES = True  # Log text as it arrives and start tools before the turn ends
+MAX_ITERATIONS = 50
+
+# Shared by every build and change request so the cached prefix
+# (tools + system) is reused across jobs, not only within one conversation
+SYSTEM_INSTRUCTIONS = """You build demo websites for local businesses with Astro and Tailwind.
+Demo projects live in {demos_dir}. Reusable components are in {template_dir}.
+You work through the tools below: find, search, read and write files, run shell commands and start the dev server.
+Look things up with glob, search and read_file line ranges rather than shell commands or whole-file reads.
+
+Always follow the workflow. Don't forget:
+- AI Chatbot personalization with primaryColor
+- Use images from original site
+- Update all contact info, opening hours
+- Match original site structure
+
+WORKFLOW:
+{workflow}
+"""
+
+TOOLS = [
+    {
+        "name": "create_project",
+        "description": "Create a new demo project in demos/ from the cached scaffold: Astro + Tailwind "
+                       "installed, template components/layouts/pages copied. Use instead of npm create/npm install.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "project_name": {"type": "string", "description": "Project folder name"}
+            },
+            "required": ["project_name"]
+        }
+    },
+    {
+        "name": "read_file",
+        "description": "Read contents of a file. With start_line/end_line only those lines are returned, "
+                       "numbered (at most 400 per call) - use search first to find the lines you need",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "path": {"type": "string", "description": "File path"},
+                "start_line": {"type": "integer", "description": "First line (1-based)"},
+                "end_line": {"type": "integer", "description": "Last line"}
+            },
+            "required": ["path"]
+        }
+    },
+    {
+        "name": "glob",
+        "description": "List files matching a glob pattern (**/*.astro, src/components/*.{astro,ts}), newest first. "
+                       "node_modules and build output are skipped. Use instead of find/ls",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "pattern": {"type": "string", "description": "Glob pattern; without a / it matches at any depth"},
+                "path": {"type": "string", "description": "Directory to search (default: the demo project)"}
+            },
+            "required": ["pattern"]
+        }
+    },
+    {
+        "name": "search",
+        "description": "Search file contents with a regex; returns path, line number and line of each match. "
+                       "Use instead of grep, then read_file with a line range",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "pattern": {"type": "string", "description": "Python regex"},
+                "path": {"type": "string", "description": "File or directory (default: the demo project)"},
+                "glob": {"type": "string", "description": "Only files matching this glob, e.g. *.astro"},
+                "context": {"type": "integer", "description": "Lines of context around each match"},
+                "ignore_case": {"type": "boolean", "description": "Case-insensitive match"}
+            },
+            "required": ["pattern"]
+        }
+    },
+    {
+        "name": "write_file",
+        "description": "Write content to a file",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "path": {"type": "string", "description": "File path"},
+                "content": {"type": "string", "description": "File content"}
+            },
+            "required": ["path", "content"]
+        }
+    },
+    {
+        "name": "edit_file",
+        "description": "Edit file by replacing old_string with new_string",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "path": {"type": "string", "description": "File path"},
+                "old_string": {"type": "string", "description": "String to replace"},
+                "new_string": {"type": "string", "description": "Replacement string"}
+            },
+            "required": ["path", "old_string", "new_string"]
+        }
+    },
+    {
+        "name": "apply_patch",
+        "description": "Change many files in one call: a unified diff (--- a/path, +++ b/path, @@ hunks; "
+                       "/dev/null creates or deletes a file) and/or a list of old_string/new_string edits. "
+                       "Every hunk and edit is checked first - if one fails, no file is changed. "
+                       "Relative paths are resolved against the demo project. Prefer this over several edit_file calls",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "patch": {"type": "string", "description": "Unified diff, may span several files"},
+                "edits": {
+                    "type": "array",
+                    "description": "Edits applied in order; old_string must be unique unless replace_all",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "path": {"type": "string"},
+                            "old_string": {"type": "string", "description": "Empty to create a new file"},
+                            "new_string": {"type": "string"},
+                            "replace_all": {"type": "boolean"}
+                        },
+                        "required": ["path", "old_string", "new_string"]
+                    }
+                }
+            }
+        }
+    },
+    {
+        "name": "fetch_url",
+        "description": "Fetch a page, stylesheet or image of the original website through the local HTTP cache "
+                       "(unchanged resources are not downloaded again). Returns text for HTML/CSS; "
+                       "with save_to the response is written to that file instead, e.g. an image into public/.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "url": {"type": "string", "description": "Absolute URL"},
+                "save_to": {"type": "string", "description": "Optional file path to save the response to"}
+            },
+            "required": ["url"]
+        }
+    },
+    {
+        "name": "run_command",
+        "description": "Run a shell command. It is stopped only after a stretch without output "
+                       "(idle_timeout), not after a fixed time. Long output is summarized (head, error "
+                       "lines, tail); the full output is kept under a handle for read_output",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "command": {"type": "string", "description": "Command to run"},
+                "cwd": {"type": "string", "description": "Working directory"},
+                "background": {"type": "boolean",
+                               "description": "Return immediately and keep running (npm install, builds); "
+                                              "check on it with poll_command"},
+                "idle_timeout": {"type": "integer",
+                                 "description": "Stop the command after this many seconds without output "
+                                                "(default 120, background 600)"}
+            },
+            "required": ["command"]
+        }
+    },
+    {
+        "name": "poll_command",
+        "description": "Check a background command: new output while it runs, the result once it finished",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "id": {"type": "string", "description": "Command id from run_command, e.g. cmd-2"},
+                "wait_seconds": {"type": "integer", "description": "Wait up to this long (max 60) for it to finish"},
+                "stop": {"type": "boolean", "description": "Stop the command"}
+            },
+            "required": ["id"]
+        }
+    },
+    {
+        "name": "read_output",
+        "description": "Page through or search the full output of an earlier run_command by its handle, "
+                       "instead of running the command again",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "handle": {"type": "string", "description": "Handle from the run_command result, e.g. out-3"},
+                "start_line": {"type": "integer", "description": "First line (1-based)"},
+                "end_line": {"type": "integer", "description": "Last line (at most 200 lines per call)"},
+                "pattern": {"type": "string", "description": "Regex: return matching lines with context instead"}
+            },
+            "required": ["handle"]
+        }
+    },
+    {
+        "name": "start_dev_server",
+        "description": "Start npm dev server for preview",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "project_path": {"type": "string", "description": "Project directory"}
+            },
+            "required": ["project_path"]
+        },
+        # Cache breakpoint: tool schemas are identical for every build
+        "cache_control": {"type": "ephemeral"}
+    }
+]
+
+
+def project_name_from_url(url: str) -> str:
+    """Derive the demo folder name from a website URL (www.buehrer-ag.ch -> buehrer-ag)"""
+    host = urlparse(url if "://" in url else f"https://{url}").hostname or url
+    if host.startswith("www."):
+        host = host[4:]
+    parts = host.split(".")
+    if len(parts) > 1:
+        parts = parts[:-1]  # Drop TLD
+    slug = "-".join(parts).lower()
+    return re.sub(r"[^a-z0-9-]+", "-", slug).strip("-") or "demo"
+
+
+def build_system_blocks(workflow: str) -> List[Dict[str, Any]]:
+    """System prompt as one cacheable block (workflow + instructions)"""
+    return [{
+        "type": "text",
+        "text": SYSTEM_INSTRUCTIONS.format(
+            demos_dir=DEMOS_DIR, template_dir=TEMPLATE_DIR, workflow=workflow),
+        "cache_control": {"type": "ephemeral"}
+    }]
+
+
+def mark_cache_breakpoint(messages: List[Dict[str, Any]]):
+    """Move the rolling cache breakpoint to the end of the newest user turn.
+
+    Every request then reads the whole previous conversation from cache and
+    only pays full price for the latest tool results.
+    """
+    for message in messages:
+        if message["role"] == "user" and isinstance(message["content"], list):
+            for block in message["content"]:
+                if isinstance(block, dict):
+                    block.pop("cache_control", None)
+    last = messages[-1]["content"]
+    if isinstance(last, list) and last and isinstance(last[-1], dict):
+        last[-1]["cache_control"] = {"type": "ephemeral"}
+
+
+def load_env():
+    """Read automation/.env if python-dotenv is installed"""
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    load_dotenv(Path(__file__).parent / ".env")
+
+
+class APIKeyManager:
+    """Manage multiple API keys"""
+
+    def __init__(self):
+        load_env()
+        self.config_path = CONFIG_PATH
+        self.load_config()
+
+    def load_config(self):
+        """Load API keys from config file"""
+        if self.config_path.exists():
+            with open(self.config_path, 'r') as f:
+                self.config = json.load(f)
+        else:
+            # Create default config
+            default_key = os.getenv("ANTHROPIC_API_KEY", "")
+            self.config = {
+                "api_keys": [
+                    {"name": "Default", "key": default_key, "active": True}
+                ] if default_key else [],
+                "active_key_index": 0
+            }
+            self.save_config()
+
+    def save_config(self):
+        """Save API keys to config file"""
+        with open(self.config_path, 'w') as f:
+            json.dump(self.config, f, indent=2)
+
+    def get_keys(self) -> List[Dict[str, str]]:
+        """Get all API keys"""
+        return self.config.get("api_keys", [])
+
+    def get_active_key(self) -> Optional[str]:
+        """Get currently active API key"""
+        keys = self.get_keys()
+        active_index = self.config.get("active_key_index", 0)
+        if keys and 0 <= active_index < len(keys):
+            return keys[active_index]["key"]
+        return None
+
+    def get_active_key_name(self) -> Optional[str]:
+        """Get name of active API key"""
+        keys = self.get_keys()
+        active_index = self.config.get("active_key_index", 0)
+        if keys and 0 <= active_index < len(keys):
+            return keys[active_index]["name"]
+        return None
+
+    def get_max_concurrent_builds(self) -> int:
+        """Get size of the build worker pool"""
+        return self.config.get("max_concurrent_builds", DEFAULT_MAX_CONCURRENT_BUILDS)
+
+    def set_max_concurrent_builds(self, count: int):
+        """Set size of the build worker pool"""
+        self.config["max_concurrent_builds"] = count
+        self.save_config()
+
+    def set_active_key(self, index: int):
+        """Set active API key by index"""
+        if 0 <= index < len(self.get_keys()):
+            self.config["active_key_index"] = index
+            self.save_config()
+
+    def add_key(self, name: str, key: str):
+        """Add new API key"""
+        keys = self.get_keys()
+        keys.append({"name": name, "key": key})
+        self.config["api_keys"] = keys
+        self.save_config()
+
+    def remove_key(self, index: int):
+        """Remove API key"""
+        keys = self.get_keys()
+        if 0 <= index < len(keys):
+            keys.pop(index)
+            self.config["api_keys"] = keys
+            # Adjust active index if needed
+            if self.config["active_key_index"] >= len(keys):
+                self.config["active_key_index"] = max(0, len(keys) - 1)
+            self.save_config()
+
+
+class BuildError(Exception):
+    """The build ended without a working demo"""
+
+
+class BuildCancelled(Exception):
+    """cancel() was called while the build was running"""
+
+
+class DemoBuild:
+    """One build or change request: the Claude tool loop, without any GUI.
+
+    run() blocks until the demo is ready and returns its dev server URL;
+    call it from a worker thread (ClaudeWorker) or a plain thread pool
+    (batch mode). cancel() may be called from any thread.
+    """
+
+    def __init__(self, api_key: str, url: str, change_request: Optional[str] = None, project_name: Optional[str] = None,
+                 stream: bool = STREAM_RESPONSES, log: Optional[Callable[[str], None]] = None,
+                 on_usage: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.api_key = api_key
+        self.stream = stream
+        self.url = url
+        self.change_request = change_request
+        self.project_name = project_name or project_name_from_url(url)
+        self.log = log or print
+        self._client = None
+        self.compactor = ContextCompactor()
+        self.cancelled = False
+        self.iterations = 0
+        self.usage = {"input_tokens": 0, "output_tokens": 0,
+                      "cache_read_input_tokens": 0, "cache_creation_input_tokens": 0}
+        self.cost = 0.0
+        self.on_usage = on_usage  # Called with running totals after every request
+        self.build_id: Optional[int] = None  # Row in the usage store
+        self.tool_lock = threading.Lock()
+        self.tool_seconds = 0.0  # Tool time of the current iteration (tools run in parallel)
+        self.tool_calls = 0
+        self.artifacts = ArtifactStore.for_build(self.project_name)
+        self.trace = Tracer.for_build(self.project_name, "change" if change_request else "new",
+                                      url=url, model=MODEL)
+        self.commands = CommandRunner(self.artifacts, log=self.log, cancelled=lambda: self.cancelled,
+                                      trace=self.trace)
+
+    @property
+    def client(self):
+        """Anthropic client, imported on first use"""
+        if self._client is None:
+            import anthropic
+            self._client = anthropic.Anthropic(api_key=self.api_key)
+        return self._client
+
+    def read_file(self, path: str, start_line: Optional[int] = None, end_line: Optional[int] = None) -> str:
+        """Tool: Read file contents, or a numbered line range"""
+        try:
+            return read_range(path, start_line, end_line)
+        except Exception as e:
+            return f"Error reading file: {str(e)}"
+
+    def search_root(self, path: Optional[str]) -> Path:
+        """Directory for glob/search/apply_patch: the given path, else the demo project once it exists"""
+        if path:
+            return Path(path)
+        project_dir = DEMOS_DIR / self.project_name
+        return project_dir if project_dir.exists() else DEMOS_DIR
+
+    def write_file(self, path: str, content: str) -> str:
+        """Tool: Write file contents"""
+        try:
+            atomic_write(Path(path), content)
+            return f"Successfully wrote to {path}"
+        except Exception as e:
+            return f"Error writing file: {str(e)}"
+
+    def edit_file(self, path: str, old_string: str, new_string: str) -> str:
+        """Tool: Edit file with string replacement"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+
+            if old_string not in content:
+                return f"Error: old_string not found in {path}"
+
+            new_content = content.replace(old_string, new_string)
+            atomic_write(Path(path), new_content)
+
+            return f"Successfully edited {path}"
+        except Exception as e:
+            return f"Error editing file: {str(e)}"
+
+    def fetch_url(self, url: str, save_to: Optional[str] = None) -> str:
+        """Tool: Fetch from the original site via the shared HTTP cache"""
+        try:
+            return site_cache.fetch_for_tool(url, save_to)
+        except Exception as e:
+            return f"Error fetching {url}: {str(e)}"
+
+    def run_command(self, command: str, cwd: Optional[str] = None, background: bool = False,
+                    idle_timeout: Optional[int] = None) -> str:
+        """Tool: Run shell command, streaming its output to the log"""
+        try:
+            self.log(f"Running: {command}")
+            # Full output stays on disk, Claude gets a summary and a handle to page through it
+            if background:
+                return self.commands.run_background(command, cwd, idle_timeout)
+            return self.commands.run(command, cwd, idle_timeout)
+        except Exception as e:
+            return f"Error running command: {str(e)}"
+
+    def create_project(self, project_name: str) -> str:
+        """Tool: Materialize a new project from the scaffold cache"""
+        try:
+            self.log(f"Creating {project_name} from scaffold")
+            project_dir = ScaffoldCache(log=self.log).materialize(DEMOS_DIR / project_name)
+            return (f"Created {project_dir} with dependencies installed and template "
+                    f"components, layouts and pages copied to src/. Customize them next.")
+        except Exception as e:
+            return f"Error creating project: {str(e)}"
+
+    def start_dev_server(self, project_path: str) -> str:
+        """Start npm dev server in background (reuses a running one)"""
+        try:
+            try:
+                with self.trace.span("images") as span:
+                    span.set(optimized=len(ImagePipeline(Path(project_path), log=self.log).run()))
+            except Exception as e:
+                self.log(f"Image optimization failed, using the original images: {e}")
+            self.log(f"Starting dev server in {project_path}")
+            with self.trace.span("dev_server_start", project=Path(project_path).name) as span:
+                server = dev_servers.start(Path(project_path).name, Path(project_path))
+                ready = server.wait_until_ready()
+                span.set(url=server.url, ready=ready)
+            if not ready:
+                return f"Error: dev server did not become ready. Output:\n{server.output_tail()}"
+            return f"Dev server started on {server.url}"
+        except Exception as e:
+            return f"Error starting dev server: {str(e)}"
+
+    def stop_dev_server(self):
+        """Stop dev server"""
+        dev_servers.stop(self.project_name)
+
+    def cancel(self):
+        """Stop after the current iteration"""
+        self.cancelled = True
+        self.trace.event("cancel")
+
+    def request_turn(self, system: List[Dict[str, Any]], messages: List[Dict[str, Any]],
+                     scheduler: ToolScheduler):
+        """Send one request and return the final message (None if cancelled).
+
+        In streaming mode text deltas go to the log line by line, and every
+        tool_use block is handed to the scheduler once Claude moves on to the
+        next block, while it is still generating the rest of the turn. The
+        last block waits for the final stop reason: if the turn hit
+        max_tokens its input may be cut off and must not run.
+        """
+        request = dict(model=MODEL, max_tokens=MAX_TOKENS, system=system, tools=TOOLS, messages=messages)
+        if not self.stream:
+            return self.client.messages.create(**request)
+
+        pending_text = ""
+        finished_block = None  # Complete tool_use block, submitted when the next block starts
+        with self.client.messages.stream(**request) as stream:
+            for event in stream:
+                if self.cancelled:
+                    return None
+
+                if event.type == "content_block_start" and finished_block is not None:
+                    scheduler.submit(finished_block.id, finished_block.name, finished_block.input)
+                    finished_block = None
+
+                elif event.type == "text":
+                    pending_text += event.text
+                    *lines, pending_text = pending_text.split("\n")
+                    for line in lines:
+                        if line.strip():
+                            self.log(f"Claude: {line}")
+
+                elif event.type == "content_block_stop":
+                    block = stream.current_message_snapshot.content[event.index]
+                    if block.type == "tool_use":
+                        finished_block = block
+                    elif pending_text.strip():
+                        self.log(f"Claude: {pending_text}")
+                    pending_text = ""
+
+            return stream.get_final_message()
+
+    def log_usage(self, usage) -> Dict[str, int]:
+        """Log token counts of one request (including prompt cache hits) and add them up"""
+        cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", 0) or 0
+        self.usage["input_tokens"] += usage.input_tokens
+        self.usage["output_tokens"] += usage.output_tokens
+        self.usage["cache_read_input_tokens"] += cache_read
+        self.usage["cache_creation_input_tokens"] += cache_write
+        self.log(
+            f"Tokens: {usage.input_tokens} in, {usage.output_tokens} out | "
+            f"cache hit {cache_read}, cache write {cache_write}"
+        )
+        return {"input_tokens": usage.input_tokens, "output_tokens": usage.output_tokens,
+                "cache_read_input_tokens": cache_read, "cache_creation_input_tokens": cache_write}
+
+    def record_iteration(self, usage: Dict[str, int], latency: float):
+        """Store one request with the tool time it caused and report the running totals"""
+        with self.tool_lock:
+            tool_seconds, tool_calls = self.tool_seconds, self.tool_calls
+            self.tool_seconds, self.tool_calls = 0.0, 0
+        try:
+            if self.build_id is None:
+                self.build_id = usage_store.start_build(
+                    self.api_key, self.project_name, self.url,
+                    "change" if self.change_request else "new", MODEL)
+            self.cost += usage_store.record_iteration(
+                self.build_id, self.iterations, usage, latency, tool_seconds, tool_calls)
+        except sqlite3.Error as e:
+            self.log(f"Usage not recorded: {e}")
+        self.log(f"Claude {latency:.1f}s, tools {tool_seconds:.1f}s ({tool_calls} calls) | "
+                 f"build so far ${self.cost:.2f}")
+        if self.on_usage:
+            self.on_usage(dict(self.usage, cost=self.cost, iterations=self.iterations))
+
+    def finish_usage(self, status: str):
+        """Close this build's row in the usage store with its final status"""
+        if self.build_id is None:
+            return
+        try:
+            usage_store.finish_build(self.build_id, status)
+        except sqlite3.Error as e:
+            self.log(f"Usage not recorded: {e}")
+
+    def run_tool(self, tool_name: str, tool_input: Dict[str, Any]) -> str:
+        """Scheduler entry point - skips work once the job was cancelled"""
+        if self.cancelled:
+            return "Cancelled by user"
+        started = time.monotonic()
+        attrs = {key: tool_input[key] for key in ("path", "pattern", "command", "url", "project_name") if key in tool_input}
+        try:
+            with self.trace.span(f"tool:{tool_name}", **attrs) as span:
+                result = self.execute_tool(tool_name, tool_input)
+                span.set(result_chars=len(result), failed=result.startswith("Error"))
+                return result
+        finally:
+            with self.tool_lock:
+                self.tool_seconds += time.monotonic() - started
+                self.tool_calls += 1
+
+    def execute_tool(self, tool_name: str, tool_input: Dict[str, Any]) -> str:
+        """Execute a tool call from Claude"""
+        self.log(f"Executing tool: {tool_name}")
+
+        if tool_name == "read_file":
+            return self.read_file(tool_input["path"], tool_input.get("start_line"), tool_input.get("end_line"))
+        elif tool_name == "glob":
+            return glob_files(tool_input["pattern"], self.search_root(tool_input.get("path")))
+        elif tool_name == "search":
+            return search(
+                tool_input["pattern"],
+                self.search_root(tool_input.get("path")),
+                tool_input.get("glob"),
+                tool_input.get("context", 0),
+                tool_input.get("ignore_case", False)
+            )
+        elif tool_name == "write_file":
+            return self.write_file(tool_input["path"], tool_input["content"])
+        elif tool_name == "edit_file":
+            return self.edit_file(
+                tool_input["path"],
+                tool_input["old_string"],
+                tool_input["new_string"]
+            )
+        elif tool_name == "apply_patch":
+            try:
+                return apply_patch(self.search_root(None), tool_input.get("patch"), tool_input.get("edits"))
+            except Exception as e:
+                return f"Error applying patch: {str(e)}"
+        elif tool_name == "run_command":
+            return self.run_command(
+                tool_input["command"],
+                tool_input.get("cwd"),
+                tool_input.get("background", False),
+                tool_input.get("idle_timeout")
+            )
+        elif tool_name == "poll_command":
+            return self.commands.poll(
+                tool_input["id"],
+                tool_input.get("wait_seconds", 0),
+                tool_input.get("stop", False)
+            )
+        elif tool_name == "read_output":
+            return self.artifacts.read(
+                tool_input["handle"],
+                tool_input.get("start_line"),
+                tool_input.get("end_line"),
+                tool_input.get("pattern")
+            )
+        elif tool_name == "start_dev_server":
+            return self.start_dev_server(tool_input["project_path"])
+        elif tool_name == "create_project":
+            return self.create_project(tool_input["project_name"])
+        elif tool_name == "fetch_url":
+            return self.fetch_url(tool_input["url"], tool_input.get("save_to"))
+        else:
+            return f"Unknown tool: {tool_name}"
+
+    def crawl_facts(self) -> str:
+        """Fact sheet of the original site for the first message ("" if the crawl fails)"""
+        self.log(f"Crawling {self.url}")
+        try:
+            with self.trace.span("crawl", url=self.url) as span:
+                sheet = crawl_site(self.url, log=self.log)
+                span.set(pages=len(sheet.pages))
+        except Exception as e:
+            self.log(f"Crawl failed, Claude will fetch the site itself: {e}")
+            return ""
+        return f"\n{sheet.to_prompt()}\n" if sheet.pages else ""
+
+    def run(self) -> str:
+        """Run the tool loop until Claude is done; returns the dev server URL"""
+        scheduler = None
+        status = FAILED
+        root = self.trace.start("build", project=self.project_name)
+        try:
+            # Workflow and tools go into the cached system prefix
+            # Read whole - read_file would number and page a long workflow
+            try:
+                workflow = WORKFLOW_PATH.read_text(encoding="utf-8")
+            except OSError as e:
+                raise BuildError(f"Cannot read {WORKFLOW_PATH}: {e}")
+            system = build_system_blocks(workflow)
+
+            # Build initial prompt
+            if self.change_request:
+                prompt = f"The user requested changes to the existing demo website:\n\n{self.change_request}\n\nPlease make the requested changes to the project at {DEMOS_DIR / self.project_name}"
+            else:
+                prompt = f"""Create a new demo website following the workflow.
+
+Original website URL: {self.url}
+
+Instructions:
+1. Fetch the original website content with fetch_url (pages, CSS and images are cached
+   between builds; once the project exists, save images into its public/ with save_to)
+2. Create the project with the create_project tool (project name: {self.project_name}) - it
+   sets up Astro + Tailwind and copies the template components, so skip npm create/npm install
+3. Customize everything according to workflow
+4. Start dev server when done
+5. Report back when ready for review
+"""
+                prompt += self.crawl_facts()
+
+            self.log("Sending request to Claude...")
+
+            # Start conversation loop
+            messages = [{"role": "user", "content": [{"type": "text", "text": prompt}]}]
+            max_iterations = MAX_ITERATIONS
+            scheduler = ToolScheduler(self.run_tool, log=self.log)
+
+            for iteration in range(max_iterations):
+                if self.cancelled:
+                    self.stop_dev_server()
+                    raise BuildCancelled()
+
+                before, context_tokens = self.compactor.compact(messages)
+                if context_tokens < before:
+                    self.log(f"Compacted context: ~{before} -> ~{context_tokens} tokens")
+                self.iterations = iteration + 1
+                self.log(f"Iteration {iteration + 1}/{max_iterations} | context ~{context_tokens} tokens")
+
+                mark_cache_breakpoint(messages)
+                started = time.monotonic()
+                with self.trace.span("llm_request", iteration=self.iterations,
+                                     context_tokens=context_tokens) as span:
+                    response = self.request_turn(system, messages, scheduler)
+                    latency = time.monotonic() - started
+                    if response is None:
+                        span.set(cancelled=True)
+                        continue  # Cancelled mid-stream
+                    usage = self.log_usage(response.usage)
+                    span.set(stop_reason=response.stop_reason, **usage)
+
+                # Process response
+                if response.stop_reason == "end_turn":
+                    self.record_iteration(usage, latency)
+                    # Claude finished (streamed text was logged already)
+                    if not self.stream:
+                        for block in response.content:
+                            if hasattr(block, 'text'):
+                                self.log(f"Claude: {block.text}")
+
+                    # Done - check the project this build owns
+                    project_path = DEMOS_DIR / self.project_name
+                    if not project_path.is_dir():
+                        raise BuildError(f"Project {self.project_name} was not created")
+                    # Packages Claude installed on top of the scaffold go to the shared store
+                    PackageStore(log=self.log).link_project(project_path)
+                    server = dev_servers.get(self.project_name)
+                    if not server:
+                        self.log(self.start_dev_server(str(project_path)))
+                        server = dev_servers.get(self.project_name)
+                    if not server:
+                        raise BuildError(f"Dev server for {self.project_name} did not start")
+                    status = DONE
+                    return server.url
+
+                elif response.stop_reason == "tool_use":
+                    # Execute tools - independent ones run in parallel
+                    for block in response.content:
+                        if block.type == "tool_use" and not scheduler.is_submitted(block.id):
+                            scheduler.submit(block.id, block.name, block.input)
+
+                    tool_results = [
+                        {"type": "tool_result", "tool_use_id": tool_use_id, "content": result}
+                        for tool_use_id, result in scheduler.collect()
+                    ]
+                    self.record_iteration(usage, latency)
+
+                    # Add assistant message and tool results to conversation
+                    messages.append({"role": "assistant", "content": content_to_dicts(response.content)})
+                    messages.append({"role": "user", "content": tool_results})
+
+                else:
+                    scheduler.discard()  # The turn is incomplete - drop its tool calls
+                    self.record_iteration(usage, latency)
+                    raise BuildError(f"Unexpected stop reason: {response.stop_reason}")
+
+            if self.cancelled:
+                raise BuildCancelled()
+            raise BuildError(f"No result after {max_iterations} iterations")
+
+        except BuildCancelled:
+            status = CANCELLED
+            raise
+        except Exception as e:
+            root.set(error=str(e))
+            raise
+        finally:
+            if scheduler:
+                scheduler.shutdown()
+            self.commands.shutdown()
+            status = CANCELLED if self.cancelled and status == FAILED else status
+            self.finish_usage(status)
+            self.trace.end(root, status=status, iterations=self.iterations, cost=round(self.cost, 4))
+            self.trace.close()
+            self.log(f"Trace: {self.trace.path}")
+
+
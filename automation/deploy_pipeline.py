@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Demo Website Builder - Deploy Pipeline
+Builds a demo and deploys it (Vercel by default), streaming output line by line
+"""
+
+import os
+import re
+import signal
+import subprocess
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from build_cache import BuildCache, OUTPUT_DIR
+from build_trace import Tracer
+from deploy_targets import DeployTarget, get_target
+from image_pipeline import ImagePipeline
+
+MAX_CONCURRENT_DEPLOYS = 2
+
+BUILD_COMMAND = ["npm", "run", "build"]
+
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
+
+class DeployError(Exception):
+    """A pipeline step failed"""
+
+
+class DeployCancelled(Exception):
+    """cancel() was called while the pipeline was running"""
+
+
+class DeployPipeline:
+    """npm run build, then hand dist/ to a deploy target - cancellable from any thread"""
+
+    def __init__(self, project_dir: Path, log: Optional[Callable[[str], None]] = None,
+                 target: Optional[DeployTarget] = None):
+        self.project_dir = Path(project_dir)
+        self.log = log or print
+        self.target = target
+        self.cancelled = False
+        self.process: Optional[subprocess.Popen] = None
+        self.lock = threading.Lock()
+        self.trace = Tracer.for_build(self.project_dir.name, "deploy")
+
+    def run(self) -> Optional[str]:
+        """Run all steps; returns the deployment URL (None if Vercel printed none)"""
+        if not (self.project_dir / "package.json").exists():
+            raise DeployError(f"{self.project_dir} is not a project folder")
+
+        if self.target is None:
+            try:
+                self.target = get_target()
+            except ValueError as e:
+                raise DeployError(str(e))
+
+        try:
+            with self.trace.span("deploy", target=self.target.name) as deploy:
+                # Before the freshness check - new variants change src/ and public/
+                try:
+                    with self.trace.span("images") as span:
+                        span.set(optimized=len(ImagePipeline(self.project_dir, log=self.log).run()))
+                except Exception as e:
+                    self.log(f"⚠️  Image optimization failed, deploying the original images: {e}")
+
+                if self.target.needs_local_build:
+                    cache = BuildCache(self.project_dir)
+                    if cache.is_fresh():
+                        self.log("⚡ No changes since the last build - reusing dist/")
+                        self.trace.event("build_cache_hit")
+                    else:
+                        self.log("📦 Building project...")
+                        self.run_step(BUILD_COMMAND, cache.env())
+                        cache.record()
+                        self.log("✅ Build successful")
+                    if not (self.project_dir / OUTPUT_DIR).is_dir():
+                        raise DeployError(f"Build produced no {OUTPUT_DIR}/ folder")
+
+                self.log(f"☁️  Deploying ({self.target.name})...")
+                with self.trace.span(f"upload:{self.target.name}"):
+                    url = self.target.deploy(self.project_dir, self.project_dir / OUTPUT_DIR,
+                                             self.run_step, self.log)
+                deploy.set(url=url)
+                return url
+        finally:
+            self.trace.close()
+
+    def run_step(self, command: List[str], env: Optional[Dict[str, str]] = None) -> List[str]:
+        """Run one command, logging output as it arrives; returns its lines"""
+        with self.lock:
+            if self.cancelled:
+                raise DeployCancelled()
+            # Own process group so cancel() also stops node children of npm/npx
+            self.process = subprocess.Popen(
+                command,
+                cwd=self.project_dir,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.DEVNULL,
+                text=True,
+                bufsize=1,
+                env={**os.environ, "FORCE_COLOR": "0", "CI": "1", **(env or {})},
+                start_new_session=True
+            )
+
+        lines = []
+        with self.trace.span(f"command:{' '.join(command[:3])}", command=" ".join(command)) as span:
+            for line in self.process.stdout:
+                line = ANSI_ESCAPE.sub("", line).rstrip()
+                if line:
+                    lines.append(line)
+                    self.log(line)
+            returncode = self.process.wait()
+            span.set(exit_code=returncode, lines=len(lines))
+
+        if self.cancelled:
+            raise DeployCancelled()
+        if returncode != 0:
+            raise DeployError(f"`{' '.join(command)}` failed (exit {returncode}):\n" + "\n".join(lines[-20:]))
+        return lines
+
+    def cancel(self):
+        """Stop the running step; run() then raises DeployCancelled"""
+        self.trace.event("cancel")
+        with self.lock:
+            self.cancelled = True
+            if self.process and self.process.poll() is None:
+                try:
+                    os.killpg(self.process.pid, signal.SIGTERM)
+                except (ProcessLookupError, PermissionError):
+                    pass
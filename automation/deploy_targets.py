@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Demo Website Builder - Deploy Targets
+Where a built demo goes. Everything that talks to Vercel lives here, behind
+DeployTarget, so the pipeline can be exercised against a local folder.
+
+Select with DEMO_BUILDER_DEPLOY_TARGET:
+    vercel          upload the local dist/ as prebuilt output (default)
+    vercel-remote   let Vercel build from source (old behaviour)
+    local           copy dist/ to ~/.cache/demo-builder/deployments/<project>
+"""
+
+import filecmp
+import json
+import os
+import re
+import shutil
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+CACHE_DIR = Path(os.environ.get("DEMO_BUILDER_CACHE", Path.home() / ".cache" / "demo-builder"))
+LOCAL_DEPLOY_DIR = CACHE_DIR / "deployments"
+DEFAULT_TARGET = "vercel"
+
+# Pinned major version: the prebuilt metadata below follows this CLI's `vercel build`
+VERCEL_CLI = "vercel@39"
+
+VERCEL_URL = re.compile(r"https://[\w.-]+\.vercel\.app\S*")
+
+# Runs a command in the project folder, streaming and cancellable; returns output lines
+RunStep = Callable[[List[str]], List[str]]
+
+
+def sync_tree(src: Path, dst: Path) -> Tuple[int, int, int]:
+    """Make dst an exact copy of src, touching only files that differ.
+
+    Returns (copied, removed, unchanged).
+    """
+    copied = removed = unchanged = 0
+    dst.mkdir(parents=True, exist_ok=True)
+    wanted = set()
+
+    for dirpath, _, filenames in os.walk(src):
+        relative_dir = Path(dirpath).relative_to(src)
+        if (dst / relative_dir).is_file():
+            (dst / relative_dir).unlink()
+        (dst / relative_dir).mkdir(parents=True, exist_ok=True)
+        for filename in filenames:
+            source = Path(dirpath) / filename
+            target = dst / relative_dir / filename
+            wanted.add(target)
+            # Builds rewrite every file, so compare content when sizes match
+            if target.is_file() and filecmp.cmp(source, target, shallow=False):
+                unchanged += 1
+                continue
+            if target.is_dir():
+                shutil.rmtree(target)
+            shutil.copy2(source, target)
+            copied += 1
+
+    for dirpath, dirnames, filenames in os.walk(dst, topdown=False):
+        for filename in filenames:
+            path = Path(dirpath) / filename
+            if path not in wanted:
+                path.unlink()
+                removed += 1
+        if Path(dirpath) != dst and not os.listdir(dirpath):
+            os.rmdir(dirpath)
+    return copied, removed, unchanged
+
+
+class DeployTarget(ABC):
+    """Publishes a project; deploy() returns the public URL (None if unknown)"""
+    name = "target"
+    needs_local_build = True  # Does deploy() expect a fresh dist/?
+
+    @abstractmethod
+    def deploy(self, project_dir: Path, output_dir: Path, run_step: RunStep,
+               log: Callable[[str], None]) -> Optional[str]:
+        ...
+
+
+class VercelPrebuiltTarget(DeployTarget):
+    """Uploads dist/ via Vercel's Build Output API - no second build on Vercel.
+
+    The CLI uploads files by content hash and skips those Vercel already has,
+    so a redeploy after a small change only transfers the changed files.
+    """
+    name = "vercel"
+
+    def deploy(self, project_dir, output_dir, run_step, log):
+        output = project_dir / ".vercel" / "output"
+        copied, removed, unchanged = sync_tree(output_dir, output / "static")
+        (output / "config.json").write_text(json.dumps(self.output_config(), indent=2) + "\n")
+        (output / "builds.json").write_text(json.dumps(self.builds_metadata(), indent=2) + "\n")
+        log(f"Prebuilt output: {copied} changed, {removed} removed, {unchanged} unchanged files")
+
+        lines = run_step(["npx", "--yes", VERCEL_CLI, "deploy", "--prebuilt", "--prod", "--yes"])
+        return last_vercel_url(lines)
+
+    def output_config(self) -> Dict:
+        """Build Output API v3 config for a static Astro site"""
+        return {"version": 3, "routes": [{"handle": "filesystem"}]}
+
+    def builds_metadata(self) -> Dict:
+        """.vercel/output/builds.json as Vercel CLI 39's `vercel build --prod` writes it.
+
+        Not part of the Build Output API, but `vercel deploy --prebuilt` reads
+        the target from it and treats output without it as a preview build,
+        which --prod rejects. Re-check when bumping VERCEL_CLI.
+        """
+        return {
+            "//": "This file was generated by the `vercel build` command. It is not part of the Build Output API.",
+            "target": "production",
+            "argv": ["vercel", "build", "--prod"],
+            "builds": [],
+        }
+
+
+class VercelRemoteTarget(DeployTarget):
+    """Uploads the sources and lets Vercel run vercel.json's buildCommand"""
+    name = "vercel-remote"
+    needs_local_build = False
+
+    def deploy(self, project_dir, output_dir, run_step, log):
+        lines = run_step(["npx", "--yes", VERCEL_CLI, "--prod", "--yes"])
+        return last_vercel_url(lines)
+
+
+class LocalDeployTarget(DeployTarget):
+    """Stand-in for Vercel: mirrors dist/ into a local folder, changed files only"""
+    name = "local"
+
+    def __init__(self, root: Path = LOCAL_DEPLOY_DIR):
+        self.root = Path(root)
+
+    def deploy(self, project_dir, output_dir, run_step, log):
+        destination = self.root / project_dir.name
+        copied, removed, unchanged = sync_tree(output_dir, destination)
+        log(f"Copied {copied}, removed {removed}, kept {unchanged} files in {destination}")
+        return (destination / "index.html").as_uri()
+
+
+TARGETS = {
+    VercelPrebuiltTarget.name: VercelPrebuiltTarget,
+    VercelRemoteTarget.name: VercelRemoteTarget,
+    LocalDeployTarget.name: LocalDeployTarget,
+}
+
+
+def last_vercel_url(lines: List[str]) -> Optional[str]:
+    urls = VERCEL_URL.findall("\n".join(lines))
+    return urls[-1] if urls else None
+
+
+def get_target(name: Optional[str] = None) -> DeployTarget:
+    """Deploy target by name, DEMO_BUILDER_DEPLOY_TARGET or the default"""
+    name = name or os.environ.get("DEMO_BUILDER_DEPLOY_TARGET") or DEFAULT_TARGET
+    if name not in TARGETS:
+        raise ValueError(f"Unknown deploy target '{name}' (choose from {', '.join(TARGETS)})")
+    return TARGETS[name]()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Demo Website Builder - Dev Server Pool
+Hands every project its own port and keeps one Astro dev server per project
+"""
+
+import http.client
+import os
+import re
+import signal
+import socket
+import subprocess
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+BASE_PORT = 4321  # Astro default, first port handed out
+MAX_PORT = 4421
+IDLE_TTL = 30 * 60  # Stop servers nobody looked at for 30 minutes
+REAP_INTERVAL = 60
+READY_TIMEOUT = 60
+PROBE_INITIAL_DELAY = 0.1
+PROBE_MAX_DELAY = 2.0
+
+# Astro prints "┃ Local    http://localhost:4321/" once the server listens
+LOCAL_BANNER = re.compile(r"Local\s+https?://(?:localhost|127\.0\.0\.1|\[::1\]):(\d+)")
+
+
+def is_port_free(port: int) -> bool:
+    """Check that nothing listens on localhost:port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(0.2)
+        if sock.connect_ex(("127.0.0.1", port)) == 0:
+            return False
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(("127.0.0.1", port))
+        return True
+    except OSError:
+        return False
+
+
+def probe_http(port: int, timeout: float = 1.0) -> bool:
+    """Cheap HEAD request - any HTTP answer means the server is up"""
+    conn = http.client.HTTPConnection("localhost", port, timeout=timeout)
+    try:
+        conn.request("HEAD", "/")
+        conn.getresponse()
+        return True
+    except (OSError, http.client.HTTPException):
+        return False
+    finally:
+        conn.close()
+
+
+def wait_for_port(port: int, timeout: Optional[float] = READY_TIMEOUT,
+                  should_stop: Optional[Callable[[], bool]] = None) -> bool:
+    """Probe localhost:port with exponential backoff until it answers.
+
+    timeout=None waits until should_stop() returns True.
+    """
+    deadline = None if timeout is None else time.time() + timeout
+    delay = PROBE_INITIAL_DELAY
+    while True:
+        if probe_http(port):
+            return True
+        if should_stop and should_stop():
+            return False
+        if deadline is not None:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            delay = min(delay, remaining)
+        time.sleep(delay)
+        delay = min(delay * 2, PROBE_MAX_DELAY)
+
+
+class DevServer:
+    """One running `npm run dev` process"""
+
+    def __init__(self, project_name: str, project_path: Path, port: int, process: subprocess.Popen):
+        self.project_name = project_name
+        self.project_path = project_path
+        self.port = port
+        self.process = process
+        self.started_at = time.time()
+        self.last_used = self.started_at
+        self.output = deque(maxlen=200)  # Tail of stdout/stderr for error reports
+        self.ready = threading.Event()
+        self.reader = threading.Thread(target=self._read_output, daemon=True)
+        self.reader.start()
+
+    @property
+    def url(self) -> str:
+        return f"http://localhost:{self.port}"
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def _read_output(self):
+        """Drain the pipe and flag readiness when Astro prints its Local banner"""
+        for line in self.process.stdout:
+            self.output.append(line.rstrip())
+            if self.ready.is_set():
+                continue
+            match = LOCAL_BANNER.search(line)
+            if match:
+                # Astro moves to another port if ours got taken meanwhile
+                self.port = int(match.group(1))
+                if wait_for_port(self.port, timeout=10):
+                    self.ready.set()
+
+    def wait_until_ready(self, timeout: float = READY_TIMEOUT) -> bool:
+        """Block until the banner was seen and the port answers (or timeout/exit)"""
+        deadline = time.time() + timeout
+        delay = PROBE_INITIAL_DELAY
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            if self.ready.wait(min(delay, remaining)):
+                return True
+            if not self.is_alive():
+                return False
+            # Fallback for servers that don't print the banner we expect
+            if probe_http(self.port):
+                self.ready.set()
+                return True
+            delay = min(delay * 2, PROBE_MAX_DELAY)
+
+    def output_tail(self, lines: int = 20) -> str:
+        return "\n".join(list(self.output)[-lines:])
+
+    def stop(self):
+        """Terminate npm and the node processes it spawned"""
+        if not self.is_alive():
+            return
+        try:
+            os.killpg(self.process.pid, signal.SIGTERM)
+        except (ProcessLookupError, PermissionError, AttributeError):
+            self.process.terminate()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError, AttributeError):
+                self.process.kill()
+
+
+class DevServerManager:
+    """Port allocator and pool of dev servers, shared by all builders in a process"""
+
+    def __init__(self, base_port: int = BASE_PORT, max_port: int = MAX_PORT, idle_ttl: float = IDLE_TTL):
+        self.base_port = base_port
+        self.max_port = max_port
+        self.idle_ttl = idle_ttl
+        self.servers: Dict[str, DevServer] = {}
+        self.reserved: Dict[str, int] = {}  # key -> port handed out but not yet running
+        self.lock = threading.RLock()
+        self.reaper: Optional[threading.Thread] = None
+        self.stopping = threading.Event()
+
+    def allocate_port(self, key: str) -> int:
+        """Reserve a free port for key (project name or build id); stable per key"""
+        with self.lock:
+            if key in self.servers and self.servers[key].is_alive():
+                return self.servers[key].port
+            if key in self.reserved:
+                return self.reserved[key]
+
+            taken = set(self.reserved.values())
+            taken.update(s.port for s in self.servers.values() if s.is_alive())
+            for port in range(self.base_port, self.max_port + 1):
+                if port not in taken and is_port_free(port):
+                    self.reserved[key] = port
+                    return port
+        raise RuntimeError(f"No free port between {self.base_port} and {self.max_port}")
+
+    def release_port(self, key: str):
+        """Drop a reservation that was never used"""
+        with self.lock:
+            self.reserved.pop(key, None)
+
+    def start(self, project_name: str, project_path: Path) -> DevServer:
+        """Start a dev server for project, or reuse the one already running"""
+        with self.lock:
+            server = self.servers.get(project_name)
+            if server and server.is_alive():
+                server.last_used = time.time()
+                return server
+
+            port = self.allocate_port(project_name)
+            process = subprocess.Popen(
+                ["npm", "run", "dev", "--", "--port", str(port)],
+                cwd=str(project_path),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                start_new_session=True  # Own process group so stop() gets node too
+            )
+            server = DevServer(project_name, Path(project_path), port, process)
+            self.servers[project_name] = server
+            self.reserved.pop(project_name, None)
+            self._ensure_reaper()
+            return server
+
+    def get(self, project_name: str) -> Optional[DevServer]:
+        """Running server for project, if any"""
+        with self.lock:
+            server = self.servers.get(project_name)
+            return server if server and server.is_alive() else None
+
+    def touch(self, project_name: str):
+        """Mark project as in use so the idle reaper leaves it alone"""
+        with self.lock:
+            server = self.servers.get(project_name)
+            if server:
+                server.last_used = time.time()
+
+    def stop(self, project_name: str):
+        with self.lock:
+            server = self.servers.pop(project_name, None)
+            self.reserved.pop(project_name, None)
+        if server:
+            server.stop()
+
+    def stop_all(self):
+        self.stopping.set()
+        with self.lock:
+            servers = list(self.servers.values())
+            self.servers.clear()
+            self.reserved.clear()
+        for server in servers:
+            server.stop()
+
+    def reap_idle(self):
+        """Stop servers idle longer than the TTL and forget dead ones"""
+        now = time.time()
+        with self.lock:
+            expired = [name for name, server in self.servers.items()
+                       if not server.is_alive() or now - server.last_used > self.idle_ttl]
+            servers = [self.servers.pop(name) for name in expired]
+        for server in servers:
+            server.stop()
+
+    def _ensure_reaper(self):
+        if self.reaper and self.reaper.is_alive():
+            return
+        self.stopping.clear()
+        self.reaper = threading.Thread(target=self._reap_loop, daemon=True)
+        self.reaper.start()
+
+    def _reap_loop(self):
+        while not self.stopping.wait(REAP_INTERVAL):
+            self.reap_idle()
+
+
+# Shared pool for everything running in this process
+dev_servers = DevServerManager()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Demo Website Builder - File Patches
+The apply_patch tool: a unified diff and/or a batch of old_string/new_string
+edits across many files in one call. Every hunk and edit is checked against
+the current files first; only if all of them apply are the files written,
+each through a temp file and an atomic rename, so a failed patch or a crash
+never leaves a half-written component behind.
+
+Usage:
+    python3 file_patch.py <patch.diff> [base-dir]     # apply a unified diff
+"""
+
+import os
+import re
+import stat
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+DEV_NULL = "/dev/null"
+MAX_FUZZ_LINES = 3  # Lines of the file shown when a hunk's context isn't found
+
+
+def atomic_write(path: Path, text: str):
+    """Write via a temp file in the same folder and os.replace (keeps the file mode)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    mode = stat.S_IMODE(path.stat().st_mode) if path.exists() else 0o644
+    fd, temp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp, mode)
+        os.replace(temp, path)
+    except BaseException:
+        Path(temp).unlink(missing_ok=True)
+        raise
+
+
+class Hunk:
+    """One @@ block: the lines it expects (context and removals) and what replaces them"""
+
+    def __init__(self, header: str, old_start: int):
+        self.header = header
+        self.old_start = old_start
+        self.old: List[str] = []
+        self.new: List[str] = []
+
+
+class FilePatch:
+    def __init__(self, old_path: str, new_path: str):
+        self.old_path = old_path
+        self.new_path = new_path
+        self.hunks: List[Hunk] = []
+
+    @property
+    def path(self) -> str:
+        return self.old_path if self.new_path == DEV_NULL else self.new_path
+
+
+def _strip_prefix(path: str) -> str:
+    path = path.split("\t")[0].strip()
+    if path != DEV_NULL and path[:2] in ("a/", "b/"):
+        path = path[2:]
+    return path
+
+
+def parse_unified_diff(text: str) -> List[FilePatch]:
+    """Files and hunks of a unified diff (git or plain diff -u); lenient about hunk line counts"""
+    patches: List[FilePatch] = []
+    lines = text.splitlines()
+    hunk: Optional[Hunk] = None
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if line.startswith("--- ") and i + 1 < len(lines) and lines[i + 1].startswith("+++ "):
+            patches.append(FilePatch(_strip_prefix(line[4:]), _strip_prefix(lines[i + 1][4:])))
+            hunk = None
+            i += 2
+            continue
+        match = HUNK_HEADER.match(line)
+        if match and patches:
+            hunk = Hunk(line, int(match.group(1)))
+            patches[-1].hunks.append(hunk)
+        elif hunk is not None and line[:1] in (" ", "-", "+", ""):
+            # Editors and models drop the space of empty context lines
+            text_line = line[1:]
+            if line[:1] != "+":
+                hunk.old.append(text_line)
+            if line[:1] != "-":
+                hunk.new.append(text_line)
+        elif line.startswith("diff ") or line.startswith("index "):
+            hunk = None
+        i += 1
+
+    for patch in patches:
+        for hunk in patch.hunks:
+            # Trailing blank lines of a hunk are usually the patch's own padding
+            while hunk.old and hunk.new and hunk.old[-1] == "" and hunk.new[-1] == "":
+                hunk.old.pop()
+                hunk.new.pop()
+    return patches
+
+
+class PatchSet:
+    """Collects changes in memory; write() only runs when every hunk and edit applied"""
+
+    def __init__(self, base_dir: Path):
+        self.base_dir = Path(base_dir)
+        self.files: Dict[Path, Optional[str]] = {}  # New content, None = delete
+        self.originals: Dict[Path, Optional[str]] = {}  # None = did not exist
+        self.report: List[str] = []
+        self.applied = 0
+        self.failed = 0
+
+    def resolve(self, path: str) -> Path:
+        path = Path(path).expanduser()
+        return path if path.is_absolute() else self.base_dir / path
+
+    def current(self, path: Path) -> Optional[str]:
+        """Content as changed by earlier hunks/edits of this call, else from disk"""
+        if path in self.files:
+            return self.files[path]
+        if path not in self.originals:
+            self.originals[path] = None
+            if path.exists():
+                with open(path, encoding="utf-8", newline="") as f:  # Keep \r\n as is
+                    self.originals[path] = f.read()
+        return self.originals[path]
+
+    def result(self, label: str, error: Optional[str] = None, note: str = ""):
+        if error:
+            self.failed += 1
+            self.report.append(f"  {label}: FAILED - {error}")
+        else:
+            self.applied += 1
+            self.report.append(f"  {label}: ok{note}")
+
+    def add_diff(self, text: str):
+        patches = parse_unified_diff(text)
+        if not patches:
+            self.failed += 1
+            self.report.append("patch: FAILED - no '--- path' / '+++ path' file headers found")
+            return
+        for patch in patches:
+            self.report.append(patch.path)
+            if not patch.hunks:
+                self.result("file", "no @@ hunks for this file")
+            elif patch.old_path == DEV_NULL:
+                self.create_file(patch)
+            else:
+                self.patch_file(patch)
+
+    def create_file(self, patch: FilePatch):
+        path = self.resolve(patch.new_path)
+        if self.current(path) is not None:  # An empty file exists too
+            self.result("new file", f"{patch.new_path} already exists")
+            return
+        self.files[path] = "\n".join(line for hunk in patch.hunks for line in hunk.new) + "\n"
+        self.result("new file", note=f" ({sum(len(hunk.new) for hunk in patch.hunks)} lines)")
+
+    def patch_file(self, patch: FilePatch):
+        path = self.resolve(patch.old_path)
+        content = self.current(path)
+        if content is None:
+            for number, hunk in enumerate(patch.hunks, 1):
+                self.result(f"hunk {number}", f"{patch.old_path} does not exist")
+            return
+
+        newline = "\r\n" if "\r\n" in content else "\n"
+        text = content.replace("\r\n", "\n")
+        trailing = text.endswith("\n")
+        lines = text[:-1].split("\n") if trailing else text.split("\n")
+
+        offset = 0  # Lines added by earlier hunks
+        position = 0  # Hunks apply in order, after the previous one
+        ok = True
+        for number, hunk in enumerate(patch.hunks, 1):
+            label = f"hunk {number} @@ {hunk.header.split('@@')[1].strip()} @@"
+            # A pure insertion (-5,0) goes after line 5, anything else starts at line 5
+            start = hunk.old_start if not hunk.old else max(hunk.old_start - 1, 0)
+            expected = max(start + offset, position)
+            at = find_block(lines, hunk.old, expected, position)
+            if at is None:
+                ok = False
+                self.result(label, "context not found" + closest_hint(lines, hunk.old))
+                continue
+            lines[at:at + len(hunk.old)] = hunk.new
+            shift = at - (start + offset)
+            position = at + len(hunk.new)
+            offset += len(hunk.new) - len(hunk.old)
+            self.result(label, note=f" (line {at + 1}{f', offset {shift:+d}' if shift else ''})")
+
+        if not ok:
+            return
+        if patch.new_path == DEV_NULL:
+            self.files[path] = None
+        else:
+            new_path = self.resolve(patch.new_path)
+            new_text = "\n".join(lines) + ("\n" if trailing else "")
+            if new_path != path:
+                self.current(new_path)  # Remember it for a rollback
+                self.files[path] = None  # Renamed
+            self.files[new_path] = new_text.replace("\n", newline)
+
+    def add_edits(self, edits: List[Dict[str, Any]]):
+        for number, edit in enumerate(edits, 1):
+            raw_path = edit.get("path", "")
+            old, new = edit.get("old_string", ""), edit.get("new_string", "")
+            label = f"edit {number} ({raw_path})"
+            path = self.resolve(raw_path)
+            content = self.current(path)
+            if content is None:
+                if old:
+                    self.result(label, "file does not exist")
+                else:
+                    self.files[path] = new
+                    self.result(label, note=" (new file)")
+                continue
+            newline = "\r\n" if "\r\n" in content and "\r\n" not in old else None
+            if newline:
+                content = content.replace("\r\n", "\n")
+            count = content.count(old) if old else 0
+            if count == 0:
+                self.result(label, "old_string not found" + closest_hint(content.split("\n"), old.split("\n")))
+            elif count > 1 and not edit.get("replace_all"):
+                self.result(label, f"old_string found {count} times - add context or set replace_all")
+            else:
+                content = content.replace(old, new)
+                self.files[path] = content.replace("\n", newline) if newline else content
+                self.result(label, note=f" ({count} replacements)" if count > 1 else "")
+
+    def write(self) -> List[Path]:
+        """Write every changed file atomically; restore the written ones if one fails"""
+        written: List[Path] = []
+        try:
+            for path, content in self.files.items():
+                if content is None:
+                    if path.exists():
+                        path.unlink()
+                else:
+                    atomic_write(path, content)
+                written.append(path)
+        except Exception:
+            for path in written:
+                original = self.originals.get(path)
+                if original is None:
+                    path.unlink(missing_ok=True)
+                else:
+                    atomic_write(path, original)
+            raise
+        return written
+
+
+def find_block(lines: List[str], block: List[str], expected: int, start: int) -> Optional[int]:
+    """Index where block occurs at or after start, nearest to expected; whitespace-tolerant fallback"""
+    if not block:
+        return min(max(expected, start), len(lines))
+    candidates = range(start, len(lines) - len(block) + 1)
+    for compare in (lambda a, b: a == b, lambda a, b: a.strip() == b.strip()):
+        hits = [i for i in candidates
+                if compare(lines[i], block[0]) and all(compare(lines[i + k], block[k]) for k in range(len(block)))]
+        if hits:
+            return min(hits, key=lambda i: abs(i - expected))
+    return None
+
+
+def closest_hint(lines: List[str], block: List[str]) -> str:
+    """Where the first non-blank expected line occurs, to help fix the hunk"""
+    first = next((line.strip() for line in block if line.strip()), None)
+    if first is None:
+        return ""
+    found = [number for number, line in enumerate(lines) if line.strip() == first]
+    if not found:
+        return f"; '{first[:80]}' is not in the file - re-read it"
+    at = found[0]
+    excerpt = "\n".join(f"      {number + 1:>5}| {lines[number]}"
+                        for number in range(at, min(len(lines), at + MAX_FUZZ_LINES)))
+    where = ", ".join(str(number + 1) for number in found[:5])
+    return f"; its first line is at line {where} but the lines after it differ:\n{excerpt}"
+
+
+def apply_patch(base_dir: Path, patch: Optional[str] = None,
+                edits: Optional[List[Dict[str, Any]]] = None) -> str:
+    """apply_patch tool: all hunks/edits or nothing, with a line per hunk/edit"""
+    changes = PatchSet(base_dir)
+    if patch:
+        changes.add_diff(patch)
+    if edits:
+        changes.add_edits(edits)
+    if not changes.applied and not changes.failed:
+        return "Error: pass a unified diff in patch and/or a list of edits"
+
+    report = "\n".join(changes.report)
+    total = changes.applied + changes.failed
+    if changes.failed:
+        return (f"Error: patch not applied, no file was changed - {changes.failed} of {total} "
+                f"hunks/edits failed:\n{report}")
+    written = changes.write()
+    return f"Applied {total} hunks/edits to {len(written)} files:\n{report}"
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    base_dir = Path(sys.argv[2]) if len(sys.argv) > 2 else Path.cwd()
+    print(apply_patch(base_dir, patch=Path(sys.argv[1]).read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
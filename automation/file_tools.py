@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Demo Website Builder - File Tools
+In-process read_file line ranges, glob and regex search over a project tree
+for the API builder's tools, so simple lookups neither read whole files into
+the context nor fork find/grep/cat. Results are capped to fit the context
+window; node_modules, dist and other generated folders are skipped.
+
+Usage:
+    python3 file_tools.py glob <pattern> [root]
+    python3 file_tools.py search <regex> [root] [file-glob]
+    python3 file_tools.py read <file> [start] [end]
+"""
+
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Iterator, List, Optional, Pattern
+
+SKIP_DIRS = {"node_modules", ".git", "dist", ".astro", ".vercel", ".netlify", ".cache", "__pycache__"}
+
+MAX_READ_CHARS = 40000  # Larger files are returned as the first page only
+MAX_PAGE_LINES = 400
+MAX_GLOB_RESULTS = 200
+MAX_SEARCH_MATCHES = 100
+MAX_RESULT_CHARS = 12000
+MAX_LINE_CHARS = 300
+MAX_SEARCH_FILE_BYTES = 1_000_000  # Minified bundles, images ... are not searched
+
+
+def _clip(line: str) -> str:
+    return line if len(line) <= MAX_LINE_CHARS else line[:MAX_LINE_CHARS] + " ..."
+
+
+def _numbered(lines: List[str], first: int) -> str:
+    return "\n".join(f"{number:>5}| {line}" for number, line in enumerate(lines, first))
+
+
+def glob_regex(pattern: str) -> Pattern:
+    """Glob to regex on /-separated relative paths: **, *, ?, [abc] and {a,b}.
+
+    A pattern without a slash matches file names at any depth (*.astro).
+    """
+    if "/" not in pattern:
+        pattern = "**/" + pattern
+    out, i = [], 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[" and "]" in pattern[i + 1:]:
+            end = pattern.index("]", i + 1)
+            body = pattern[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]  # Only a leading ! negates, [a!b] is a plain set
+            elif body.startswith("^"):
+                body = "\\" + body
+            out.append("[" + body + "]")
+            i = end
+        elif c == "{" and "}" in pattern[i + 1:]:
+            end = pattern.index("}", i + 1)
+            out.append("(?:" + "|".join(re.escape(part) for part in pattern[i + 1:end].split(",")) + ")")
+            i = end
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return re.compile("".join(out) + r"\Z")
+
+
+def walk_files(root: Path) -> Iterator[Path]:
+    """Files below root, generated folders pruned, in a stable order"""
+    for directory, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        for name in sorted(files):
+            yield Path(directory) / name
+
+
+def read_range(path: str, start_line: Optional[int] = None, end_line: Optional[int] = None) -> str:
+    """read_file tool: whole file as is, or numbered lines start_line..end_line"""
+    text = Path(path).read_text(encoding="utf-8")
+    if start_line is None and end_line is None and len(text) <= MAX_READ_CHARS:
+        return text
+
+    lines = text.splitlines()
+    start = max(1, start_line or 1)
+    end = min(len(lines), end_line or start + MAX_PAGE_LINES - 1, start + MAX_PAGE_LINES - 1)
+    if start > len(lines):
+        return f"{path} has only {len(lines)} lines"
+    page = _numbered(lines[start - 1:end], start)
+    if len(page) > MAX_READ_CHARS:
+        page = page[:MAX_READ_CHARS] + "\n... [page truncated, request fewer lines]"
+    if end < len(lines) or start > 1:
+        page += f"\n[lines {start}-{end} of {len(lines)}; use start_line/end_line for more]"
+    return page
+
+
+def glob_files(pattern: str, root: Path) -> str:
+    """glob tool: matching files relative to root, newest first"""
+    root = Path(root)
+    if not root.is_dir():
+        return f"Error: {root} is not a directory"
+    regex = glob_regex(pattern)
+    matches = [path for path in walk_files(root) if regex.match(path.relative_to(root).as_posix())]
+    if not matches:
+        return f"No files match {pattern} in {root}"
+    matches.sort(key=lambda path: path.stat().st_mtime, reverse=True)
+    shown = [path.relative_to(root).as_posix() for path in matches[:MAX_GLOB_RESULTS]]
+    more = f"\n[{len(matches) - len(shown)} more, narrow the pattern]" if len(matches) > len(shown) else ""
+    return f"{len(matches)} files in {root}:\n" + "\n".join(shown) + more
+
+
+def search(pattern: str, root: Path, file_glob: Optional[str] = None, context: int = 0,
+           ignore_case: bool = False) -> str:
+    """search tool: regex matches as path:line with optional context, grouped by file"""
+    try:
+        regex = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+    except re.error as e:
+        return f"Error: invalid pattern: {e}"
+    root = Path(root)
+    if root.is_file():
+        files, base = [root], root.parent
+    elif root.is_dir():
+        name_filter = glob_regex(file_glob) if file_glob else None
+        files = [path for path in walk_files(root)
+                 if not name_filter or name_filter.match(path.relative_to(root).as_posix())]
+        base = root
+    else:
+        return f"Error: {root} does not exist"
+
+    result: List[str] = []
+    hits = matched_files = size = 0
+    truncated = False
+    for path in files:
+        try:
+            if path.stat().st_size > MAX_SEARCH_FILE_BYTES:
+                continue
+            data = path.read_bytes()
+        except OSError:
+            continue
+        if b"\0" in data[:8192]:
+            continue  # Binary
+        lines = data.decode("utf-8", errors="replace").splitlines()
+        numbers = [number for number, line in enumerate(lines) if regex.search(line)]
+        if not numbers:
+            continue
+        matched_files += 1
+        hits += len(numbers)
+        if truncated:
+            continue
+
+        matched, shown = set(numbers), set()
+        block = [path.relative_to(base).as_posix()]
+        for hit in numbers:
+            for number in range(max(0, hit - context), min(len(lines), hit + context + 1)):
+                if number in shown:
+                    continue
+                if shown and number - 1 not in shown:
+                    block.append("  ...")
+                shown.add(number)
+                block.append(f"{number + 1:>5}{':' if number in matched else '|'} {_clip(lines[number])}")
+        entry = "\n".join(block)
+        if size + len(entry) > MAX_RESULT_CHARS or hits > MAX_SEARCH_MATCHES:
+            truncated = True
+            if not result:  # One file with a lot of matches: show its first part
+                result.append(entry[:MAX_RESULT_CHARS] + "\n  ...")
+            continue
+        result.append(entry)
+        size += len(entry)
+
+    if not hits:
+        return f"No matches for /{pattern}/ in {root}"
+    header = f"{hits} matches in {matched_files} files"
+    if truncated:
+        header += f" (first {len(result)} files shown, narrow the pattern, path or glob)"
+    return header + ":\n" + "\n\n".join(result)
+
+
+def main():
+    commands = ("glob", "search", "read")
+    if len(sys.argv) < 3 or sys.argv[1] not in commands:
+        print(__doc__)
+        sys.exit(1)
+
+    command, args = sys.argv[1], sys.argv[2:]
+    if command == "glob":
+        print(glob_files(args[0], Path(args[1]) if len(args) > 1 else Path.cwd()))
+    elif command == "search":
+        print(search(args[0], Path(args[1]) if len(args) > 1 else Path.cwd(), args[2] if len(args) > 2 else None))
+    else:
+        numbers = [int(value) for value in args[1:3]]
+        print(read_range(args[0], *numbers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Demo Website Builder - Demos Folder Watcher
+Reports new projects and file changes via inotify (Linux), polling elsewhere
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+PROJECT_CREATED = "project_created"
+FILE_CHANGED = "file_changed"
+
+IGNORED_PROJECTS = {"template"}
+IGNORED_DIRS = {"node_modules", ".astro", "dist", ".git", ".vercel", ".vscode"}
+POLL_INTERVAL = 2.0
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+ROOT_MASK = IN_CREATE | IN_MOVED_TO | IN_DELETE_SELF
+PROJECT_MASK = IN_CREATE | IN_MOVED_TO | IN_CLOSE_WRITE | IN_MODIFY | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class WatchEvent:
+    """Something happened in the demos folder"""
+
+    def __init__(self, kind: str, project: str, path: Path):
+        self.kind = kind
+        self.project = project
+        self.path = path
+
+    def __eq__(self, other):
+        return (self.kind, self.project, self.path) == (other.kind, other.project, other.path)
+
+    def __hash__(self):
+        return hash((self.kind, self.project, self.path))
+
+    def __repr__(self):
+        return f"WatchEvent({self.kind}, {self.project}, {self.path})"
+
+
+def is_project_dir(path: Path) -> bool:
+    return path.is_dir() and path.name not in IGNORED_PROJECTS and not path.name.startswith(".")
+
+
+class PollingWatcher:
+    """Fallback: rescan the demos folder every POLL_INTERVAL seconds"""
+    mode = "polling"
+
+    def __init__(self, root: Path, interval: float = POLL_INTERVAL):
+        self.root = Path(root)
+        self.interval = interval
+        self.projects = self._list_projects()
+        self.mtimes: Dict[Path, float] = {}
+        self.watched: Set[str] = set()
+        self.next_scan = time.time() + interval
+
+    def _list_projects(self) -> Set[str]:
+        if not self.root.exists():
+            return set()
+        return {d.name for d in self.root.iterdir() if is_project_dir(d)}
+
+    def watch_project(self, project: str):
+        """Also report file changes inside this project"""
+        self.watched.add(project)
+        for path, mtime in self._scan_files(project):
+            self.mtimes[path] = mtime
+
+    def _scan_files(self, project: str) -> Iterable[Tuple[Path, float]]:
+        for dirpath, dirnames, filenames in os.walk(self.root / project):
+            dirnames[:] = [d for d in dirnames if d not in IGNORED_DIRS]
+            for filename in filenames:
+                path = Path(dirpath) / filename
+                try:
+                    yield path, path.stat().st_mtime
+                except OSError:
+                    continue
+
+    def poll(self, timeout: float) -> List[WatchEvent]:
+        """Wait up to timeout seconds and return what changed"""
+        wait = self.next_scan - time.time()
+        if wait > timeout:
+            time.sleep(timeout)
+            return []
+        if wait > 0:
+            time.sleep(wait)
+        self.next_scan = time.time() + self.interval
+
+        events = []
+        current = self._list_projects()
+        for project in sorted(current - self.projects):
+            events.append(WatchEvent(PROJECT_CREATED, project, self.root / project))
+            self.watch_project(project)
+        self.projects = current
+
+        for project in self.watched & current:
+            for path, mtime in self._scan_files(project):
+                if self.mtimes.get(path) != mtime:
+                    self.mtimes[path] = mtime
+                    events.append(WatchEvent(FILE_CHANGED, project, path))
+        return events
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux: kernel pushes events, nothing is scanned while idle"""
+    mode = "inotify"
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        libc_name = ctypes.util.find_library("c")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches: Dict[int, Tuple[Optional[str], Path]] = {}  # wd -> (project, dir)
+        self.buffer = b""
+        self._add_watch(self.root, None, ROOT_MASK)
+
+    def _add_watch(self, path: Path, project: Optional[str], mask: int):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(str(path)), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            if project is None:
+                raise OSError(errno, f"Cannot watch {path}")
+            return  # Directory vanished or watch limit hit - skip it
+        self.watches[wd] = (project, path)
+
+    def watch_project(self, project: str):
+        """Watch a project folder recursively (skipping node_modules & co.)"""
+        project_path = self.root / project
+        for dirpath, dirnames, _ in os.walk(project_path):
+            dirnames[:] = [d for d in dirnames if d not in IGNORED_DIRS]
+            self._add_watch(Path(dirpath), project, PROJECT_MASK)
+
+    def poll(self, timeout: float) -> List[WatchEvent]:
+        """Wait up to timeout seconds and return what changed"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            self.buffer += os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events: List[WatchEvent] = []
+        while len(self.buffer) >= EVENT_HEADER.size:
+            wd, mask, _, name_len = EVENT_HEADER.unpack_from(self.buffer)
+            end = EVENT_HEADER.size + name_len
+            if len(self.buffer) < end:
+                break
+            name = self.buffer[EVENT_HEADER.size:end].rstrip(b"\0")
+            self.buffer = self.buffer[end:]
+            self._handle(wd, mask, os.fsdecode(name), events)
+
+        # Editors and npm fire several events per file - report each once
+        unique = []
+        for event in events:
+            if event not in unique:
+                unique.append(event)
+        return unique
+
+    def _handle(self, wd: int, mask: int, name: str, events: List[WatchEvent]):
+        if mask & IN_IGNORED:
+            self.watches.pop(wd, None)
+            return
+        if wd not in self.watches or not name:
+            return
+
+        project, directory = self.watches[wd]
+        path = directory / name
+        is_dir = bool(mask & IN_ISDIR)
+
+        if project is None:
+            # Event directly in demos/
+            if is_dir and mask & (IN_CREATE | IN_MOVED_TO) and is_project_dir(path):
+                events.append(WatchEvent(PROJECT_CREATED, name, path))
+                self.watch_project(name)
+            return
+
+        if is_dir:
+            if mask & (IN_CREATE | IN_MOVED_TO) and name not in IGNORED_DIRS:
+                for dirpath, dirnames, filenames in os.walk(path):
+                    dirnames[:] = [d for d in dirnames if d not in IGNORED_DIRS]
+                    self._add_watch(Path(dirpath), project, PROJECT_MASK)
+                    # Files written before the watch existed (mkdir -p && write, copytree)
+                    for filename in filenames:
+                        events.append(WatchEvent(FILE_CHANGED, project, Path(dirpath) / filename))
+            return
+
+        if mask & (IN_CLOSE_WRITE | IN_MOVED_TO | IN_DELETE | IN_MODIFY):
+            events.append(WatchEvent(FILE_CHANGED, project, path))
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def create_watcher(root: Path):
+    """inotify where available, polling loop otherwise"""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root)
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Demo Website Builder - Image Pipeline
+Finds the images a demo references (original-site URLs, Unsplash, files in
+public/), downloads them once through the site cache and encodes responsive
+AVIF/WebP variants at a few widths. Encoded variants are cached by content
+hash across projects, so rebuilds never re-encode an unchanged image.
+
+The project gets the variants in public/_img/ and a manifest in
+src/data/images.json; the template's Hero and ImageCard look their src up
+there and render <picture> with srcset, sizes, width and height.
+
+Needs Pillow (pip install Pillow); without it images are left as they are.
+
+Usage:
+    python3 image_pipeline.py optimize <project_dir>
+    python3 image_pipeline.py stats
+    python3 image_pipeline.py clear
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = ImageOps = None
+
+from site_cache import site_cache
+
+CACHE_DIR = Path(os.environ.get("DEMO_BUILDER_CACHE", Path.home() / ".cache" / "demo-builder"))
+IMAGE_CACHE_DIR = CACHE_DIR / "images"
+OUTPUT_DIR = Path("public") / "_img"
+MANIFEST_PATH = Path("src") / "data" / "images.json"
+MAX_WORKERS = 4
+
+WIDTHS = (480, 800, 1200, 1920)
+# (extension, Pillow format, MIME type, save options) - best format first
+FORMATS = (
+    (".avif", "AVIF", "image/avif", {"quality": 60}),
+    (".webp", "WEBP", "image/webp", {"quality": 80, "method": 4}),
+)
+# Part of every cache key, so changing widths or quality re-encodes once
+SETTINGS = hashlib.sha256(repr((WIDTHS, FORMATS)).encode()).hexdigest()[:8]
+
+# Image props and attributes in .astro files: src="...", backgroundImage="...", image: '...'
+IMAGE_REFERENCE = re.compile(r"""\b(?:src|image|logo|\w*Image)\s*[=:]\s*["']([^"'{}\s]+)["']""")
+LOCAL_IMAGE = re.compile(r"^/[^?#]+\.(?:jpe?g|png|webp|avif|gif|bmp|tiff?)$", re.IGNORECASE)
+# Remote files Pillow can't (or shouldn't) rasterize - logos and icons are often SVG
+UNSUPPORTED_IMAGE = re.compile(r"\.(?:svgz?|ico|pdf)$", re.IGNORECASE)
+
+
+def supported_formats() -> List[Tuple[str, str, str, dict]]:
+    """FORMATS this Pillow can write (AVIF needs Pillow 11.3+ or pillow-avif-plugin)"""
+    if Image is None:
+        return []
+    extensions = Image.registered_extensions()
+    return [spec for spec in FORMATS if extensions.get(spec[0]) == spec[1] and spec[1] in Image.SAVE]
+
+
+def _link_or_copy(src: Path, dst: Path):
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+class ImagePipeline:
+    """Optimizes the images of one project; run() writes variants and the manifest"""
+
+    def __init__(self, project_dir: Path, cache_root: Path = IMAGE_CACHE_DIR,
+                 log: Optional[Callable[[str], None]] = None):
+        self.project_dir = Path(project_dir)
+        self.cache_root = Path(cache_root)
+        self.log = log or print
+        self.formats = supported_formats()
+
+    def find_references(self) -> List[str]:
+        """Image URLs and public/ paths used in the project's .astro files"""
+        references = []
+        for path in sorted((self.project_dir / "src").rglob("*.astro")):
+            for value in IMAGE_REFERENCE.findall(path.read_text(encoding="utf-8", errors="replace")):
+                if value.startswith("/" + OUTPUT_DIR.name + "/"):
+                    continue  # Already one of ours
+                is_remote = value.startswith(("http://", "https://"))
+                if is_remote and UNSUPPORTED_IMAGE.search(urlparse(value).path):
+                    continue
+                if (is_remote or LOCAL_IMAGE.match(value)) and value not in references:
+                    references.append(value)
+        return references
+
+    def load_source(self, reference: str) -> Optional[bytes]:
+        if reference.startswith(("http://", "https://")):
+            response = site_cache.fetch(reference)
+            content_type = response.content_type
+            # SVG served without a telling extension
+            return response.body if content_type.startswith("image/") and "svg" not in content_type else None
+        path = self.project_dir / "public" / reference.lstrip("/")
+        return path.read_bytes() if path.is_file() else None
+
+    def entry_dir(self, key: str) -> Path:
+        return self.cache_root / key[:2] / f"{key}-{SETTINGS}"
+
+    def encode(self, data: bytes) -> Optional[Dict]:
+        """Variants of one image in the shared cache; returns their metadata (None if skipped)"""
+        key = hashlib.sha256(data).hexdigest()
+        entry = self.entry_dir(key)
+        try:
+            meta = json.loads((entry / "meta.json").read_text())
+            if set(meta["formats"]) >= {extension for extension, *_ in self.formats}:
+                return meta
+        except (OSError, ValueError, KeyError):
+            pass
+
+        image = Image.open(io.BytesIO(data))
+        if getattr(image, "is_animated", False):
+            return None  # Animated GIF/WebP - resizing would drop the animation
+        image = ImageOps.exif_transpose(image)
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+        width, height = image.size
+        largest = min(width, WIDTHS[-1])
+        widths = [w for w in WIDTHS if w < largest] + [largest]
+        meta = {"key": key, "width": widths[-1], "height": round(height * widths[-1] / width),
+                "widths": widths, "formats": []}
+
+        # Encode into a temp folder and rename, so concurrent builds never see half an entry
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=entry.parent, prefix=".tmp-"))
+        try:
+            for w in widths:
+                resized = image if w == width else image.resize(
+                    (w, max(1, round(height * w / width))), Image.Resampling.LANCZOS)
+                for extension, pil_format, _, options in self.formats:
+                    resized.save(staging / f"{w}{extension}", pil_format, **options)
+            meta["formats"] = [extension for extension, *_ in self.formats]
+            (staging / "meta.json").write_text(json.dumps(meta))
+            try:
+                if entry.exists():
+                    shutil.rmtree(entry)  # Encoded before AVIF support was installed
+                os.rename(staging, entry)
+            except OSError:
+                pass  # Another build encoded the same image first
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return meta
+
+    def optimize(self, reference: str) -> Optional[Dict]:
+        """Manifest entry for one reference (None if it isn't a usable raster image)"""
+        try:
+            data = self.load_source(reference)
+            if not data:
+                return None
+            meta = self.encode(data)
+        except Exception as e:
+            self.log(f"⚠️  Skipping image {reference}: {e}")
+            return None
+        if not meta:
+            return None
+
+        entry = self.entry_dir(meta["key"])
+        output = self.project_dir / OUTPUT_DIR
+        sources = []
+        for extension, _, mime, _ in self.formats:
+            if extension not in meta["formats"]:
+                continue
+            srcset = []
+            for w in meta["widths"]:
+                name = f"{meta['key'][:16]}-{w}{extension}"
+                target = output / name
+                if not target.exists():
+                    _link_or_copy(entry / f"{w}{extension}", target)
+                srcset.append(f"/{OUTPUT_DIR.name}/{name} {w}w")
+            sources.append({"type": mime, "srcset": ", ".join(srcset)})
+        if not sources:
+            return None
+
+        # <img src> fallback: the largest variant of the most compatible format
+        largest = sources[-1]["srcset"].split(", ")[-1].split(" ")[0]
+        return {"src": largest, "width": meta["width"], "height": meta["height"], "sources": sources}
+
+    def run(self) -> Dict[str, Dict]:
+        """Optimize all referenced images and write the manifest; returns it"""
+        if not self.formats:
+            self.log("⚠️  Pillow not installed (or without WebP) - images are used as they are")
+            return {}
+
+        references = self.find_references()
+        (self.project_dir / OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            results = list(pool.map(self.optimize, references))
+        manifest = {reference: entry for reference, entry in zip(references, results) if entry}
+
+        # Drop variants of images the project no longer uses
+        used = {source.split(" ")[0].rsplit("/", 1)[-1] for entry in manifest.values()
+                for variant in entry["sources"] for source in variant["srcset"].split(", ")}
+        for path in (self.project_dir / OUTPUT_DIR).iterdir():
+            if path.name not in used:
+                path.unlink()
+
+        # Only rewrite on change - an unchanged manifest keeps the build cache fresh
+        path = self.project_dir / MANIFEST_PATH
+        text = json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+        if not path.exists() or path.read_text() != text:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text)
+        self.log(f"🖼️  {len(manifest)} of {len(references)} images optimized "
+                 f"({', '.join(mime.split('/')[1] for _, _, mime, _ in self.formats)})")
+        return manifest
+
+
+def cache_stats(root: Path = IMAGE_CACHE_DIR) -> Dict[str, int]:
+    if not root.exists():
+        return {"images": 0, "bytes": 0}
+    return {"images": len(list(root.glob("*/*/meta.json"))),
+            "bytes": sum(path.stat().st_size for path in root.rglob("*") if path.is_file())}
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ("optimize", "stats", "clear"):
+        print(__doc__)
+        sys.exit(1)
+
+    command = sys.argv[1]
+    if command == "optimize":
+        if len(sys.argv) != 3 or not Path(sys.argv[2]).is_dir():
+            print("Usage: python3 image_pipeline.py optimize <project_dir>")
+            sys.exit(1)
+        ImagePipeline(Path(sys.argv[2])).run()
+    elif command == "stats":
+        stats = cache_stats()
+        print(f"{stats['images']} encoded images, {stats['bytes'] / 1024 / 1024:.1f} MB ({IMAGE_CACHE_DIR})")
+    else:
+        shutil.rmtree(IMAGE_CACHE_DIR, ignore_errors=True)
+        print("Image cache cleared")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Demo Website Builder - Log View
+Build log widget for chatty workers: messages are queued and written to the
+widget a few times per second in one batch, the widget and the in-memory
+history are bounded, and every build's full log goes to its own file in
+~/.cache/demo-builder/logs/. Filter by build and by severity.
+"""
+
+import os
+import re
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, TextIO, Tuple
+
+from PyQt6.QtCore import QTimer, QUrl
+from PyQt6.QtGui import QDesktopServices
+from PyQt6.QtWidgets import QComboBox, QHBoxLayout, QLabel, QPlainTextEdit, QPushButton, QVBoxLayout, QWidget
+
+CACHE_DIR = Path(os.environ.get("DEMO_BUILDER_CACHE", Path.home() / ".cache" / "demo-builder"))
+LOG_DIR = CACHE_DIR / "logs"
+FLUSH_INTERVAL_MS = 100  # Widget updates per second: 10
+MAX_BLOCKS = 5000  # Lines kept in the widget
+MAX_HISTORY = 50000  # Lines kept in memory for re-filtering
+MAX_LOG_FILES = 200
+MAX_OPEN_FILES = 8  # Log files kept open; older builds' files are reopened on demand
+
+INFO, WARNING, ERROR = 0, 1, 2
+SEVERITY_FILTERS = [("All messages", INFO), ("Warnings and errors", WARNING), ("Errors only", ERROR)]
+
+ERROR_PATTERN = re.compile(r"❌|\berror\b|\bfailed\b|traceback|exception|npm err!", re.IGNORECASE)
+WARNING_PATTERN = re.compile(r"⚠️|\bwarn(ing)?\b|deprecated", re.IGNORECASE)
+
+# (time, source, severity, text)
+Entry = Tuple[float, Optional[str], int, str]
+
+
+def severity(text: str) -> int:
+    if ERROR_PATTERN.search(text):
+        return ERROR
+    if WARNING_PATTERN.search(text):
+        return WARNING
+    return INFO
+
+
+def prune_logs(keep: int = MAX_LOG_FILES):
+    """Delete all but the newest log files"""
+    if LOG_DIR.exists():
+        for path in sorted(LOG_DIR.glob("*.log"), reverse=True)[keep:]:
+            path.unlink(missing_ok=True)
+
+
+class LogView(QWidget):
+    """Drop-in for the builders' read-only QTextEdit log (append)"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pending: List[Entry] = []
+        self.history: Deque[Entry] = deque(maxlen=MAX_HISTORY)
+        self.files: Dict[str, TextIO] = OrderedDict()  # LRU of open log files
+        self.paths: Dict[str, Path] = {}
+        self.session = datetime.now().strftime("%Y%m%d-%H%M%S")
+
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setMaximumBlockCount(MAX_BLOCKS)
+        self.text.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+
+        self.source_filter = QComboBox()
+        self.source_filter.addItem("All builds", None)
+        self.source_filter.currentIndexChanged.connect(self.refilter)
+        self.severity_filter = QComboBox()
+        for label, level in SEVERITY_FILTERS:
+            self.severity_filter.addItem(label, level)
+        self.severity_filter.currentIndexChanged.connect(self.refilter)
+        self.open_button = QPushButton("Full Log")
+        self.open_button.clicked.connect(self.open_full_log)
+
+        filters = QHBoxLayout()
+        filters.addWidget(QLabel("Build Log:"))
+        filters.addStretch()
+        filters.addWidget(self.source_filter)
+        filters.addWidget(self.severity_filter)
+        filters.addWidget(self.open_button)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(filters)
+        layout.addWidget(self.text)
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.timeout.connect(self.flush)
+        self.flush_timer.start(FLUSH_INTERVAL_MS)
+        prune_logs()
+
+    def append(self, message: str, source: Optional[str] = None, title: Optional[str] = None):
+        """Queue a message; source tags it ("#3", "deploy #1"), title names its build in the filter"""
+        if source is not None and source not in self.paths:
+            self.add_source(source, title or source)
+        self.pending.append((time.time(), source, severity(message), message))
+
+    def add_source(self, source: str, title: str):
+        slug = re.sub(r"[^\w.-]+", "-", title).strip("-")
+        self.paths[source] = LOG_DIR / f"{self.session}-{slug}.log"
+        self.source_filter.addItem(title, source)
+
+    def format(self, entry: Entry) -> str:
+        return f"[{entry[1]}] {entry[3]}" if entry[1] else entry[3]
+
+    def matches(self, entry: Entry) -> bool:
+        source = self.source_filter.currentData()
+        return (source is None or entry[1] == source) and entry[2] >= self.severity_filter.currentData()
+
+    def flush(self):
+        """Write queued messages to the widget and the log files in one go"""
+        if not self.pending:
+            return
+        entries, self.pending = self.pending, []
+        self.history.extend(entries)
+        self.spill(entries)
+
+        lines = [self.format(entry) for entry in entries if self.matches(entry)]
+        if not lines:
+            return
+        scrollbar = self.text.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+        self.text.appendPlainText("\n".join(lines))
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def spill(self, entries: List[Entry]):
+        """Full log per build - the widget and history only keep the most recent lines"""
+        touched = set()
+        for logged_at, source, _, message in entries:
+            key = source or ""
+            if key not in self.files:
+                path = self.paths.get(source) or LOG_DIR / f"{self.session}-app.log"
+                self.paths.setdefault(key, path)
+                try:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    self.files[key] = open(path, "a", encoding="utf-8")
+                except OSError:
+                    continue
+                # A long session queues many builds - don't hold a descriptor for each
+                while len(self.files) > MAX_OPEN_FILES:
+                    oldest, f = self.files.popitem(last=False)
+                    f.close()
+                    touched.discard(oldest)
+            self.files.move_to_end(key)
+            stamp = datetime.fromtimestamp(logged_at).strftime("%H:%M:%S")
+            self.files[key].write(f"{stamp} {message}\n")
+            touched.add(key)
+        for key in touched:
+            self.files[key].flush()
+
+    def refilter(self):
+        self.flush()
+        lines = [self.format(entry) for entry in self.history if self.matches(entry)]
+        self.text.setPlainText("\n".join(lines[-MAX_BLOCKS:]))
+        self.text.verticalScrollBar().setValue(self.text.verticalScrollBar().maximum())
+
+    def open_full_log(self):
+        """Open the selected build's log file (or the log folder)"""
+        self.flush()
+        path = self.paths.get(self.source_filter.currentData() or "")
+        if not path or not path.exists():
+            LOG_DIR.mkdir(parents=True, exist_ok=True)
+            path = LOG_DIR
+        QDesktopServices.openUrl(QUrl.fromLocalFile(str(path)))
+
+    def close_files(self):
+        self.flush()
+        for f in self.files.values():
+            f.close()
+        self.files.clear()
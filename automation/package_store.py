@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Demo Website Builder - Shared Package Store
+Content-addressed store for node_modules files (pnpm-style): every unique
+file is kept once and hardlinked into each demo's node_modules.
+
+Usage:
+    python3 package_store.py link <project-dir> [...]   # dedupe projects into the store
+    python3 package_store.py link-all                   # every demo project
+    python3 package_store.py gc                         # drop files no project uses
+    python3 package_store.py stats
+"""
+
+import hashlib
+import os
+import shutil
+import stat
+import sys
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+DEMOS_DIR = Path(__file__).parent.parent / "demos"
+CACHE_DIR = Path(os.environ.get("DEMO_BUILDER_CACHE", Path.home() / ".cache" / "demo-builder"))
+STORE_DIR = CACHE_DIR / "store" / "v1"
+PROJECT_DIRS = [DEMOS_DIR, Path(__file__).parent / "demos"]
+SKIP_DIRS = {".astro", ".vite", ".cache"}  # Build caches, not packages
+# npm rewrites these in place (not replace-by-rename), so a shared link would
+# change the scaffold and every sibling project - each project keeps its own copy
+PRIVATE_FILES = {".package-lock.json"}
+CHUNK = 1024 * 1024
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LinkReport:
+    """What link_tree did"""
+
+    def __init__(self):
+        self.files = 0
+        self.linked = 0  # Replaced by a link to an existing store entry
+        self.added = 0  # New to the store
+        self.bytes_saved = 0
+        self.skipped = 0  # Other filesystem, unreadable ...
+
+    def __str__(self):
+        return (f"{self.files} files: {self.linked} deduplicated, {self.added} added to store, "
+                f"{self.bytes_saved / 1024 / 1024:.1f} MB saved")
+
+
+class PackageStore:
+    """Hardlink farm keyed by sha256 (+ executable bit)"""
+
+    def __init__(self, root: Path = STORE_DIR, log: Optional[Callable[[str], None]] = None):
+        self.root = Path(root)
+        self.log = log or (lambda message: None)
+
+    def entry_path(self, digest: str, executable: bool) -> Path:
+        name = digest[2:] + ("-exec" if executable else "")
+        return self.root / digest[:2] / name
+
+    def link_tree(self, node_modules: Path) -> LinkReport:
+        """Move every regular file under node_modules into the store and link it back"""
+        report = LinkReport()
+        if not Path(node_modules).is_dir():
+            return report
+        self.root.mkdir(parents=True, exist_ok=True)
+        store_dev = os.stat(self.root).st_dev
+
+        for path in self._walk(Path(node_modules)):
+            report.files += 1
+            try:
+                info = path.lstat()
+                if path.name in PRIVATE_FILES:
+                    if info.st_nlink > 1:
+                        self._unshare(path)  # Linked by an older version
+                    continue
+                if info.st_dev != store_dev:
+                    report.skipped += 1
+                    continue
+                if info.st_nlink > 1:
+                    continue  # Cloned from the scaffold or linked on an earlier run
+                executable = bool(info.st_mode & stat.S_IXUSR)
+                digest = file_digest(path)
+                entry = self.entry_path(digest, executable)
+
+                if entry.exists():
+                    self._replace_with_link(entry, path)
+                    report.linked += 1
+                    report.bytes_saved += info.st_size
+                else:
+                    entry.parent.mkdir(exist_ok=True)
+                    try:
+                        os.link(path, entry)
+                        report.added += 1
+                    except FileExistsError:
+                        # Another build stored the same content meanwhile
+                        self._replace_with_link(entry, path)
+                        report.linked += 1
+            except OSError:
+                report.skipped += 1
+        return report
+
+    def link_project(self, project_dir: Path) -> LinkReport:
+        report = self.link_tree(Path(project_dir) / "node_modules")
+        if report.files:
+            self.log(f"📦 node_modules of {Path(project_dir).name}: {report}")
+        return report
+
+    def gc(self) -> int:
+        """Delete store entries no project links to anymore; returns bytes freed"""
+        freed = 0
+        if not self.root.exists():
+            return freed
+        for bucket in self.root.iterdir():
+            if not bucket.is_dir():
+                continue
+            for entry in bucket.iterdir():
+                info = entry.stat()
+                if info.st_nlink == 1:
+                    freed += info.st_size
+                    entry.unlink()
+            if not any(bucket.iterdir()):
+                bucket.rmdir()
+        return freed
+
+    def stats(self) -> Dict[str, int]:
+        entries = 0
+        size = 0
+        links = 0
+        if self.root.exists():
+            for entry in self.root.glob("*/*"):
+                info = entry.stat()
+                entries += 1
+                size += info.st_size
+                links += info.st_nlink - 1
+        return {"entries": entries, "bytes": size, "links": links}
+
+    def _walk(self, root: Path) -> Iterable[Path]:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            for filename in filenames:
+                path = Path(dirpath) / filename
+                if not path.is_symlink():
+                    yield path
+
+    def _unshare(self, path: Path):
+        """Atomically swap a hardlinked file for a private copy"""
+        temp = path.with_name(f".{path.name}.store-tmp")
+        shutil.copy2(path, temp)
+        os.replace(temp, path)
+
+    def _replace_with_link(self, entry: Path, path: Path):
+        """Atomically swap path for a hardlink to entry"""
+        temp = path.with_name(f".{path.name}.store-tmp")
+        if temp.exists():
+            temp.unlink()
+        os.link(entry, temp)
+        os.replace(temp, path)
+
+
+def all_projects() -> List[Path]:
+    projects = []
+    for root in PROJECT_DIRS:
+        if root.is_dir():
+            projects.extend(d for d in sorted(root.iterdir()) if (d / "node_modules").is_dir())
+    return projects
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ("link", "link-all", "gc", "stats"):
+        print(__doc__)
+        sys.exit(1)
+
+    store = PackageStore(log=print)
+    command = sys.argv[1]
+    if command in ("link", "link-all"):
+        projects = [Path(p) for p in sys.argv[2:]] if command == "link" else all_projects()
+        for project in projects:
+            store.link_project(project)
+    elif command == "gc":
+        print(f"Freed {store.gc() / 1024 / 1024:.1f} MB")
+    stats = store.stats()
+    print(f"Store: {stats['entries']} unique files, {stats['bytes'] / 1024 / 1024:.1f} MB, "
+          f"{stats['links']} project links ({store.root})")
+
+
+if __name__ == "__main__":
+    main()
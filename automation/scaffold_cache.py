@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Demo Website Builder - Scaffold Cache
+Keeps one pre-installed, version-pinned Astro + Tailwind project and copies
+new demos from it instead of running npm create / npm install every time.
+
+Usage:
+    python3 scaffold_cache.py create <project-name>   # new demo in demos/
+    python3 scaffold_cache.py warm                    # build the scaffold now
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable, Optional
+
+from package_store import PRIVATE_FILES, SKIP_DIRS, PackageStore
+
+DEMOS_DIR = Path(__file__).parent.parent / "demos"
+TEMPLATE_DIR = DEMOS_DIR / "template"
+CACHE_DIR = Path(os.environ.get("DEMO_BUILDER_CACHE", Path.home() / ".cache" / "demo-builder"))
+SCAFFOLD_ROOT = CACHE_DIR / "scaffold"
+COMPLETE_MARKER = ".scaffold-complete"
+
+# Exact versions - bump here to roll out a new scaffold
+PINNED_DEPENDENCIES = {
+    "@tailwindcss/vite": "4.1.17",
+    "astro": "5.15.7",
+    "tailwindcss": "4.1.17",
+}
+
+ASTRO_CONFIG = """// @ts-check
+import { defineConfig } from 'astro/config';
+
+import tailwindcss from '@tailwindcss/vite';
+
+// https://astro.build/config
+export default defineConfig({
+  // Persistent per-project build cache when deploying (see build_cache.py)
+  cacheDir: process.env.ASTRO_CACHE_DIR || './node_modules/.astro',
+  vite: {
+    plugins: [tailwindcss()]
+  }
+});
+"""
+
+TSCONFIG = """{
+  "extends": "astro/tsconfigs/strict",
+  "include": [".astro/types.d.ts", "**/*"],
+  "exclude": ["dist"]
+}
+"""
+
+GITIGNORE = """# build output
+dist/
+# generated types
+.astro/
+
+# dependencies
+node_modules/
+
+# logs
+npm-debug.log*
+
+# environment variables
+.env
+.env.production
+
+# macOS-specific files
+.DS_Store
+.vercel
+"""
+
+GLOBAL_CSS = '@import "tailwindcss";\n'
+
+TEMPLATE_SUBDIRS = ["components", "layouts", "lib", "pages"]
+
+
+def package_json(name: str) -> dict:
+    return {
+        "name": name,
+        "type": "module",
+        "version": "0.0.1",
+        "scripts": {
+            "dev": "astro dev",
+            "build": "astro build",
+            "preview": "astro preview",
+            "astro": "astro"
+        },
+        "dependencies": dict(PINNED_DEPENDENCIES)
+    }
+
+
+def scaffold_key() -> str:
+    """Scaffold version: changes whenever pinned deps or config files change"""
+    digest = hashlib.sha256()
+    for part in (json.dumps(PINNED_DEPENDENCIES, sort_keys=True), ASTRO_CONFIG, TSCONFIG):
+        digest.update(part.encode())
+    return digest.hexdigest()[:12]
+
+
+def _link_or_copy(src: str, dst: str):
+    """Hardlink when possible (same filesystem), copy otherwise"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def clone_tree(src: Path, dst: Path):
+    """Copy a directory tree as cheaply as the platform allows.
+
+    macOS/APFS: copy-on-write clones (cp -c). Elsewhere: hardlinks into the
+    shared package store; npm replaces package files instead of editing them.
+    Files it does edit in place (node_modules/.package-lock.json) and build
+    caches are copied.
+    """
+    if sys.platform == "darwin":
+        result = subprocess.run(["cp", "-cR", str(src), str(dst)], capture_output=True)
+        if result.returncode == 0:
+            return
+        shutil.rmtree(dst, ignore_errors=True)
+
+    def copy(source: str, target: str):
+        relative = Path(source).relative_to(src)
+        if relative.name in PRIVATE_FILES or SKIP_DIRS.intersection(relative.parts):
+            shutil.copy2(source, target)  # Rewritten in place by npm/vite - must not be shared
+        else:
+            _link_or_copy(source, target)
+
+    shutil.copytree(src, dst, symlinks=True, copy_function=copy)
+
+
+class ScaffoldCache:
+    """Builds the scaffold once per version and materializes projects from it"""
+
+    def __init__(self, root: Path = SCAFFOLD_ROOT, log: Optional[Callable[[str], None]] = None):
+        self.root = Path(root)
+        self.log = log or print
+
+    @property
+    def scaffold_dir(self) -> Path:
+        return self.root / scaffold_key()
+
+    def is_ready(self) -> bool:
+        return (self.scaffold_dir / COMPLETE_MARKER).exists()
+
+    def ensure(self) -> Path:
+        """Return the scaffold directory, building it on first use"""
+        if self.is_ready():
+            return self.scaffold_dir
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Parallel builds (threads or processes) wait for the first one
+        with open(self.root / ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if not self.is_ready():
+                self._build()
+        return self.scaffold_dir
+
+    def _build(self):
+        self.log(f"Building project scaffold (astro {PINNED_DEPENDENCIES['astro']}) - only needed once")
+        staging = Path(tempfile.mkdtemp(prefix="scaffold-", dir=self.root))
+        try:
+            (staging / "package.json").write_text(json.dumps(package_json("scaffold"), indent=2) + "\n")
+            (staging / "astro.config.mjs").write_text(ASTRO_CONFIG)
+            (staging / "tsconfig.json").write_text(TSCONFIG)
+            (staging / ".gitignore").write_text(GITIGNORE)
+
+            result = subprocess.run(
+                ["npm", "install", "--no-audit", "--no-fund"],
+                cwd=staging,
+                capture_output=True,
+                text=True
+            )
+            if result.returncode != 0:
+                raise RuntimeError(f"npm install failed:\n{(result.stdout + result.stderr)[-2000:]}")
+
+            # Scaffold files live in the shared store, projects link to the same inodes
+            report = PackageStore().link_tree(staging / "node_modules")
+            self.log(f"Scaffold node_modules: {report}")
+
+            (staging / COMPLETE_MARKER).write_text(scaffold_key())
+            shutil.rmtree(self.scaffold_dir, ignore_errors=True)
+            os.rename(staging, self.scaffold_dir)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def materialize(self, project_dir: Path) -> Path:
+        """Create a ready-to-run demo project (template components + node_modules)"""
+        project_dir = Path(project_dir)
+        if project_dir.exists():
+            raise FileExistsError(f"{project_dir} already exists")
+
+        scaffold = self.ensure()
+        project_dir.parent.mkdir(parents=True, exist_ok=True)
+        name = project_dir.name
+        # Build next to the target and rename, so a failure never leaves a half-built project
+        staging = Path(tempfile.mkdtemp(prefix=f".{name}-", dir=project_dir.parent))
+        try:
+            for filename in ("astro.config.mjs", "tsconfig.json", ".gitignore"):
+                shutil.copy2(scaffold / filename, staging / filename)
+            (staging / "package.json").write_text(json.dumps(package_json(name), indent=2) + "\n")
+
+            lock = json.loads((scaffold / "package-lock.json").read_text())
+            lock["name"] = name
+            if "" in lock.get("packages", {}):
+                lock["packages"][""]["name"] = name
+            (staging / "package-lock.json").write_text(json.dumps(lock, indent=2) + "\n")
+
+            clone_tree(scaffold / "node_modules", staging / "node_modules")
+
+            # Template is copied fresh so component edits show up immediately
+            for subdir in TEMPLATE_SUBDIRS:
+                shutil.copytree(TEMPLATE_DIR / "src" / subdir, staging / "src" / subdir)
+            (staging / "src" / "styles").mkdir(parents=True, exist_ok=True)
+            (staging / "src" / "styles" / "global.css").write_text(GLOBAL_CSS)
+            (staging / "public").mkdir(exist_ok=True)
+            staging.chmod(0o755)  # mkdtemp creates it 0700
+
+            os.replace(staging, project_dir)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        return project_dir
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ("create", "warm"):
+        print(__doc__)
+        sys.exit(1)
+
+    cache = ScaffoldCache()
+    if sys.argv[1] == "warm":
+        print(f"Scaffold ready: {cache.ensure()}")
+        return
+
+    if len(sys.argv) != 3:
+        print("Usage: python3 scaffold_cache.py create <project-name>")
+        sys.exit(1)
+    try:
+        project_dir = cache.materialize(DEMOS_DIR / sys.argv[2])
+    except (FileExistsError, RuntimeError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Created {project_dir} (template components copied, dependencies installed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Demo Website Builder - Original Site Cache
+HTTP cache for pages, stylesheets and images of the original websites.
+Entries are revalidated with ETag / Last-Modified, so rebuilds and change
+requests only download what changed. Size-bounded, least recently used
+entries are evicted first.
+
+Usage:
+    python3 site_cache.py fetch <url> [--save-to <file>]   # print text or save an asset
+    python3 site_cache.py stats
+    python3 site_cache.py clear
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, Optional
+
+CACHE_DIR = Path(os.environ.get("DEMO_BUILDER_CACHE", Path.home() / ".cache" / "demo-builder"))
+SITE_CACHE_DIR = CACHE_DIR / "sites"
+MAX_CACHE_BYTES = 500 * 1024 * 1024
+MAX_RESPONSE_BYTES = 25 * 1024 * 1024
+FRESH_SECONDS = 10 * 60  # Reuse without asking the server when it sent no max-age
+REQUEST_TIMEOUT = 20
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) DemoWebsiteBuilder/1.0"
+MAX_TEXT_CHARS = 30000  # fetch_url tool output
+
+MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class CachedResponse:
+    """Body and headers of one URL, from the network or the cache"""
+
+    def __init__(self, url: str, status: int, headers: Dict[str, str], body: bytes, source: str):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.source = source  # "network", "revalidated" (304), "cache" or "stale" (server unreachable)
+
+    @property
+    def content_type(self) -> str:
+        return self.headers.get("content-type", "application/octet-stream").split(";")[0].strip()
+
+    @property
+    def is_text(self) -> bool:
+        kind = self.content_type
+        return kind.startswith("text/") or kind in ("application/json", "application/javascript",
+                                                    "application/xml", "image/svg+xml")
+
+    def text(self) -> str:
+        match = re.search(r"charset=([\w-]+)", self.headers.get("content-type", ""))
+        try:
+            return self.body.decode(match.group(1) if match else "utf-8", errors="replace")
+        except LookupError:
+            return self.body.decode("utf-8", errors="replace")
+
+
+class SiteCache:
+    """URL -> body + metadata on disk, shared by all builds (thread-safe)"""
+
+    def __init__(self, root: Path = SITE_CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.total_bytes: Optional[int] = None  # Scanned on first store
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode()).hexdigest()
+        bucket = self.root / key[:2]
+        return bucket / f"{key}.body", bucket / f"{key}.json"
+
+    def _load(self, url: str):
+        body_path, meta_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text())
+            return meta, body_path.read_bytes()
+        except (OSError, ValueError):
+            return None, None
+
+    def _store(self, url: str, meta: dict, body: Optional[bytes] = None):
+        body_path, meta_path = self._paths(url)
+        body_path.parent.mkdir(parents=True, exist_ok=True)
+        if body is not None:
+            temp = body_path.with_suffix(".tmp")
+            temp.write_bytes(body)
+            os.replace(temp, body_path)
+        temp = meta_path.with_suffix(".jsontmp")
+        temp.write_text(json.dumps(meta))
+        os.replace(temp, meta_path)
+
+    def _is_fresh(self, meta: dict) -> bool:
+        cache_control = meta["headers"].get("cache-control", "")
+        if "no-cache" in cache_control or "no-store" in cache_control:
+            return False
+        match = MAX_AGE.search(cache_control)
+        lifetime = int(match.group(1)) if match else FRESH_SECONDS
+        return time.time() - meta["fetched_at"] < lifetime
+
+    def fetch(self, url: str, revalidate: bool = False) -> CachedResponse:
+        """GET url through the cache (revalidate=True always asks the server)"""
+        meta, body = self._load(url)
+        if meta and not revalidate and self._is_fresh(meta):
+            self._touch(url, meta)
+            return CachedResponse(url, meta["status"], meta["headers"], body, "cache")
+
+        request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT, "Accept": "*/*"})
+        if meta:
+            if meta["headers"].get("etag"):
+                request.add_header("If-None-Match", meta["headers"]["etag"])
+            if meta["headers"].get("last-modified"):
+                request.add_header("If-Modified-Since", meta["headers"]["last-modified"])
+
+        try:
+            with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+                new_body = response.read(MAX_RESPONSE_BYTES + 1)
+                if len(new_body) > MAX_RESPONSE_BYTES:
+                    raise ValueError(f"{url} is larger than {MAX_RESPONSE_BYTES // 1024 // 1024} MB")
+                headers = {key.lower(): value for key, value in response.headers.items()}
+                status = response.status
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and meta:
+                # Unchanged - keep body, take the new validators/max-age
+                meta["headers"].update({key.lower(): value for key, value in e.headers.items()
+                                        if key.lower() in ("etag", "last-modified", "cache-control", "expires")})
+                meta["fetched_at"] = time.time()
+                self._touch(url, meta)
+                return CachedResponse(url, meta["status"], meta["headers"], body, "revalidated")
+            if meta and (e.code >= 500 or e.code == 429):
+                # Server trouble or rate limiting - the copy we have beats no page
+                return CachedResponse(url, meta["status"], meta["headers"], body, "stale")
+            raise
+        except (urllib.error.URLError, OSError):
+            if meta:
+                return CachedResponse(url, meta["status"], meta["headers"], body, "stale")
+            raise
+
+        now = time.time()
+        old_size = meta["size"] if meta else 0
+        meta = {"url": url, "status": status, "headers": headers, "size": len(new_body),
+                "fetched_at": now, "accessed_at": now}
+        if "no-store" not in headers.get("cache-control", ""):
+            with self.lock:
+                if self.total_bytes is None:
+                    self.total_bytes = sum(size for _, size, _ in self._entries())
+                self._store(url, meta, new_body)
+                self.total_bytes += len(new_body) - old_size
+                if self.total_bytes > self.max_bytes:
+                    self.evict()
+        return CachedResponse(url, status, headers, new_body, "network")
+
+    def _touch(self, url: str, meta: dict):
+        meta["accessed_at"] = time.time()
+        with self.lock:
+            self._store(url, meta)
+
+    def _entries(self):
+        if not self.root.exists():
+            return []
+        entries = []
+        for meta_path in self.root.glob("*/*.json"):
+            try:
+                meta = json.loads(meta_path.read_text())
+            except (OSError, ValueError):
+                continue
+            entries.append((meta.get("accessed_at", 0), meta.get("size", 0), meta_path))
+        return entries
+
+    def evict(self) -> int:
+        """Drop least recently used entries until the cache fits; returns bytes freed"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        freed = 0
+        for _, size, meta_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            meta_path.with_suffix(".body").unlink(missing_ok=True)
+            meta_path.unlink(missing_ok=True)
+            total -= size
+            freed += size
+        self.total_bytes = total
+        return freed
+
+    def stats(self) -> Dict[str, int]:
+        entries = self._entries()
+        return {"entries": len(entries), "bytes": sum(size for _, size, _ in entries)}
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+        self.total_bytes = None
+
+    def fetch_for_tool(self, url: str, save_to: Optional[str] = None) -> str:
+        """fetch_url tool: page text for Claude, or the asset written to save_to"""
+        response = self.fetch(url)
+        origin = {"network": "downloaded", "revalidated": "unchanged since last fetch",
+                  "cache": "from cache", "stale": "from cache, site unreachable"}[response.source]
+
+        if save_to:
+            path = Path(save_to)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(response.body)
+            return f"Saved {url} ({response.content_type}, {len(response.body) // 1024} KB, {origin}) to {path}"
+
+        if not response.is_text:
+            return (f"{url} is {response.content_type} ({len(response.body) // 1024} KB, {origin}). "
+                    f"Pass save_to to store it in the project, e.g. public/images/...")
+        text = response.text()
+        note = ""
+        if len(text) > MAX_TEXT_CHARS:
+            note = f"\n... [{len(text) - MAX_TEXT_CHARS} more chars not shown]"
+            text = text[:MAX_TEXT_CHARS]
+        return f"[{response.status} {response.content_type}, {origin}]\n{text}{note}"
+
+
+site_cache = SiteCache()
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ("fetch", "stats", "clear"):
+        print(__doc__)
+        sys.exit(1)
+
+    command = sys.argv[1]
+    if command == "fetch":
+        if len(sys.argv) not in (3, 5) or (len(sys.argv) == 5 and sys.argv[3] != "--save-to"):
+            print("Usage: python3 site_cache.py fetch <url> [--save-to <file>]")
+            sys.exit(1)
+        try:
+            print(site_cache.fetch_for_tool(sys.argv[2], sys.argv[4] if len(sys.argv) == 5 else None))
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            print(f"Error fetching {sys.argv[2]}: {e}")
+            sys.exit(1)
+    elif command == "stats":
+        stats = site_cache.stats()
+        print(f"{stats['entries']} cached URLs, {stats['bytes'] / 1024 / 1024:.1f} MB ({site_cache.root})")
+    else:
+        site_cache.clear()
+        print("Site cache cleared")
+
+
+if __name__ == "__main__":
+    main()
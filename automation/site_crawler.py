@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Demo Website Builder - Site Crawler
+Crawls the original website before the Claude loop starts and extracts a
+fact sheet (pages, logo, colors, phone, email, address, opening hours,
+images), so Claude doesn't have to discover them one tool call at a time.
+Pages come through the site cache; robots.txt is respected.
+
+Usage:
+    python3 site_crawler.py <url>          # print the fact sheet
+    python3 site_crawler.py <url> --json
+"""
+
+import json
+import re
+import sys
+import threading
+import time
+import urllib.error
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import urldefrag, urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+
+from site_cache import USER_AGENT, site_cache
+
+MAX_DEPTH = 2
+MAX_PAGES = 20
+MAX_STYLESHEETS = 4
+MAX_WORKERS = 8
+MAX_PER_HOST = 4  # Concurrent requests to one server
+CRAWL_TIMEOUT = 45  # Seconds for the whole crawl
+
+SKIP_EXTENSIONS = (".pdf", ".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg", ".zip", ".doc", ".docx",
+                   ".xls", ".xlsx", ".mp4", ".mp3", ".ics", ".vcf", ".xml", ".css", ".js")
+
+HEX_COLOR = re.compile(r"#(?:[0-9a-fA-F]{6}|[0-9a-fA-F]{3})\b")
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE = re.compile(r"(?:\+|00)\d{2}[\s\d/().-]{7,16}\d|\b0\d{2,3}[\s/.-]?\d{3}[\s.-]?\d{2}[\s.-]?\d{2}\b")
+STREET = re.compile(
+    r"[A-ZÄÖÜ][\wäöüßéè.-]*(?:strasse|straße|str\.|weg|gasse|platz|allee|ring|rain|halde)\s*\d+\w?"
+    r"[,\s]+(?:CH-|D-|A-)?\d{4,5}\s+[A-ZÄÖÜ][\wäöüéè-]+", re.IGNORECASE)
+DAY = r"(?:Mo|Di|Mi|Do|Fr|Sa|So|Mon|Tue|Wed|Thu|Fri|Sat|Sun)[a-z]*\.?"
+HOURS = re.compile(DAY + r"(?:\s*[-–,]\s*" + DAY + r")*[:\s]+\d{1,2}[:.]\d{2}\s*[-–]\s*\d{1,2}[:.]\d{2}"
+                   r"(?:\s*(?:,|und|/)\s*\d{1,2}[:.]\d{2}\s*[-–]\s*\d{1,2}[:.]\d{2})?")
+
+
+class PageParser(HTMLParser):
+    """Collects links, images, text and inline styles of one HTML page"""
+
+    def __init__(self, base_url: str):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.title = ""
+        self.links: List[Tuple[str, str]] = []  # (absolute url, link text)
+        self.nav_links: List[Tuple[str, str]] = []
+        self.images: List[Tuple[str, str]] = []  # (absolute url, alt/class hints)
+        self.stylesheets: List[str] = []
+        self.styles: List[str] = []
+        self.json_ld: List[str] = []
+        self.meta: Dict[str, str] = {}
+        self.text: List[str] = []
+        self._in_nav = 0
+        self._link: Optional[List] = None
+        self._capture: Optional[str] = None  # "title", "style", "json-ld", "discard"
+        self._buffer: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {key: value or "" for key, value in attrs}
+        if tag in ("nav", "header"):
+            self._in_nav += 1
+        if tag == "a" and attrs.get("href"):
+            self._link = [urljoin(self.base_url, attrs["href"]), ""]
+        elif tag == "img":
+            src = attrs.get("src") or attrs.get("data-src") or ""
+            if src and not src.startswith("data:"):
+                hints = " ".join((attrs.get("alt", ""), attrs.get("class", ""), attrs.get("id", ""), src))
+                self.images.append((urljoin(self.base_url, src), hints.lower()))
+        elif tag == "link":
+            rel = attrs.get("rel", "").lower()
+            if "stylesheet" in rel and attrs.get("href"):
+                self.stylesheets.append(urljoin(self.base_url, attrs["href"]))
+            elif "icon" in rel and attrs.get("href"):
+                self.meta.setdefault("icon", urljoin(self.base_url, attrs["href"]))
+        elif tag == "meta":
+            key = (attrs.get("name") or attrs.get("property") or "").lower()
+            if key in ("theme-color", "og:image", "description", "og:site_name"):
+                value = attrs.get("content", "")
+                self.meta[key] = urljoin(self.base_url, value) if key == "og:image" else value
+        elif tag in ("title", "style"):
+            self._capture = tag
+            self._buffer = []
+        elif tag in ("script", "noscript"):
+            # Inline JS and tracking snippets would feed junk into the phone/email/hours regexes
+            is_json_ld = tag == "script" and attrs.get("type") == "application/ld+json"
+            self._capture = "json-ld" if is_json_ld else "discard"
+            self._buffer = []
+        if attrs.get("style"):
+            self.styles.append(attrs["style"])
+        if tag in ("br", "p", "div", "li", "tr", "td", "h1", "h2", "h3", "h4"):
+            self.text.append("\n")
+        elif tag in ("a", "span", "strong", "b", "em"):
+            self.text.append(" ")  # Keep "Zürich<a>Mail</a>" from becoming one word
+
+    def handle_endtag(self, tag):
+        if tag in ("nav", "header") and self._in_nav:
+            self._in_nav -= 1
+        if tag == "a" and self._link:
+            url, text = self._link[0], " ".join(self._link[1].split())
+            self.links.append((url, text))
+            if self._in_nav:
+                self.nav_links.append((url, text))
+            self._link = None
+        elif self._capture and tag in ("title", "style", "script", "noscript"):
+            content = "".join(self._buffer)
+            if self._capture == "title":
+                self.title = " ".join(content.split())
+            elif self._capture == "style":
+                self.styles.append(content)
+            elif self._capture == "json-ld":
+                self.json_ld.append(content)
+            self._capture = None
+
+    def handle_data(self, data):
+        if self._capture:
+            self._buffer.append(data)
+            return
+        if self._link is not None:
+            self._link[1] += data
+        self.text.append(data)
+
+
+class FactSheet:
+    """What the crawler learned about a site"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.site_name = ""
+        self.description = ""
+        self.pages: List[Dict[str, str]] = []  # {"url", "title"}
+        self.navigation: List[Dict[str, str]] = []  # {"url", "label"}
+        self.logo_url: Optional[str] = None
+        self.colors: List[str] = []
+        self.phones: List[str] = []
+        self.emails: List[str] = []
+        self.addresses: List[str] = []
+        self.hours: List[str] = []
+        self.images: List[str] = []
+        self.skipped_by_robots = 0
+        self.duration = 0.0
+
+    def to_dict(self) -> Dict:
+        return {key: value for key, value in self.__dict__.items()}
+
+    def to_prompt(self) -> str:
+        """Compact text block for the first message"""
+        lines = [f"SITE FACTS (crawled {len(self.pages)} pages of {self.url} before you started - "
+                 f"check details on the site where needed):"]
+        if self.site_name:
+            lines.append(f"- Name: {self.site_name}")
+        if self.description:
+            lines.append(f"- Description: {self.description}")
+        if self.navigation:
+            lines.append("- Navigation: " + ", ".join(f"{item['label']} ({item['url']})" for item in self.navigation))
+        other_pages = [page for page in self.pages if page["url"] not in {item["url"] for item in self.navigation}]
+        if other_pages:
+            lines.append("- Other pages: " + ", ".join(f"{page['title'] or page['url']} ({page['url']})"
+                                                       for page in other_pages))
+        for label, values in (("Phone", self.phones), ("Email", self.emails), ("Address", self.addresses),
+                              ("Opening hours", self.hours), ("Brand colors (most used first)", self.colors)):
+            if values:
+                lines.append(f"- {label}: " + "; ".join(values))
+        if self.logo_url:
+            lines.append(f"- Logo: {self.logo_url}")
+        if self.images:
+            lines.append("- Images: " + ", ".join(self.images))
+        return "\n".join(lines)
+
+
+def _same_site(url: str, root_host: str) -> bool:
+    host = (urlparse(url).hostname or "").lower()
+    return host.removeprefix("www.") == root_host.removeprefix("www.")
+
+
+def _is_neutral(color: str) -> bool:
+    """White, black and grays say nothing about the brand"""
+    value = color[1:]
+    if len(value) == 3:
+        value = "".join(c * 2 for c in value)
+    r, g, b = (int(value[i:i + 2], 16) for i in (0, 2, 4))
+    return max(r, g, b) - min(r, g, b) < 24
+
+
+class SiteCrawler:
+    """Breadth-first crawl of one site, pages fetched concurrently"""
+
+    def __init__(self, max_depth: int = MAX_DEPTH, max_pages: int = MAX_PAGES,
+                 log: Optional[Callable[[str], None]] = None):
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.log = log or (lambda message: None)
+        self.host_slots: Dict[str, threading.Semaphore] = {}
+        self.lock = threading.Lock()
+        self.robots: Dict[str, Optional[RobotFileParser]] = {}
+
+    def _slot(self, url: str) -> threading.Semaphore:
+        host = urlparse(url).netloc
+        with self.lock:
+            return self.host_slots.setdefault(host, threading.Semaphore(MAX_PER_HOST))
+
+    def _get(self, url: str):
+        with self._slot(url):
+            return site_cache.fetch(url)
+
+    def allowed(self, url: str) -> bool:
+        parts = urlparse(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        with self.lock:
+            known = origin in self.robots
+        if not known:
+            parser = None
+            try:
+                response = self._get(f"{origin}/robots.txt")
+                if response.status == 200 and response.is_text:
+                    parser = RobotFileParser()
+                    parser.parse(response.text().splitlines())
+            except urllib.error.HTTPError as e:
+                if e.code in (401, 403):
+                    # robots.txt behind auth means "keep out", only 404/410 means there is none
+                    parser = RobotFileParser()
+                    parser.disallow_all = True
+            except (urllib.error.URLError, OSError, ValueError):
+                pass  # Unreachable - everything allowed
+            with self.lock:
+                self.robots[origin] = parser
+        parser = self.robots[origin]
+        return parser is None or parser.can_fetch(USER_AGENT, url)
+
+    def _fetch_page(self, url: str) -> Optional[PageParser]:
+        try:
+            response = self._get(url)
+        except Exception as e:
+            self.log(f"Crawler: {url} failed ({e})")
+            return None
+        if response.content_type != "text/html":
+            return None
+        parser = PageParser(url)
+        try:
+            parser.feed(response.text())
+        except Exception:
+            return None
+        return parser
+
+    def crawl(self, start_url: str) -> FactSheet:
+        started = time.time()
+        sheet = FactSheet(start_url)
+        root_host = (urlparse(start_url).hostname or "").lower()
+        seen: Set[str] = {urldefrag(start_url)[0]}
+        level = [urldefrag(start_url)[0]]
+        parsed: List[PageParser] = []
+
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="crawl") as pool:
+            for depth in range(self.max_depth + 1):
+                if not level or time.time() - started > CRAWL_TIMEOUT:
+                    break
+                allowed = []
+                for url in level:
+                    if self.allowed(url):
+                        allowed.append(url)
+                    else:
+                        sheet.skipped_by_robots += 1
+                allowed = allowed[:self.max_pages - len(parsed)]
+                pages = [page for page in pool.map(self._fetch_page, allowed) if page]
+                parsed.extend(pages)
+                if len(parsed) >= self.max_pages:
+                    break
+
+                level = []
+                for page in pages:
+                    for url, _ in page.links:
+                        url = urldefrag(url)[0]
+                        if (url not in seen and url.startswith(("http://", "https://"))
+                                and _same_site(url, root_host)
+                                and not urlparse(url).path.lower().endswith(SKIP_EXTENSIONS)):
+                            seen.add(url)
+                            level.append(url)
+
+            stylesheets = []
+            for page in parsed:
+                stylesheets.extend(url for url in page.stylesheets if url not in stylesheets)
+            css = [response.text() for response in pool.map(self._get_quietly, stylesheets[:MAX_STYLESHEETS])
+                   if response is not None]
+
+        self._extract(sheet, parsed, css)
+        sheet.duration = time.time() - started
+        self.log(f"Crawled {len(sheet.pages)} pages of {start_url} in {sheet.duration:.1f}s")
+        return sheet
+
+    def _get_quietly(self, url: str):
+        try:
+            return self._get(url)
+        except Exception:
+            return None
+
+    def _extract(self, sheet: FactSheet, pages: List[PageParser], css: List[str]):
+        if not pages:
+            return
+        home = pages[0]
+        sheet.site_name = home.meta.get("og:site_name") or home.title.split("|")[0].split(" - ")[0].strip()
+        sheet.description = home.meta.get("description", "")
+        sheet.pages = [{"url": page.base_url, "title": page.title} for page in pages]
+
+        seen_nav = set()
+        for url, label in home.nav_links:
+            url = urldefrag(url)[0]
+            if label and url not in seen_nav and _same_site(url, urlparse(sheet.url).hostname or ""):
+                seen_nav.add(url)
+                sheet.navigation.append({"url": url, "label": label})
+
+        phones, emails, addresses, hours = [], [], [], []
+        colors = Counter()
+        images = []
+        for page in pages:
+            text = "".join(page.text)
+            for url, _ in page.links:
+                if url.startswith("tel:"):
+                    phones.append(url[4:].strip())
+                elif url.startswith("mailto:"):
+                    emails.append(url[7:].split("?")[0].strip())
+            phones.extend(match.strip() for match in PHONE.findall(text))
+            emails.extend(EMAIL.findall(text))
+            addresses.extend(" ".join(match.split()) for match in STREET.findall(text))
+            hours.extend(" ".join(match.split()) for match in HOURS.findall(text))
+            for block in page.json_ld:
+                self._from_json_ld(block, phones, emails, addresses, hours)
+            for style in page.styles:
+                colors.update(color.lower() for color in HEX_COLOR.findall(style))
+            for url, hints in page.images:
+                if "logo" in hints and not sheet.logo_url:
+                    sheet.logo_url = url
+                elif url not in images and not url.lower().endswith((".svg", ".gif")):
+                    images.append(url)
+
+        for stylesheet in css:
+            colors.update(color.lower() for color in HEX_COLOR.findall(stylesheet))
+        theme = home.meta.get("theme-color", "").lower()
+        if HEX_COLOR.fullmatch(theme):
+            colors[theme] += 1000  # Declared brand color goes first
+
+        sheet.logo_url = sheet.logo_url or home.meta.get("icon") or home.meta.get("og:image")
+        sheet.phones = _unique(phones, key=lambda value: re.sub(r"\D", "", value)[-9:])[:3]
+        sheet.emails = _unique(email.lower() for email in emails if not email.lower().endswith((".png", ".jpg")))[:3]
+        sheet.addresses = _unique(addresses)[:3]
+        sheet.hours = _unique(hours)[:7]
+        sheet.colors = [color for color, _ in colors.most_common() if not _is_neutral(color)][:6]
+        sheet.images = images[:20]
+
+    def _from_json_ld(self, block: str, phones, emails, addresses, hours):
+        """schema.org LocalBusiness data is the most reliable source"""
+        try:
+            data = json.loads(block)
+        except ValueError:
+            return
+        items = data if isinstance(data, list) else data.get("@graph", [data]) if isinstance(data, dict) else []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            if item.get("telephone"):
+                phones.insert(0, str(item["telephone"]))
+            if item.get("email"):
+                emails.insert(0, str(item["email"]).replace("mailto:", ""))
+            address = item.get("address")
+            if isinstance(address, dict):
+                parts = [address.get("streetAddress"), " ".join(filter(None, [
+                    address.get("postalCode"), address.get("addressLocality")]))]
+                addresses.insert(0, ", ".join(str(part) for part in parts if part))
+            opening = item.get("openingHours")
+            if isinstance(opening, str):
+                hours.insert(0, opening)
+            elif isinstance(opening, list):
+                hours[:0] = [str(entry) for entry in opening]
+            specs = item.get("openingHoursSpecification") or []
+            for spec in [specs] if isinstance(specs, dict) else specs:
+                if isinstance(spec, dict):
+                    days = spec.get("dayOfWeek")
+                    days = [days] if isinstance(days, str) else days or []
+                    days = ", ".join(str(day).rsplit("/", 1)[-1] for day in days)
+                    hours.append(f"{days}: {spec.get('opens')}-{spec.get('closes')}")
+
+
+def _unique(values, key=None) -> List[str]:
+    result, keys = [], set()
+    for value in values:
+        marker = key(value) if key else value
+        if value and marker not in keys:
+            keys.add(marker)
+            result.append(value)
+    return result
+
+
+def crawl_site(url: str, log: Optional[Callable[[str], None]] = None) -> FactSheet:
+    return SiteCrawler(log=log).crawl(url if "://" in url else f"https://{url}")
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    sheet = crawl_site(sys.argv[1], log=print)
+    if "--json" in sys.argv[2:]:
+        print(json.dumps(sheet.to_dict(), indent=2, ensure_ascii=False))
+    else:
+        print(sheet.to_prompt())
+
+
+if __name__ == "__main__":
+    main()
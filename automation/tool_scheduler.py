@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Demo Website Builder - Tool Scheduler
+Runs independent tool calls of one assistant turn in parallel
+"""
+
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+MAX_PARALLEL_TOOLS = 4
+
+READ_TOOLS = {"read_file"}
+FILE_TOOLS = {"read_file", "write_file", "edit_file", "fetch_url"}
+COMMAND_TOOLS = {"run_command", "start_dev_server"}
+INDEPENDENT_TOOLS = {"read_output", "poll_command"}  # Only read command output
+SEARCH_TOOLS = {"glob", "search"}  # Read a whole directory tree (path is its root)
+
+
+def is_within(path: str, root: str) -> bool:
+    return os.path.commonpath([os.path.abspath(path), os.path.abspath(root)]) == os.path.abspath(root)
+
+
+class ToolCall:
+    """One tool_use block waiting for (or holding) its result"""
+
+    def __init__(self, tool_use_id: str, name: str, tool_input: Dict[str, Any]):
+        self.tool_use_id = tool_use_id
+        self.name = name
+        self.input = tool_input
+        self.future: Optional[Future] = None
+        self.depends_on: List["ToolCall"] = []
+        self.duration = 0.0
+
+    @property
+    def path(self) -> Optional[str]:
+        path = self.input.get("path") or self.input.get("save_to")
+        # Absolute, so demos/x/a.astro and /.../demos/x/a.astro are the same file
+        return os.path.abspath(path) if path else None
+
+    @property
+    def cwd(self) -> str:
+        cwd = self.input.get("cwd") or self.input.get("project_path") or ""
+        return os.path.abspath(cwd) if cwd else ""
+
+    def conflicts_with(self, earlier: "ToolCall") -> bool:
+        """Must this call wait for an earlier call of the same turn?"""
+        if any(call.name == "fetch_url" and not call.path for call in (self, earlier)):
+            return False  # Only downloads into the cache, touches no project file
+        if self.name in INDEPENDENT_TOOLS or earlier.name in INDEPENDENT_TOOLS:
+            return False
+        if self.name in SEARCH_TOOLS or earlier.name in SEARCH_TOOLS:
+            scan, other = (self, earlier) if self.name in SEARCH_TOOLS else (earlier, self)
+            if other.name in SEARCH_TOOLS or other.name in READ_TOOLS:
+                return False
+            if other.name in FILE_TOOLS:
+                # A write only matters if it lands inside the searched tree
+                return not (scan.path and other.path) or is_within(other.path, scan.path)
+        if self.name in FILE_TOOLS and earlier.name in FILE_TOOLS:
+            # Same file: only concurrent reads are safe
+            if self.path != earlier.path:
+                return False
+            return not (self.name in READ_TOOLS and earlier.name in READ_TOOLS)
+        if self.name in COMMAND_TOOLS and earlier.name in COMMAND_TOOLS:
+            # Commands are serialized per working directory
+            return self.cwd == earlier.cwd
+        # A command may touch any file (cp, npm install ...) and unknown
+        # tools could do anything: keep their order relative to everything else
+        return True
+
+
+class ToolScheduler:
+    """Executes the tool calls of a turn, parallel where safe, results in order.
+
+    Calls are submitted as they arrive; each one waits only for earlier calls
+    it conflicts with. collect() returns (tool_use_id, result) pairs in
+    submission order, as the tool_result blocks must be.
+    """
+
+    def __init__(self, execute: Callable[[str, Dict[str, Any]], str],
+                 log: Optional[Callable[[str], None]] = None,
+                 max_workers: int = MAX_PARALLEL_TOOLS):
+        self.execute = execute
+        self.log = log or (lambda message: None)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+        self.calls: List[ToolCall] = []
+        self.batch_started = 0.0
+
+    def submit(self, tool_use_id: str, name: str, tool_input: Dict[str, Any]) -> ToolCall:
+        """Schedule a call; starts right away unless it has to wait for another"""
+        if not self.calls:
+            self.batch_started = time.time()
+        call = ToolCall(tool_use_id, name, tool_input)
+        call.depends_on = [earlier for earlier in self.calls if call.conflicts_with(earlier)]
+        # FIFO executor + dependencies only on earlier calls = no deadlock
+        call.future = self.executor.submit(self._run, call)
+        self.calls.append(call)
+        return call
+
+    def is_submitted(self, tool_use_id: str) -> bool:
+        return any(call.tool_use_id == tool_use_id for call in self.calls)
+
+    def _run(self, call: ToolCall) -> str:
+        if call.depends_on:
+            wait([earlier.future for earlier in call.depends_on])
+        started = time.time()
+        try:
+            return self.execute(call.name, call.input)
+        except Exception as e:
+            return f"Error in {call.name}: {str(e)}"
+        finally:
+            call.duration = time.time() - started
+
+    def collect(self) -> List[Tuple[str, str]]:
+        """Wait for every submitted call; results in submission order"""
+        results = [(call.tool_use_id, call.future.result()) for call in self.calls]
+
+        if self.calls:
+            total = sum(call.duration for call in self.calls)
+            timings = ", ".join(f"{call.name} {call.duration:.2f}s" for call in self.calls)
+            self.log(f"Tools: {timings} | wall {time.time() - self.batch_started:.2f}s vs serial {total:.2f}s")
+
+        self.calls = []
+        return results
+
+    def discard(self):
+        """Drop the turn's calls: cancel those not started yet, wait for running ones"""
+        started = [call for call in self.calls if not call.future.cancel()]
+        wait([call.future for call in started])
+        if self.calls:
+            self.log(f"Discarded {len(self.calls)} tool calls, {len(started)} had already started")
+        self.calls = []
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Demo Website Builder - Usage Store
+Local SQLite record of every Claude request: tokens (including prompt cache
+reads/writes), request latency, tool execution time and estimated cost,
+aggregated per build and per API key. API keys are stored only as a short
+fingerprint.
+
+Usage:
+    python3 usage_store.py                # totals per API key
+    python3 usage_store.py builds [N]     # the last N builds (default 20)
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+CACHE_DIR = Path(os.environ.get("DEMO_BUILDER_CACHE", Path.home() / ".cache" / "demo-builder"))
+USAGE_DB = CACHE_DIR / "usage.sqlite3"
+
+# USD per million tokens: input, output, cache read, cache write (matched by model prefix)
+PRICES = {
+    "claude-opus-4": (15.00, 75.00, 1.50, 18.75),
+    "claude-sonnet-4": (3.00, 15.00, 0.30, 3.75),
+    "claude-3-7-sonnet": (3.00, 15.00, 0.30, 3.75),
+    "claude-3-5-haiku": (0.80, 4.00, 0.08, 1.00),
+}
+
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (
+    id INTEGER PRIMARY KEY,
+    key_id TEXT NOT NULL,
+    project_name TEXT NOT NULL,
+    url TEXT,
+    kind TEXT NOT NULL,
+    model TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS iterations (
+    build_id INTEGER NOT NULL REFERENCES builds(id),
+    iteration INTEGER NOT NULL,
+    recorded_at REAL NOT NULL,
+    latency REAL NOT NULL,
+    tool_seconds REAL NOT NULL,
+    tool_calls INTEGER NOT NULL,
+    input_tokens INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL,
+    cache_read_input_tokens INTEGER NOT NULL,
+    cache_creation_input_tokens INTEGER NOT NULL,
+    cost REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS builds_key ON builds(key_id, started_at);
+CREATE INDEX IF NOT EXISTS iterations_build ON iterations(build_id);
+"""
+
+TOTALS = """
+    COUNT(DISTINCT b.id) AS builds, COUNT(i.build_id) AS requests,
+    COALESCE(SUM(i.input_tokens), 0) AS input_tokens,
+    COALESCE(SUM(i.output_tokens), 0) AS output_tokens,
+    COALESCE(SUM(i.cache_read_input_tokens), 0) AS cache_read_input_tokens,
+    COALESCE(SUM(i.cache_creation_input_tokens), 0) AS cache_creation_input_tokens,
+    COALESCE(SUM(i.latency), 0) AS latency,
+    COALESCE(SUM(i.tool_seconds), 0) AS tool_seconds,
+    COALESCE(SUM(i.cost), 0) AS cost
+"""
+
+
+def key_fingerprint(api_key: str) -> str:
+    """Identifies a key in the store without storing the key itself"""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:12]
+
+
+def estimate_cost(model: str, usage: Dict[str, int]) -> float:
+    """USD for one request's token counts (0 for unknown models)"""
+    prefix = max((p for p in PRICES if model.startswith(p)), key=len, default=None)
+    if prefix is None:
+        return 0.0
+    input_price, output_price, read_price, write_price = PRICES[prefix]
+    return (usage.get("input_tokens", 0) * input_price
+            + usage.get("output_tokens", 0) * output_price
+            + usage.get("cache_read_input_tokens", 0) * read_price
+            + usage.get("cache_creation_input_tokens", 0) * write_price) / 1_000_000
+
+
+class UsageStore:
+    """Thread-safe; the database is opened on first use"""
+
+    def __init__(self, path: Path = USAGE_DB):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # GUI and batch runs may write at the same time - WAL lets readers continue
+            db = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+            self._db = db
+        return self._db
+
+    def start_build(self, api_key: str, project_name: str, url: Optional[str], kind: str, model: str) -> int:
+        with self.lock, self.db:
+            cursor = self.db.execute(
+                "INSERT INTO builds (key_id, project_name, url, kind, model, status, started_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key_fingerprint(api_key), project_name, url, kind, model, RUNNING, time.time()))
+            return cursor.lastrowid
+
+    def record_iteration(self, build_id: int, iteration: int, usage: Dict[str, int],
+                         latency: float, tool_seconds: float, tool_calls: int) -> float:
+        """Store one request; returns its estimated cost"""
+        with self.lock, self.db:
+            model = self.db.execute("SELECT model FROM builds WHERE id = ?", (build_id,)).fetchone()["model"]
+            cost = estimate_cost(model, usage)
+            self.db.execute(
+                "INSERT INTO iterations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (build_id, iteration, time.time(), latency, tool_seconds, tool_calls,
+                 usage.get("input_tokens", 0), usage.get("output_tokens", 0),
+                 usage.get("cache_read_input_tokens", 0), usage.get("cache_creation_input_tokens", 0), cost))
+            return cost
+
+    def finish_build(self, build_id: int, status: str):
+        with self.lock, self.db:
+            self.db.execute("UPDATE builds SET status = ?, finished_at = ? WHERE id = ?",
+                            (status, time.time(), build_id))
+
+    def build_totals(self, build_id: int) -> Dict:
+        with self.lock:
+            row = self.db.execute(
+                f"SELECT {TOTALS} FROM builds b LEFT JOIN iterations i ON i.build_id = b.id WHERE b.id = ?",
+                (build_id,)).fetchone()
+        return dict(row)
+
+    def key_totals(self, api_key: str, since: Optional[float] = None) -> Dict:
+        """Totals of one API key, optionally only builds started after `since`"""
+        with self.lock:
+            row = self.db.execute(
+                f"SELECT {TOTALS} FROM builds b LEFT JOIN iterations i ON i.build_id = b.id "
+                "WHERE b.key_id = ? AND b.started_at >= ?",
+                (key_fingerprint(api_key), since or 0)).fetchone()
+        return dict(row)
+
+    def all_key_totals(self) -> List[Dict]:
+        with self.lock:
+            rows = self.db.execute(
+                f"SELECT b.key_id, {TOTALS} FROM builds b LEFT JOIN iterations i ON i.build_id = b.id "
+                "GROUP BY b.key_id ORDER BY cost DESC").fetchall()
+        return [dict(row) for row in rows]
+
+    def recent_builds(self, limit: int = 20) -> List[Dict]:
+        with self.lock:
+            rows = self.db.execute(
+                f"SELECT b.id, b.project_name, b.kind, b.status, b.started_at, b.finished_at, {TOTALS} "
+                "FROM builds b LEFT JOIN iterations i ON i.build_id = b.id "
+                "GROUP BY b.id ORDER BY b.started_at DESC LIMIT ?", (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+
+usage_store = UsageStore()
+
+
+def start_of_today() -> float:
+    return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+
+
+def format_totals(totals: Dict) -> str:
+    tokens = totals["input_tokens"] + totals["output_tokens"] + totals["cache_read_input_tokens"] \
+        + totals["cache_creation_input_tokens"]
+    return f"{tokens / 1000:.0f}k tokens, ${totals['cost']:.2f}"
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] not in ("builds",):
+        print(__doc__)
+        sys.exit(1)
+
+    if len(sys.argv) > 1:
+        limit = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+        for build in usage_store.recent_builds(limit):
+            started = datetime.fromtimestamp(build["started_at"]).strftime("%Y-%m-%d %H:%M")
+            duration = (build["finished_at"] or time.time()) - build["started_at"]
+            print(f"{started}  {build['project_name']:<30} {build['kind']:<7} {build['status']:<9} "
+                  f"{build['requests']:>3} req  {format_totals(build):<24} "
+                  f"{duration:>5.0f}s total, {build['latency']:.0f}s Claude, {build['tool_seconds']:.0f}s tools")
+        return
+
+    for totals in usage_store.all_key_totals():
+        print(f"key {totals['key_id']}: {totals['builds']} builds, {totals['requests']} requests, "
+              f"{format_totals(totals)} | Claude {totals['latency']:.0f}s, tools {totals['tool_seconds']:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Demo Website Builder - Lazy Web Preview
+Placeholder widget that only loads QtWebEngine (Chromium) when the first
+page is shown, so the window opens without it
+"""
+
+from PyQt6.QtCore import QCoreApplication, Qt, QUrl
+from PyQt6.QtWidgets import QVBoxLayout, QWidget
+
+
+def prepare_web_engine():
+    """Call before creating QApplication.
+
+    QtWebEngine needs shared OpenGL contexts when it is imported after the
+    application object exists.
+    """
+    QCoreApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
+
+
+class LazyWebView(QWidget):
+    """Drop-in for the QWebEngineView calls the builders use (setUrl, reload)"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.view = None
+        self.box = QVBoxLayout(self)
+        self.box.setContentsMargins(0, 0, 0, 0)
+
+    def ensure_view(self):
+        if self.view is None:
+            from PyQt6.QtWebEngineWidgets import QWebEngineView
+            self.view = QWebEngineView(self)
+            self.box.addWidget(self.view)
+        return self.view
+
+    def setUrl(self, url: QUrl):
+        self.ensure_view().setUrl(url)
+
+    def reload(self):
+        if self.view is not None:
+            self.view.reload()
@@ -0,0 +1,20 @@
+// Responsive variants written by automation/image_pipeline.py (src/data/images.json).
+// Images the pipeline hasn't processed yet are rendered as given.
+
+export interface OptimizedImage {
+  src: string;
+  width: number;
+  height: number;
+  sources: { type: string; srcset: string }[];
+}
+
+// glob instead of a plain import, so projects without a manifest still build
+const manifests = import.meta.glob<Record<string, OptimizedImage>>('../data/images.json', {
+  eager: true,
+  import: 'default',
+});
+const images: Record<string, OptimizedImage> = Object.values(manifests)[0] ?? {};
+
+export function optimizedImage(src?: string): OptimizedImage | undefined {
+  return src ? images[src] : undefined;
+}